@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Memory footprint of pandagg trees built from large aggregation responses and mappings.
+
+Usage::
+
+    python benchmarks/memory.py
+
+"""
+
+import gc
+import time
+import tracemalloc
+
+from pandagg.mappings import Mappings
+from pandagg.search import Search
+from pandagg.tree.response import AggsResponseTree
+
+
+def _raw_response(nb_a, nb_b):
+    return {
+        "per_a": {
+            "buckets": [
+                {
+                    "key": "a%d" % i,
+                    "doc_count": nb_b,
+                    "per_b": {
+                        "buckets": [
+                            {"key": j, "doc_count": 1, "avg_c": {"value": 1.5}}
+                            for j in range(nb_b)
+                        ]
+                    },
+                }
+                for i in range(nb_a)
+            ]
+        }
+    }
+
+
+def _properties(nb_objects, nb_fields):
+    return {
+        "object_%d"
+        % i: {
+            "type": "object",
+            "properties": {
+                "field_%d"
+                % j: {
+                    "type": "keyword",
+                    "fields": {"text": {"type": "text"}},
+                }
+                for j in range(nb_fields)
+            },
+        }
+        for i in range(nb_objects)
+    }
+
+
+def measure(name, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    duration = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        "%-30s %8.1f MB retained %8.1f MB peak %8.2f s"
+        % (name, current / 1024.0**2, peak / 1024.0**2, duration)
+    )
+    return result
+
+
+def main():
+    aggs = (
+        Search()
+        .groupby("per_a", "terms", field="a", size=1000)
+        .groupby("per_b", "terms", field="b", size=200)
+        .agg("avg_c", "avg", field="c")
+        ._aggs
+    )
+    raw = _raw_response(nb_a=1000, nb_b=200)
+    measure("response tree (400k buckets)", lambda: AggsResponseTree(aggs, raw))
+
+    properties = _properties(nb_objects=100, nb_fields=100)
+    measure("mappings (20k fields)", lambda: Mappings(properties=properties))
+
+
+if __name__ == "__main__":
+    main()
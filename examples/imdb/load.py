@@ -1,7 +1,8 @@
 import json
 from os.path import join
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import Elasticsearch
 from examples.imdb.conf import ES_HOST, ES_USE_AUTH, ES_PASSWORD, ES_USER, DATA_DIR
+from pandagg.bulk import bulk_index
 from pandagg.mappings import Mappings, Keyword, Text, Float, Nested, Integer
 
 index_name = "movies"
@@ -35,22 +36,13 @@ mappings = Mappings(
         "nb_directors": Integer(),
         "nb_roles": Integer(),
     },
-).to_dict()
+)
 
 
-def bulk_index(client, docs):
-    helpers.bulk(
-        client=client,
-        actions=[
-            {
-                "_index": index_name,
-                "_op_type": "index",
-                "_id": document["movie_id"],
-                "_source": document,
-            }
-            for document in docs
-        ],
-    )
+def read_documents(path):
+    with open(path, "r") as f:
+        for line in f:
+            yield json.loads(line)
 
 
 if __name__ == "__main__":
@@ -69,19 +61,21 @@ if __name__ == "__main__":
     es_client.indices.create(index_name)
     print("-" * 50)
     print("UPDATE MAPPINGS\n")
-    es_client.indices.put_mapping(index=index_name, body=mappings)
+    es_client.indices.put_mapping(index=index_name, body=mappings.to_dict())
 
     print("-" * 50)
     print("WRITE DOCUMENTS\n")
-    docs_buffer = []
-    with open(join(DATA_DIR, "serialized.json"), "r") as f:
-        for l in f.readlines():
-            if len(docs_buffer) >= 100:
-                bulk_index(es_client, docs_buffer)
-                docs_buffer = []
-            s = json.loads(l)
-            docs_buffer.append(s)
-    if docs_buffer:
-        bulk_index(es_client, docs_buffer)
+    stats = bulk_index(
+        read_documents(join(DATA_DIR, "serialized.json")),
+        index=index_name,
+        mappings=mappings,
+        using=es_client,
+        id_field="movie_id",
+        coerce=True,
+        workers=4,
+    )
+    print(stats)
+    for position, error in stats.errors[:10]:
+        print("document at line %d: %s" % (position + 1, error))
 
     es_client.indices.refresh(index=index_name)
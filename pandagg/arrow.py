@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pandagg.dtypes import mappings_field
+from pandagg.serializer import dumps
+
+
+# mapping field type -> arrow type name
+_ARROW_TYPES = {
+    "long": "int64",
+    "integer": "int32",
+    "short": "int16",
+    "byte": "int8",
+    "token_count": "int32",
+    "double": "float64",
+    "float": "float32",
+    # float16 arrays can't be built from python floats
+    "half_float": "float32",
+    "scaled_float": "float64",
+    "boolean": "bool_",
+    "text": "string",
+    "match_only_text": "string",
+    "search_as_you_type": "string",
+    "wildcard": "string",
+    "ip": "string",
+    "binary": "string",
+}
+
+# low cardinality string fields, dictionary encoded
+_DICTIONARY_FIELDS = ("keyword", "constant_keyword")
+
+# dates are stored as UTC in elasticsearch
+_TIMESTAMP_UNITS = {"date": "ms", "date_nanos": "ns"}
+# time followed by zone offset
+_OFFSET_PATTERN = r"[T ]\S*(Z|[+-]\d{2}(:?\d{2})?)$"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            'Using arrow output format requires to install pyarrow. Please install "pyarrow" or '
+            "use another output format."
+        )
+    return pyarrow
+
+
+def field_arrow_type(field):
+    """
+    Return arrow type matching mappings field (``pandagg.node.mappings.abstract.Field`` instance), or None if its
+    values type should be inferred (objects, nested, geo types..).
+    Keyword fields are dictionary-encoded, dates are UTC timestamps.
+    """
+    if field is None:
+        return None
+    pa = _pyarrow()
+    if field.KEY in _DICTIONARY_FIELDS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if field.KEY in _TIMESTAMP_UNITS:
+        return pa.timestamp(_TIMESTAMP_UNITS[field.KEY], tz="UTC")
+    if field.KEY in _ARROW_TYPES:
+        return getattr(pa, _ARROW_TYPES[field.KEY])()
+    return None
+
+
+def mappings_arrow_type(mappings, field_path):
+    """
+    Return arrow type of field at `field_path` in mappings (None if mappings aren't provided or don't contain it).
+    """
+    return field_arrow_type(mappings_field(mappings, field_path))
+
+
+def _cast(array, arrow_type, epoch_unit="ms"):
+    pa = _pyarrow()
+    if pa.types.is_timestamp(arrow_type):
+        return _to_timestamps(array, arrow_type, epoch_unit)
+    if (
+        pa.types.is_list(arrow_type)
+        and pa.types.is_timestamp(arrow_type.value_type)
+        and pa.types.is_list(array.type)
+    ):
+        return pa.ListArray.from_arrays(
+            array.offsets,
+            _to_timestamps(array.flatten(), arrow_type.value_type, epoch_unit),
+            mask=array.is_null(),
+        )
+    return array.cast(arrow_type)
+
+
+def _to_timestamps(array, arrow_type, epoch_unit):
+    pa = _pyarrow()
+    if pa.types.is_string(array.type):
+        return _parse_dates(array, arrow_type)
+    if pa.types.is_integer(array.type):
+        if epoch_unit is None:
+            raise pa.ArrowInvalid("Numeric values aren't epoch timestamps")
+        return array.cast(pa.timestamp(epoch_unit, tz=arrow_type.tz)).cast(arrow_type)
+    return array.cast(arrow_type)
+
+
+def _parse_dates(array, arrow_type):
+    """
+    Parse ISO 8601 dates strings as timestamps, dates without time zone offset being UTC.
+    """
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    with_offset = pc.fill_null(pc.match_substring_regex(array, _OFFSET_PATTERN), False)
+    aware = pc.if_else(with_offset, array, None).cast(arrow_type)
+    naive = pc.assume_timezone(
+        pc.if_else(with_offset, None, array).cast(pa.timestamp(arrow_type.unit)),
+        arrow_type.tz,
+    )
+    return pc.if_else(with_offset, aware, naive)
+
+
+def to_arrow_array(values, arrow_type=None, epoch_unit="ms"):
+    """
+    Build arrow array from list of values.
+
+    If `arrow_type` is provided, values are converted to it (as list of this type if some values are arrays), else
+    if values don't comply with it (ignored malformed values, unsupported date formats..) array type is inferred.
+    Values of mixed types that can't be inferred are serialized as json strings.
+
+    :param values: list of values
+    :param arrow_type: expected arrow type, see :func:`field_arrow_type`
+    :param epoch_unit: unit of numeric dates ("ms" or "s", see ``pandagg.dtypes.field_epoch_unit``), if None
+        numeric values aren't converted to timestamps
+    """
+    pa = _pyarrow()
+    if arrow_type is not None:
+        if any(isinstance(v, list) for v in values):
+            values = [v if v is None or isinstance(v, list) else [v] for v in values]
+            arrow_type = pa.list_(arrow_type)
+        try:
+            return _cast(pa.array(values), arrow_type, epoch_unit)
+        except (pa.ArrowException, OverflowError):
+            pass
+    try:
+        return pa.array(values)
+    except (pa.ArrowException, OverflowError):
+        return pa.array([None if v is None else dumps(v) for v in values], pa.string())
+
+
+def to_arrow_table(columns):
+    """
+    Build arrow table from ordered list of (column name, values, arrow type) tuples, optionally followed by unit of
+    numeric dates (see :func:`to_arrow_array`).
+    """
+    pa = _pyarrow()
+    if not columns:
+        return pa.table({})
+    names, arrays = [], []
+    for column in columns:
+        name, values = column[:2]
+        names.append(name)
+        arrays.append(to_arrow_array(values, *column[2:]))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def arrow_to_pandas(table, index=None):
+    """
+    Convert arrow table to pandas dataframe backed by arrow arrays (``pd.ArrowDtype`` dtypes), so that columns
+    buffers aren't copied.
+
+    :param index: list of columns to use as dataframe index
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError(
+            'Using dataframe output format requires to install pandas. Please install "pandas" or '
+            "use another output format."
+        )
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    if index:
+        df = df.set_index(index)
+    return df
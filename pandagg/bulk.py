@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from elasticsearch.exceptions import TransportError
+
+from pandagg.connections import get_connection, get_serializer as get_alias_serializer
+from pandagg.serializer import get_serializer
+from pandagg.tree.mappings import _mappings
+
+
+class ChunkStats(object):
+    """
+    Outcome of a single bulk request (retries included).
+    """
+
+    __slots__ = ("docs", "bytes", "indexed", "failed", "retries", "took")
+
+    def __init__(self, docs, bytes):
+        self.docs = docs
+        self.bytes = bytes
+        self.indexed = 0
+        self.failed = 0
+        # number of retried requests, after items were rejected by elasticsearch (429)
+        self.retries = 0
+        # seconds spent sending this chunk, retries and backoffs included
+        self.took = 0.0
+
+    @property
+    def docs_per_second(self):
+        return self.docs / self.took if self.took else None
+
+    def __repr__(self):
+        return (
+            "<ChunkStats docs=%d bytes=%d indexed=%d failed=%d retries=%d took=%.3fs>"
+            % (
+                self.docs,
+                self.bytes,
+                self.indexed,
+                self.failed,
+                self.retries,
+                self.took,
+            )
+        )
+
+
+class BulkStats(object):
+    """
+    Statistics of a bulk ingestion, updated while it runs.
+
+    `errors` lists (document position in provided iterable, error) tuples, for documents that failed validation
+    (`ValueError`), or were rejected by elasticsearch (error returned in bulk response item).
+    """
+
+    def __init__(self):
+        self.docs = 0
+        self.indexed = 0
+        self.invalid = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes = 0
+        self.errors = []
+        self.chunks = []
+        self.started_at = time.time()
+        self.took = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def docs_per_second(self):
+        return self.indexed / self.took if self.took else None
+
+    def _add_chunk(self, chunk_stats, errors):
+        with self._lock:
+            self.chunks.append(chunk_stats)
+            self.indexed += chunk_stats.indexed
+            self.failed += chunk_stats.failed
+            self.retries += chunk_stats.retries
+            self.bytes += chunk_stats.bytes
+            self.errors.extend(errors)
+
+    def __repr__(self):
+        return (
+            "<BulkStats docs=%d indexed=%d invalid=%d failed=%d retries=%d chunks=%d took=%.3fs>"
+            % (
+                self.docs,
+                self.indexed,
+                self.invalid,
+                self.failed,
+                self.retries,
+                len(self.chunks),
+                self.took,
+            )
+        )
+
+
+class BulkIndexer(object):
+    """
+    Index documents in bulk: documents are optionally validated and coerced against mappings, serialized once,
+    grouped in chunks bounded in bytes, and sent by a pool of workers. At most `max_in_flight` chunks are pending at
+    any time, so that documents are consumed from the provided iterable as fast as elasticsearch ingests them.
+    Items rejected because of elasticsearch back pressure (429 status) are retried with an exponential backoff.
+
+    >>> indexer = BulkIndexer(index="movies", mappings=mappings, id_field="movie_id", workers=4)
+    >>> stats = indexer.index(documents)
+    >>> stats.indexed, stats.errors
+    (1000000, [])
+
+    :param index: index in which documents are indexed
+    :param mappings: ``pandagg.tree.mappings.Mappings`` instance (or dict), against which documents are validated
+    :param using: connection alias, or elasticsearch client
+    :param validate: if True and mappings are provided, documents not complying with mappings are not sent, and
+        reported in stats errors
+    :param coerce: if True, documents values are converted to their mapping type (see
+        :func:`~pandagg.tree.mappings.Mappings.coerce_document`), before validation
+    :param id_field: document field used as document `_id`, if None ids are generated by elasticsearch. Documents
+        missing it are considered invalid
+    :param op_type: bulk operation, "index" or "create"
+    :param chunk_bytes: maximum size in bytes of each bulk request body (unless a single document exceeds it)
+    :param chunk_docs: maximum number of documents per bulk request
+    :param workers: number of threads sending bulk requests
+    :param max_in_flight: maximum number of chunks sent or waiting to be sent, defaults to twice `workers`
+    :param max_retries: maximum number of retries of items rejected with a 429 status
+    :param initial_backoff: seconds to wait before first retry, doubled at each retry
+    :param max_backoff: maximum number of seconds to wait between retries
+    :param serializer: serializer used to encode documents (see ``pandagg.serializer``), defaults to the one
+        registered for connection alias, else to the fastest available one
+    :param raise_on_invalid: if True, raise ``ValueError`` on first invalid document, else report it in stats errors
+    :param params: additional bulk request params (``refresh``, ``pipeline``, ``routing``..)
+    """
+
+    def __init__(
+        self,
+        index,
+        mappings=None,
+        using="default",
+        validate=True,
+        coerce=False,
+        id_field=None,
+        op_type="index",
+        chunk_bytes=5 * 1024 * 1024,
+        chunk_docs=5000,
+        workers=4,
+        max_in_flight=None,
+        max_retries=5,
+        initial_backoff=1.0,
+        max_backoff=60.0,
+        serializer=None,
+        raise_on_invalid=False,
+        **params
+    ):
+        if op_type not in ("index", "create"):
+            raise ValueError(
+                'Unsupported op_type <%s>, expected "index" or "create"' % op_type
+            )
+        self._index = index
+        self.mappings = _mappings(mappings)
+        if coerce and self.mappings is None:
+            raise ValueError("Mappings are required to coerce documents.")
+        self.using = using
+        self.validate = validate and self.mappings is not None
+        self.coerce = coerce
+        self.id_field = id_field
+        self.op_type = op_type
+        self.chunk_bytes = chunk_bytes
+        self.chunk_docs = chunk_docs
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.serializer = serializer or get_alias_serializer(using) or get_serializer()
+        self.raise_on_invalid = raise_on_invalid
+        self.params = params
+
+    def _dumps(self, obj):
+        encoded = self.serializer.dumps(obj)
+        if isinstance(encoded, str):
+            return encoded.encode("utf-8")
+        return encoded
+
+    def _documents(self, documents, stats):
+        """
+        Yield (position, document) tuples of documents to send.
+        """
+        coerce = self.mappings.coerce_document if self.coerce else None
+        validate = self.mappings._validator() if self.validate else None
+        for position, document in enumerate(documents):
+            stats.docs += 1
+            if coerce is not None:
+                document = coerce(document)
+            try:
+                if validate is not None:
+                    validate(document)
+                if self.id_field is not None and self.id_field not in document:
+                    raise ValueError('Missing "%s" id field.' % self.id_field)
+            except ValueError as e:
+                if self.raise_on_invalid:
+                    raise
+                stats.invalid += 1
+                with stats._lock:
+                    stats.errors.append((position, e))
+                continue
+            yield position, document
+
+    def _chunks(self, documents, stats):
+        """
+        Yield chunks, as lists of (position, serialized action line and document source lines).
+        """
+        chunk, chunk_bytes = [], 0
+        for position, document in self._documents(documents, stats):
+            action = {}
+            if self.id_field is not None:
+                action["_id"] = document[self.id_field]
+            lines = (
+                self._dumps({self.op_type: action})
+                + b"\n"
+                + self._dumps(document)
+                + b"\n"
+            )
+            if chunk and (
+                len(chunk) >= self.chunk_docs
+                or chunk_bytes + len(lines) > self.chunk_bytes
+            ):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append((position, lines))
+            chunk_bytes += len(lines)
+        if chunk:
+            yield chunk
+
+    def _send(self, es, chunk, stats):
+        chunk_stats = ChunkStats(
+            docs=len(chunk), bytes=sum(len(lines) for _, lines in chunk)
+        )
+        errors = []
+        start = time.time()
+        attempt = 0
+        while chunk:
+            try:
+                raw = es.bulk(
+                    index=self._index,
+                    body=b"".join(lines for _, lines in chunk),
+                    **self.params
+                )
+            except TransportError as e:
+                if e.status_code != 429 or attempt >= self.max_retries:
+                    raise
+                # whole request rejected
+                raw = {"items": [{self.op_type: {"status": 429}}] * len(chunk)}
+            rejected = []
+            for (position, lines), item in zip(chunk, raw["items"]):
+                result = item[self.op_type]
+                if result.get("status", 200) < 300:
+                    chunk_stats.indexed += 1
+                elif result["status"] == 429 and attempt < self.max_retries:
+                    rejected.append((position, lines))
+                else:
+                    chunk_stats.failed += 1
+                    errors.append((position, result.get("error", result)))
+            chunk = rejected
+            if chunk:
+                time.sleep(min(self.max_backoff, self.initial_backoff * 2**attempt))
+                attempt += 1
+                chunk_stats.retries += 1
+        chunk_stats.took = time.time() - start
+        stats._add_chunk(chunk_stats, errors)
+        return chunk_stats
+
+    def index(self, documents):
+        """
+        Index documents, return a ``BulkStats`` instance once all of them are processed.
+
+        :param documents: iterable of documents (dicts), consumed lazily
+        """
+        stats = BulkStats()
+        es = get_connection(self.using)
+        in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        futures = []
+
+        def send(chunk):
+            try:
+                return self._send(es, chunk, stats)
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for chunk in self._chunks(documents, stats):
+                # back pressure: wait for a pending chunk to be sent before building another one
+                in_flight.acquire()
+                futures.append(executor.submit(send, chunk))
+                # surface transport errors early, and release completed futures
+                while futures and futures[0].done():
+                    futures.pop(0).result()
+            for future in futures:
+                future.result()
+        stats.took = time.time() - stats.started_at
+        return stats
+
+
+def bulk_index(documents, index, mappings=None, using="default", **kwargs):
+    """
+    Index documents in bulk, return a ``BulkStats`` instance. Shortcut for
+    ``BulkIndexer(index, mappings, using, **kwargs).index(documents)``, see :class:`~pandagg.bulk.BulkIndexer`.
+    """
+    return BulkIndexer(index=index, mappings=mappings, using=using, **kwargs).index(
+        documents
+    )
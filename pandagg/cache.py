@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def request_key(index, params, body, using=None):
+    """
+    Return a key identifying a search request, independently from dict keys ordering.
+
+    :param index: searched index(es)
+    :param params: search params
+    :param body: serialized search body
+    :param using: identifier of the connection the request is sent to, so that caches shared between connections
+        don't mix responses of different clusters
+    :rtype: str
+    """
+    canonical = json.dumps(
+        {"using": using, "index": index, "params": params, "body": body},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(object):
+    """
+    Base class of search responses caches: stores raw Elasticsearch responses under request keys (see
+    :func:`~pandagg.cache.request_key`), and counts hits and misses.
+
+    Subclasses implement `_get`, `_set` and `clear` methods.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return cached raw response, or None if absent (or expired).
+        """
+        data = self._get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, key, data):
+        self._set(key, data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": float(self.hits) / total if total else None,
+        }
+
+    def _get(self, key):
+        raise NotImplementedError()
+
+    def _set(self, key, data):
+        raise NotImplementedError()
+
+    def clear(self):
+        raise NotImplementedError()
+
+
+class LRUCache(ResponseCache):
+    """
+    In-memory cache, evicting least recently used responses.
+
+    Cached responses are shared between all `Response` instances built from them, and must not be mutated.
+
+    :param max_size: maximum number of cached responses
+    :param max_bytes: maximum total size of cached responses, measured once serialized in json
+    :param ttl: time to live of cached responses, in seconds
+    """
+
+    def __init__(self, max_size=128, max_bytes=None, ttl=None):
+        super(LRUCache, self).__init__()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self.nbytes = 0
+        # key -> (expiration timestamp, size in bytes, raw response)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, data = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _set(self, key, data):
+        size = 0
+        if self.max_bytes is not None:
+            size = len(json.dumps(data, separators=(",", ":")))
+            if size > self.max_bytes:
+                # would evict all other entries, without being retained
+                return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (expires_at, size, data)
+            self.nbytes += size
+            while (
+                self.max_size is not None and len(self._entries) > self.max_size
+            ) or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.nbytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        stats = super(LRUCache, self).stats()
+        stats.update(
+            size=len(self._entries), nbytes=self.nbytes, evictions=self.evictions
+        )
+        return stats
+
+
+class DiskCache(ResponseCache):
+    """
+    Persistent cache, storing serialized responses in a sqlite database.
+
+    :param path: sqlite database file path
+    :param ttl: time to live of cached responses, in seconds
+    """
+
+    def __init__(self, path, ttl=None):
+        super(DiskCache, self).__init__()
+        self.path = path
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, data TEXT)"
+            )
+
+    def _get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, data FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            expires_at, data = row
+            if expires_at is not None and expires_at < time.time():
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+        return json.loads(data)
+
+    def _set(self, key, data):
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        serialized = json.dumps(data, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, data) VALUES (?, ?, ?)",
+                (key, expires_at, serialized),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        self._conn.close()
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Coalesce concurrent calls sharing a same key: while a call is in flight, other callers with the same key wait for
+    its outcome instead of performing their own call. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, fn):
+        """
+        Return `fn()` result, shared with all concurrent callers using the same key. Exceptions raised by `fn` are
+        propagated to all of them.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class AsyncSingleFlight(object):
+    """
+    Asyncio flavour of :class:`~pandagg.cache.SingleFlight`: concurrent tasks awaiting a same key share a single
+    coroutine execution.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, fn):
+        """
+        Await and return `fn()` result, shared with all concurrent tasks using the same key (in the same event loop).
+        """
+        key = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(key)
+        if task is None:
+            # call runs in its own task, so that a cancelled caller (leader included) doesn't cancel it for others
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(functools.partial(self._done, key))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # mark exception as retrieved, in case all callers were cancelled
+        if not task.cancelled():
+            task.exception()
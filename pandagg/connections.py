@@ -2,6 +2,8 @@
 
 from elasticsearch import Elasticsearch
 
+from pandagg.serializer import install_serializer, transport_serializer
+
 
 class Connections(object):
     """
@@ -9,9 +11,12 @@ class Connections(object):
     singleton in this module.
     """
 
-    def __init__(self):
+    def __init__(self, elasticsearch_class=Elasticsearch):
         self._kwargs = {}
         self._conns = {}
+        self._caches = {}
+        self._serializers = {}
+        self.elasticsearch_class = elasticsearch_class
 
     def configure(self, **kwargs):
         """
@@ -62,9 +67,54 @@ class Connections(object):
         Construct an instance of ``elasticsearch.Elasticsearch`` and register
         it under given alias.
         """
-        conn = self._conns[alias] = Elasticsearch(**kwargs)
+        if alias in self._serializers:
+            kwargs.setdefault(
+                "serializer", transport_serializer(self._serializers[alias])
+            )
+        conn = self._conns[alias] = self.elasticsearch_class(**kwargs)
         return conn
 
+    def set_serializer(self, alias, serializer):
+        """
+        Register a serializer (see ``pandagg.serializer``) used by client of given alias to encode requests bodies and
+        decode responses, for instance ``pandagg.serializer.OrjsonSerializer()``. Applies to an already registered
+        client as well. Pass `None` to stop registering it for clients created later.
+        """
+        if serializer is None:
+            self._serializers.pop(alias, None)
+            return
+        self._serializers[alias] = serializer
+        if alias in self._conns:
+            install_serializer(self._conns[alias], serializer)
+
+    def get_serializer(self, alias="default"):
+        """
+        Retrieve serializer registered under given alias, None if there is none (or if a client instance is provided
+        instead of an alias).
+        """
+        if not isinstance(alias, str):
+            return None
+        return self._serializers.get(alias)
+
+    def set_cache(self, alias, cache):
+        """
+        Register a response cache (``pandagg.cache.ResponseCache`` instance) used by all searches executed through
+        connection of given alias. Pass `None` to disable it.
+        """
+        if cache is None:
+            self._caches.pop(alias, None)
+            return
+        self._caches[alias] = cache
+
+    def get_cache(self, alias="default"):
+        """
+        Retrieve response cache registered under given alias, None if there is none (or if a client instance is
+        provided instead of an alias).
+        """
+        if not isinstance(alias, str):
+            return None
+        return self._caches.get(alias)
+
     def get_connection(self, alias="default"):
         """
         Retrieve a connection, construct it if necessary (only configuration
@@ -93,9 +143,43 @@ class Connections(object):
             raise KeyError("There is no connection with alias %r." % alias)
 
 
+class AsyncConnections(Connections):
+    """
+    Registry of ``elasticsearch.AsyncElasticsearch`` clients, used by
+    ``pandagg.search.AsyncSearch``. Requires elasticsearch async extra
+    (``pip install elasticsearch[async]``).
+    """
+
+    def __init__(self, elasticsearch_class=None):
+        super(AsyncConnections, self).__init__(elasticsearch_class=elasticsearch_class)
+
+    def create_connection(self, alias="default", **kwargs):
+        """
+        Construct an instance of ``elasticsearch.AsyncElasticsearch`` and register
+        it under given alias.
+        """
+        if self.elasticsearch_class is None:
+            try:
+                from elasticsearch import AsyncElasticsearch
+            except ImportError:
+                raise ImportError(
+                    "Async connections require elasticsearch async dependencies, please install "
+                    '"elasticsearch[async]".'
+                )
+            self.elasticsearch_class = AsyncElasticsearch
+        return super(AsyncConnections, self).create_connection(alias, **kwargs)
+
+
 connections = Connections()
 configure = connections.configure
 add_connection = connections.add_connection
 remove_connection = connections.remove_connection
 create_connection = connections.create_connection
 get_connection = connections.get_connection
+set_cache = connections.set_cache
+get_cache = connections.get_cache
+set_serializer = connections.set_serializer
+get_serializer = connections.get_serializer
+
+async_connections = AsyncConnections()
+get_async_connection = async_connections.get_connection
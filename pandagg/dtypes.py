@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pandagg.exceptions import AbsentMappingFieldError
+
+# dates are stored as UTC in elasticsearch
+DATETIME = "datetime64[ns, UTC]"
+
+# mapping field type -> pandas dtype
+_DTYPES = {
+    "keyword": "category",
+    "constant_keyword": "category",
+    "long": "Int64",
+    "integer": "Int32",
+    "short": "Int16",
+    "byte": "Int8",
+    "token_count": "Int32",
+    "double": "float64",
+    "float": "float32",
+    "half_float": "float32",
+    "scaled_float": "float64",
+    "boolean": "boolean",
+    "date": DATETIME,
+    "date_nanos": DATETIME,
+}
+
+# columns are categorical if they contain less distinct values than this ratio of rows
+_CATEGORY_MAX_RATIO = 0.5
+
+
+def field_dtype(field):
+    """
+    Return pandas dtype matching mappings field (``pandagg.node.mappings.abstract.Field`` instance), or None if it
+    should be inferred. Keyword fields are categorical, integers nullable, dates are UTC datetimes.
+    """
+    if field is None:
+        return None
+    return _DTYPES.get(field.KEY)
+
+
+def field_epoch_unit(field):
+    """
+    Return unit ("ms" or "s") of numeric values of date field, depending on its mapping format, or None if they
+    aren't epoch timestamps.
+    """
+    if field is None or not hasattr(field, "epoch_unit"):
+        return None
+    return field.epoch_unit()
+
+
+def mappings_field(mappings, field_path):
+    """
+    Return field at `field_path` in mappings (None if mappings aren't provided or don't contain it).
+    """
+    if mappings is None:
+        return None
+    try:
+        _, field, _ = mappings._field_info(field_path)
+    except AbsentMappingFieldError:
+        return None
+    return field
+
+
+def mappings_dtype(mappings, field_path):
+    """
+    Return pandas dtype of field at `field_path` in mappings (None if mappings aren't provided or don't contain it).
+    """
+    return field_dtype(mappings_field(mappings, field_path))
+
+
+def coerce_series(series, dtype, epoch_unit="ms"):
+    """
+    Convert series to dtype, return series unchanged if its values don't comply with it (arrays of values, ignored
+    malformed values, unsupported date formats..).
+
+    Categorical dtype is only applied to low cardinality series. Dates are parsed from ISO 8601 strings, or epoch
+    timestamps.
+
+    :param epoch_unit: unit of numeric dates ("ms" or "s", see :func:`field_epoch_unit`), if None numeric dates
+        aren't converted
+    """
+    import pandas as pd
+
+    if dtype is None or str(series.dtype) == dtype:
+        return series
+    try:
+        if dtype == "category":
+            if series.nunique() > _CATEGORY_MAX_RATIO * len(series):
+                return series
+            return series.astype(dtype)
+        if dtype == DATETIME:
+            if pd.api.types.is_numeric_dtype(series):
+                if epoch_unit is None:
+                    return series
+                return pd.to_datetime(series, unit=epoch_unit, utc=True)
+            try:
+                return pd.to_datetime(series, utc=True, format="ISO8601")
+            except ValueError:
+                # pandas < 2.0 doesn't support "ISO8601" format
+                return pd.to_datetime(series, utc=True)
+        return series.astype(dtype)
+    except (ValueError, TypeError, OverflowError):
+        return series
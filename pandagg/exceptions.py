@@ -8,7 +8,7 @@ class MappingError(Exception):
     pass
 
 
-class AbsentMappingFieldError(MappingError):
+class AbsentMappingFieldError(MappingError, ValueError):
     """Field is not present in mappings."""
 
     pass
@@ -1,18 +1,43 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from lighttree import Node as OriginalNode
+import uuid
 
 from pandagg.utils import DSLMixin
 
 
-class Node(DSLMixin, OriginalNode):
+class Node(DSLMixin):
+    """
+    Tree node, implementing the ``lighttree.Node`` interface.
+
+    Attributes are stored in ``__slots__``: subclasses declaring their own attributes in ``__slots__`` don't allocate
+    a per-instance ``__dict__``, which matters for numerous nodes (mappings fields, response buckets).
+    """
+
+    __slots__ = ("identifier", "keyed", "accept_children")
 
     KEY = None
     _type_name = None
 
     NID_SIZE = 8
 
+    def __init__(self, identifier=None, keyed=True, accept_children=True):
+        """
+        :param identifier: node identifier, must be unique per tree, auto-generated if not provided
+        :param keyed: if True children are referenced by key, else by order
+        :param accept_children: whether node accepts children nodes
+        """
+        if identifier is None:
+            identifier = str(uuid.uuid4())
+        self.identifier = identifier
+        self.keyed = keyed
+        self.accept_children = accept_children
+
+    def line_repr(self, depth, **kwargs):
+        if self.keyed:
+            return "{}", ""
+        return "[]", ""
+
     @staticmethod
     def expand__to_dot(params):
         nparams = {}
@@ -21,3 +46,14 @@ class Node(DSLMixin, OriginalNode):
                 pname = pname.replace("__", ".")
             nparams[pname] = pvalue
         return nparams
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        return self.identifier == other.identifier
+
+    def __str__(self):
+        return "%s, id=%s" % (self.__class__.__name__, self.identifier)
+
+    def __repr__(self):
+        return self.__str__()
@@ -61,6 +61,7 @@ class AggClause(Node):
     Define a method to build aggregation request.
     """
 
+    __slots__ = ("body", "meta", "_children")
     _type_name = "agg"
     KEY = None
     VALUE_ATTRS = None
@@ -242,6 +243,7 @@ class UniqueBucketAgg(BucketAggClause):
 
 
 class MultipleBucketAgg(BucketAggClause):
+    __slots__ = ("keyed_", "key_path")
 
     VALUE_ATTRS = None
     IMPLICIT_KEYED = False
@@ -285,6 +287,8 @@ class FieldOrScriptMetricAgg(MetricAgg):
     Metric aggregation based on single field.
     """
 
+    __slots__ = ("field", "script")
+
     VALUE_ATTRS = None
 
     def __init__(self, field=None, script=None, meta=None, **body):
@@ -291,10 +291,3 @@ class DateRange(Range):
     def __init__(self, field, key_as_string=True, meta=None, **body):
         self.key_as_string = key_as_string
         super(DateRange, self).__init__(field=field, keyed=True, meta=meta, **body)
-
-
-class Composite(MultipleBucketAgg):
-    KEY = "composite"
-
-    def get_filter(self, key):
-        raise NotImplementedError()
@@ -6,22 +6,26 @@ class Composite(BucketAggClause):
     KEY = "composite"
     VALUE_ATTRS = ["doc_count"]
 
-    def __init__(self, sources, size=None, after_key=None, meta=None, **body):
+    def __init__(
+        self, sources, size=None, after_key=None, after=None, meta=None, **body
+    ):
         """https://www.elastic.co/guide/en/elasticsearch/reference/current/search-aggregations-bucket-composite-aggregation.html
         :param sources:
         :param size:
-        :param after_key:
+        :param after: composite key from which buckets should be returned (`after_key` of previous page)
+        :param after_key: alias of `after`
         :param meta:
         :param body:
         """
+        after = after if after is not None else after_key
         self._sources = sources
         self._size = size
-        self._after_key = after_key
+        self._after_key = after
         self._children = body.pop("aggs", None) or body.pop("aggregations", None) or {}
         if size is not None:
             body["size"] = size
-        if after_key is not None:
-            body["after_key"] = after_key
+        if after is not None:
+            body["after"] = after
         super(Composite, self).__init__(meta=meta, sources=sources, **body)
 
     def extract_buckets(self, response_value):
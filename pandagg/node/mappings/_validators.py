@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fields values validators and coercers, per datatype: built once per field (see `Field.value_validator` and
+`Field.value_coercer`), they handle one value at a time.
+"""
+
+import datetime
+import ipaddress
+import math
+import numbers
+import re
+from functools import lru_cache
+
+
+def number(v, coerce=True):
+    """
+    Return numeric value, or None if value isn't a number (booleans aren't numbers). Numeric strings are accepted
+    if `coerce` is True.
+    """
+    type_ = type(v)
+    if type_ is int or type_ is float:
+        return v
+    if type_ is bool:
+        return None
+    if isinstance(v, numbers.Real):
+        # numpy scalars
+        return v
+    if coerce and isinstance(v, str):
+        try:
+            return int(v)
+        except ValueError:
+            pass
+        try:
+            return float(v)
+        except ValueError:
+            return None
+    return None
+
+
+def integer_coercer(v):
+    if type(v) is int:
+        return v
+    n = number(v)
+    if n is None:
+        return v
+    try:
+        # floating values are truncated
+        return int(n)
+    except (ValueError, OverflowError):
+        return v
+
+
+def float_coercer(v):
+    if type(v) is float:
+        return v
+    n = number(v)
+    if n is None:
+        return v
+    try:
+        return float(n)
+    except OverflowError:
+        return v
+
+
+def boolean_coercer(v):
+    if v == "true":
+        return True
+    if v in ("false", ""):
+        return False
+    return v
+
+
+def integer_validator(min_, max_, coerce=True):
+    def validate(v):
+        n = number(v, coerce)
+        if n is None:
+            return False
+        if type(n) is not int:
+            if isinstance(n, numbers.Integral):
+                n = int(n)
+            else:
+                n = float(n)
+                if not math.isfinite(n) or (not coerce and not n.is_integer()):
+                    return False
+                # floating values are truncated
+                n = int(n)
+        return min_ <= n <= max_
+
+    return validate
+
+
+def float_validator(max_, coerce=True):
+    def validate(v):
+        n = number(v, coerce)
+        if n is None:
+            return False
+        try:
+            n = float(n)
+        except OverflowError:
+            return False
+        return math.isfinite(n) and -max_ <= n <= max_
+
+    return validate
+
+
+def integer_array_validator(values, min_, max_, coerce=True):
+    kind = values.dtype.kind
+    if kind in "iu":
+        return (values >= min_) & (values <= max_)
+    if kind == "f":
+        mask = (values >= min_) & (values <= max_)
+        if not coerce:
+            mask &= values % 1 == 0
+        # missing values
+        return mask | (values != values)
+    return None
+
+
+def float_array_validator(values, max_):
+    kind = values.dtype.kind
+    if kind in "iu":
+        return (values >= -max_) & (values <= max_)
+    if kind == "f":
+        return ((values >= -max_) & (values <= max_)) | (values != values)
+    return None
+
+
+_YEAR = r"\d{4}"
+_MONTH = r"(?:0[1-9]|1[0-2])"
+_DAY = r"(?:0[1-9]|[12]\d|3[01])"
+_HOUR = r"(?:[01]\d|2[0-3])"
+_MINUTE = r"[0-5]\d"
+_FRACTION = r"[.,]\d{1,9}"
+_TIMEZONE = r"(?:Z|[+-]\d{2}(?::?\d{2})?)"
+_TIME = r"%s:%s:%s(?:%s)?%s" % (_HOUR, _MINUTE, _MINUTE, _FRACTION, _TIMEZONE)
+_TIME_NO_MILLIS = r"%s:%s:%s%s" % (_HOUR, _MINUTE, _MINUTE, _TIMEZONE)
+_DATE = r"%s-%s-%s" % (_YEAR, _MONTH, _DAY)
+
+# https://www.elastic.co/guide/en/elasticsearch/reference/current/mapping-date-format.html#built-in-date-formats
+# lenient variants (without "strict_" prefix) are validated as strict ones
+_BUILT_IN_DATE_FORMATS = {
+    "date_optional_time": r"%s(?:-%s(?:-%s(?:T%s(?::%s(?::%s(?:%s)?)?)?%s?)?)?)?"
+    % (_YEAR, _MONTH, _DAY, _HOUR, _MINUTE, _MINUTE, _FRACTION, _TIMEZONE),
+    "basic_date": r"%s%s%s" % (_YEAR, _MONTH, _DAY),
+    "basic_date_time": r"%s%s%sT%s%s%s%s%s"
+    % (_YEAR, _MONTH, _DAY, _HOUR, _MINUTE, _MINUTE, _FRACTION, _TIMEZONE),
+    "basic_date_time_no_millis": r"%s%s%sT%s%s%s%s"
+    % (_YEAR, _MONTH, _DAY, _HOUR, _MINUTE, _MINUTE, _TIMEZONE),
+    "date": _DATE,
+    "date_hour": r"%sT%s" % (_DATE, _HOUR),
+    "date_hour_minute": r"%sT%s:%s" % (_DATE, _HOUR, _MINUTE),
+    "date_hour_minute_second": r"%sT%s:%s:%s" % (_DATE, _HOUR, _MINUTE, _MINUTE),
+    "date_hour_minute_second_fraction": r"%sT%s:%s:%s%s"
+    % (_DATE, _HOUR, _MINUTE, _MINUTE, _FRACTION),
+    "date_hour_minute_second_millis": r"%sT%s:%s:%s%s"
+    % (_DATE, _HOUR, _MINUTE, _MINUTE, _FRACTION),
+    "date_time": r"%sT%s" % (_DATE, _TIME),
+    "date_time_no_millis": r"%sT%s" % (_DATE, _TIME_NO_MILLIS),
+    "hour": _HOUR,
+    "hour_minute": r"%s:%s" % (_HOUR, _MINUTE),
+    "hour_minute_second": r"%s:%s:%s" % (_HOUR, _MINUTE, _MINUTE),
+    "hour_minute_second_fraction": r"%s:%s:%s%s" % (_HOUR, _MINUTE, _MINUTE, _FRACTION),
+    "hour_minute_second_millis": r"%s:%s:%s%s" % (_HOUR, _MINUTE, _MINUTE, _FRACTION),
+    "time": _TIME,
+    "time_no_millis": _TIME_NO_MILLIS,
+    "t_time": r"T%s" % _TIME,
+    "t_time_no_millis": r"T%s" % _TIME_NO_MILLIS,
+    "year": _YEAR,
+    "year_month": r"%s-%s" % (_YEAR, _MONTH),
+    "year_month_day": _DATE,
+}
+_BUILT_IN_DATE_FORMATS["date_optional_time_nanos"] = _BUILT_IN_DATE_FORMATS[
+    "date_optional_time"
+]
+_EPOCH_FORMATS = ("epoch_millis", "epoch_second")
+# epoch format -> unit of numeric values
+_EPOCH_UNITS = {"epoch_millis": "ms", "epoch_second": "s"}
+_EPOCH_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+# java DateTimeFormatter letters -> regex, by number of repetitions (last one applies to more repetitions)
+_JAVA_DATE_LETTERS = {
+    "y": (r"\d{1,9}", r"\d{2}", r"\d{3,9}", r"\d{4}"),
+    "M": (r"(?:1[0-2]|0?[1-9])", _MONTH, r"[A-Za-z]{3}\.?", r"[A-Za-z]+"),
+    "L": (r"(?:1[0-2]|0?[1-9])", _MONTH, r"[A-Za-z]{3}\.?", r"[A-Za-z]+"),
+    "d": (r"(?:[12]\d|3[01]|0?[1-9])", _DAY),
+    "D": (r"\d{1,3}", r"\d{2,3}", r"\d{3}"),
+    "H": (r"(?:2[0-3]|[01]?\d)", _HOUR),
+    "k": (r"\d{1,2}", r"\d{2}"),
+    "K": (r"\d{1,2}", r"\d{2}"),
+    "h": (r"\d{1,2}", r"\d{2}"),
+    "m": (r"[0-5]?\d", _MINUTE),
+    "s": (r"[0-5]?\d", _MINUTE),
+    "n": (r"\d{1,9}",),
+    "a": (r"(?:AM|PM|am|pm)",),
+    "E": (r"[A-Za-z]{3}", r"[A-Za-z]{3}", r"[A-Za-z]{3}", r"[A-Za-z]+"),
+    "e": (r"\d", r"\d{2}", r"[A-Za-z]{3}", r"[A-Za-z]+"),
+    "w": (r"\d{1,2}", r"\d{2}"),
+    "Q": (r"\d", r"\d{2}", r"[A-Za-z0-9]+"),
+    "G": (r"[A-Za-z]+",),
+    "Z": (
+        r"[+-]\d{4}",
+        r"[+-]\d{4}",
+        r"[+-]\d{4}",
+        r"[A-Za-z]+[+-]\d{2}:\d{2}",
+        _TIMEZONE,
+    ),
+    "X": (_TIMEZONE,),
+    "x": (r"[+-]\d{2}(?::?\d{2})?",),
+    "z": (r"[A-Za-z][A-Za-z0-9_/+-]*",),
+    "V": (r"[A-Za-z][A-Za-z0-9_/+-]*",),
+}
+_JAVA_DATE_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|([A-Za-z])\1*|\[|\]|.")
+
+
+def java_date_pattern_regex(pattern):
+    """
+    Translate java DateTimeFormatter pattern into a regular expression, return None if pattern is not supported.
+    """
+    parts = []
+    for token in _JAVA_DATE_TOKEN_RE.finditer(pattern):
+        token, letter = token.group(0), token.group(1)
+        if letter is not None:
+            if letter == "u":
+                letter = "y"
+            if letter == "S":
+                parts.append(r"\d{%d}" % len(token))
+                continue
+            if letter not in _JAVA_DATE_LETTERS:
+                return None
+            regexes = _JAVA_DATE_LETTERS[letter]
+            parts.append(regexes[min(len(token), len(regexes)) - 1])
+        elif token.startswith("'"):
+            # quoted literal, in which '' stands for a single quote
+            parts.append(re.escape(token[1:-1].replace("''", "'") or "'"))
+        elif token == "[":
+            # optional section
+            parts.append("(?:")
+        elif token == "]":
+            parts.append(")?")
+        else:
+            parts.append(re.escape(token))
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def epoch_unit(format_=None):
+    """
+    Return unit ("ms" or "s") in which numeric values of a date field with this mapping `format` are expressed (first
+    epoch format applies), or None if numeric values aren't epoch timestamps.
+    """
+    for f in (format_ or "strict_date_optional_time||epoch_millis").split("||"):
+        f = f.strip()
+        if f in _EPOCH_UNITS:
+            return _EPOCH_UNITS[f]
+    return None
+
+
+@lru_cache(maxsize=None)
+def date_validator(format_=None, nanos=False):
+    """
+    Return function checking a date value against mapping `format` (built-in formats names, or java patterns,
+    separated by "||"), or None if some formats aren't supported. Cached per format.
+    """
+    formats = (format_ or "strict_date_optional_time||epoch_millis").split("||")
+    accept_numbers = False
+    regexes = []
+    for f in formats:
+        f = f.strip()
+        name = f.replace("strict_", "", 1) if f.startswith("strict_") else f
+        if f in _EPOCH_FORMATS:
+            accept_numbers = True
+            regexes.append(_EPOCH_RE.pattern)
+        elif name in _BUILT_IN_DATE_FORMATS:
+            regexes.append(_BUILT_IN_DATE_FORMATS[name])
+        else:
+            regex = java_date_pattern_regex(f)
+            if regex is None:
+                return None
+            regexes.append(regex)
+    match = re.compile("|".join("(?:%s)" % r for r in regexes)).fullmatch
+
+    def validate(v):
+        if isinstance(v, (datetime.date, datetime.time)):
+            return True
+        if isinstance(v, str):
+            return match(v) is not None and not (nanos and v.startswith("-"))
+        n = number(v, coerce=False)
+        if n is None:
+            return False
+        if accept_numbers:
+            return math.isfinite(n) and not (nanos and n < 0)
+        return match(str(n)) is not None
+
+    return validate
+
+
+_IP_RE = re.compile(
+    r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+)
+
+
+def is_ip(v):
+    if not isinstance(v, str):
+        return False
+    if _IP_RE.fullmatch(v):
+        return True
+    try:
+        ipaddress.ip_address(v)
+    except ValueError:
+        return False
+    return True
+
+
+_BASE64_RE = re.compile(
+    r"(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?"
+)
+
+
+def is_base64(v):
+    return isinstance(v, str) and _BASE64_RE.fullmatch(v) is not None
+
+
+def is_boolean(v):
+    return v is True or v is False or v in ("true", "false", "")
+
+
+def is_not_object(v):
+    return not isinstance(v, dict)
+
+
+def is_object(v):
+    return isinstance(v, dict)
+
+
+def is_lat_lon(lat, lon):
+    lat, lon = number(lat), number(lon)
+    if lat is None or lon is None:
+        return False
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+_GEOHASH_RE = re.compile(r"[0-9b-hjkmnp-z]{1,12}")
+_WKT_POINT_RE = re.compile(
+    r"\s*POINT\s*\(\s*(\S+)\s+(\S+)(?:\s+\S+)?\s*\)\s*", re.IGNORECASE
+)
+_WKT_RE = re.compile(
+    r"\s*(?:POINT|LINESTRING|POLYGON|MULTIPOINT|MULTILINESTRING|MULTIPOLYGON|GEOMETRYCOLLECTION|BBOX)\s*\(.*\)\s*",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def is_geo_point(v):
+    if isinstance(v, dict):
+        if "lat" in v and "lon" in v:
+            return is_lat_lon(v["lat"], v["lon"])
+        if v.get("type") in ("Point", "point"):
+            return is_geo_point(v.get("coordinates"))
+        return False
+    if isinstance(v, (list, tuple)):
+        # [lon, lat] or [lon, lat, z]
+        return len(v) in (2, 3) and is_lat_lon(v[1], v[0])
+    if not isinstance(v, str):
+        return False
+    if "," in v:
+        # "lat,lon" or "lat,lon,z"
+        coordinates = v.split(",")
+        return len(coordinates) in (2, 3) and is_lat_lon(
+            coordinates[0].strip(), coordinates[1].strip()
+        )
+    point = _WKT_POINT_RE.fullmatch(v)
+    if point is not None:
+        return is_lat_lon(point.group(2), point.group(1))
+    return _GEOHASH_RE.fullmatch(v) is not None
+
+
+def is_shape(v):
+    if isinstance(v, dict):
+        return "type" in v
+    return isinstance(v, str) and _WKT_RE.fullmatch(v) is not None
+
+
+def is_positive_number(v):
+    n = number(v)
+    return n is not None and math.isfinite(n) and n > 0
+
+
+_RANGE_BOUNDS = frozenset(["gt", "gte", "lt", "lte"])
+
+
+def range_validator(bound_validator):
+    def validate(v):
+        if not isinstance(v, dict) or not _RANGE_BOUNDS.issuperset(v):
+            return False
+        return all(b is None or bound_validator(b) for b in v.values())
+
+    return validate
+
+
+def is_histogram(v):
+    if not isinstance(v, dict):
+        return False
+    values, counts = v.get("values"), v.get("counts")
+    if not isinstance(values, list) or not isinstance(counts, list):
+        return False
+    return len(values) == len(counts) and all(
+        isinstance(c, int) and not isinstance(c, bool) and c >= 0 for c in counts
+    )
@@ -7,8 +7,11 @@ from pandagg.node._node import Node
 
 
 class Field(Node):
+    __slots__ = ("_subfield", "_body", "_multiple", "_nullable")
     _type_name = "field"
     KEY = None
+    # can a single value be an array (for instance geo_point [lon, lat] form)
+    _ARRAY_VALUE = False
 
     def __init__(self, multiple=None, nullable=True, **body):
         """
@@ -16,7 +19,7 @@ class Field(Node):
         :param nullable: boolean, default True, if False a `None` value will be considered as invalid.
         :param body: field body
         """
-        super(Node, self).__init__()
+        super(Field, self).__init__()
         self._subfield = body.pop("_subfield", False)
         self._body = body.copy()
         self._multiple = multiple
@@ -28,7 +31,53 @@ class Field(Node):
         return "", self._display_pattern % self.KEY.capitalize()
 
     def is_valid_value(self, v):
-        raise NotImplementedError()
+        validator = self.value_validator()
+        return validator is None or validator(v)
+
+    def value_validator(self):
+        """
+        Return function checking whether a single value is valid for this field, or None if any value is accepted.
+        Build it once to check many values.
+        """
+        return None
+
+    def value_coercer(self):
+        """
+        Return function converting a single value to the type elasticsearch indexes it as (for instance numeric
+        strings into numbers), or None if values are kept as is. Values that can't be converted are returned as is.
+        """
+        return None
+
+    def validate_values(self, values):
+        """
+        Check a batch of values (typically a column of documents), return a mask of booleans: a list, or for numpy
+        arrays and pandas series an object of the same type. Missing values (None) are considered as valid,
+        `nullable` constraint being checked at document level.
+        """
+        validator = self.value_validator()
+        is_array = hasattr(values, "dtype")
+        if validator is not None and is_array:
+            mask = self._validate_array(values)
+            if mask is not None:
+                return mask
+        if validator is None:
+            mask = [True] * len(values)
+        else:
+            mask = [v is None or validator(v) for v in values]
+        if not is_array:
+            return mask
+        if hasattr(values, "index"):
+            # pandas series
+            return values.__class__(mask, index=values.index, dtype=bool)
+        import numpy as np
+
+        return np.array(mask, dtype=bool)
+
+    def _validate_array(self, values):
+        """
+        Vectorized check of a numpy array or pandas series, return None if not supported for this array dtype.
+        """
+        return None
 
     @property
     def body(self):
@@ -56,6 +105,7 @@ class Field(Node):
 
 
 class ComplexField(Field):
+    __slots__ = ("properties",)
     KEY = None
 
     def __init__(self, **body):
@@ -65,11 +115,12 @@ class ComplexField(Field):
         self.properties = properties or {}
         super(ComplexField, self).__init__(**body)
 
-    def is_valid_value(self, v):
-        return isinstance(v, dict)
+    def value_validator(self):
+        return _is_dict
 
 
 class RegularField(Field):
+    __slots__ = ("fields",)
     KEY = None
 
     def __init__(self, **body):
@@ -79,6 +130,15 @@ class RegularField(Field):
         self.fields = fields
         super(RegularField, self).__init__(**body)
 
-    def is_valid_value(self, v):
-        # TODO - implement per field type
-        return True
+    def value_validator(self):
+        if self._body.get("ignore_malformed"):
+            return None
+        return self._value_validator()
+
+    def _value_validator(self):
+        # no restriction by default, see datatypes implementations
+        return None
+
+
+def _is_dict(v):
+    return isinstance(v, dict)
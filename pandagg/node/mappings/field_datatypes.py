@@ -1,105 +1,253 @@
 """https://www.elastic.co/guide/en/elasticsearch/reference/current/mapping-types.html"""
 
+import sys
+
+from . import _validators
 from .abstract import ComplexField, RegularField
 
 
+_INTEGER_BOUNDS = (-(2**31), 2**31 - 1)
+_LONG_BOUNDS = (-(2**63), 2**63 - 1)
+_FLOAT_MAX = 3.4028234663852886e38
+_DOUBLE_MAX = sys.float_info.max
+
+
+class _NumberField(RegularField):
+    """Numeric field, `coerce` mapping parameter (default True) allowing numeric strings and truncated floats."""
+
+    __slots__ = ()
+    # integer types bounds
+    _BOUNDS = None
+    # floating types maximal absolute value
+    _MAX = None
+
+    @property
+    def _coerce(self):
+        return self._body.get("coerce", True)
+
+    def _value_validator(self):
+        if self._BOUNDS is not None:
+            return _validators.integer_validator(*self._BOUNDS, coerce=self._coerce)
+        return _validators.float_validator(self._MAX, coerce=self._coerce)
+
+    def value_coercer(self):
+        if not self._coerce:
+            return None
+        if self._BOUNDS is not None:
+            return _validators.integer_coercer
+        return _validators.float_coercer
+
+    def _validate_array(self, values):
+        if self._BOUNDS is not None:
+            return _validators.integer_array_validator(
+                values, *self._BOUNDS, coerce=self._coerce
+            )
+        return _validators.float_array_validator(values, self._MAX)
+
+
+class _StringField(RegularField):
+    """Strings field, numbers and booleans being indexed as strings."""
+
+    __slots__ = ()
+
+    def _value_validator(self):
+        return _validators.is_not_object
+
+
 # CORE DATATYPES
 # string
-class Text(RegularField):
+class Text(_StringField):
+    __slots__ = ()
     KEY = "text"
 
 
-class Keyword(RegularField):
+class Keyword(_StringField):
+    __slots__ = ()
     KEY = "keyword"
 
 
 class ConstantKeyword(RegularField):
+    __slots__ = ()
     KEY = "constant_keyword"
 
+    def _value_validator(self):
+        if "value" not in self._body:
+            # value is set by first indexed document
+            return _validators.is_not_object
+        expected = self._body["value"]
+        return lambda v: v == expected
 
-class WildCard(RegularField):
+
+class WildCard(_StringField):
+    __slots__ = ()
     KEY = "wildcard"
 
 
 # numeric
-class Long(RegularField):
+class Long(_NumberField):
+    __slots__ = ()
     KEY = "long"
+    _BOUNDS = _LONG_BOUNDS
 
 
-class Integer(RegularField):
+class Integer(_NumberField):
+    __slots__ = ()
     KEY = "integer"
+    _BOUNDS = _INTEGER_BOUNDS
 
 
-class Short(RegularField):
+class Short(_NumberField):
+    __slots__ = ()
     KEY = "short"
+    _BOUNDS = (-(2**15), 2**15 - 1)
 
 
-class Byte(RegularField):
+class Byte(_NumberField):
+    __slots__ = ()
     KEY = "byte"
+    _BOUNDS = (-(2**7), 2**7 - 1)
 
 
-class Double(RegularField):
+class Double(_NumberField):
+    __slots__ = ()
     KEY = "double"
+    _MAX = _DOUBLE_MAX
 
 
-class Float(RegularField):
+class Float(_NumberField):
+    __slots__ = ()
     KEY = "float"
+    _MAX = _FLOAT_MAX
 
 
-class HalfFloat(RegularField):
+class HalfFloat(_NumberField):
+    __slots__ = ()
     KEY = "half_float"
+    _MAX = 65504.0
 
 
-class ScaledFloat(RegularField):
+class ScaledFloat(_NumberField):
+    __slots__ = ()
     KEY = "scaled_float"
+    # scaled values are stored as longs
+    _MAX = float(2**63 - 1)
+
+    def _value_validator(self):
+        scaling_factor = self._body.get("scaling_factor") or 1
+        validate_scaled = _validators.float_validator(self._MAX, coerce=False)
+        validate = _validators.float_validator(_DOUBLE_MAX, coerce=self._coerce)
+        return lambda v: validate(v) and validate_scaled(
+            float(_validators.number(v)) * scaling_factor
+        )
+
+    def _validate_array(self, values):
+        if values.dtype.kind not in "iuf":
+            # strings, objects..: checked value by value
+            return None
+        # scaled as floats, so that integers don't overflow
+        scaling_factor = float(self._body.get("scaling_factor") or 1)
+        return _validators.float_array_validator(values * scaling_factor, self._MAX)
 
 
 # date
 class Date(RegularField):
+    __slots__ = ()
     KEY = "date"
 
+    def _value_validator(self):
+        return _validators.date_validator(self._body.get("format"))
+
+    def epoch_unit(self):
+        """Return unit of numeric values ("ms" or "s"), or None if they aren't epoch timestamps in mapping format."""
+        return _validators.epoch_unit(self._body.get("format"))
+
 
 class DateNanos(RegularField):
+    __slots__ = ()
     KEY = "date_nanos"
 
+    def _value_validator(self):
+        # dates before epoch are rejected
+        return _validators.date_validator(self._body.get("format"), nanos=True)
+
+    def epoch_unit(self):
+        """Return unit of numeric values ("ms" or "s"), or None if they aren't epoch timestamps in mapping format."""
+        return _validators.epoch_unit(self._body.get("format"))
+
 
 # boolean
 class Boolean(RegularField):
+    __slots__ = ()
     KEY = "boolean"
 
+    def _value_validator(self):
+        return _validators.is_boolean
+
+    def value_coercer(self):
+        return _validators.boolean_coercer
+
 
 # binary
 class Binary(RegularField):
+    __slots__ = ()
     KEY = "binary"
 
+    def _value_validator(self):
+        return _validators.is_base64
+
 
 # range
 class IntegerRange(RegularField):
+    __slots__ = ()
     KEY = "integer_range"
 
+    def _value_validator(self):
+        return _validators.range_validator(Integer(**self._body)._value_validator())
+
 
 class FloatRange(RegularField):
+    __slots__ = ()
     KEY = "float_range"
 
+    def _value_validator(self):
+        return _validators.range_validator(Float(**self._body)._value_validator())
+
 
 class LongRange(RegularField):
+    __slots__ = ()
     KEY = "long_range"
 
+    def _value_validator(self):
+        return _validators.range_validator(Long(**self._body)._value_validator())
+
 
 class DoubleRange(RegularField):
+    __slots__ = ()
     KEY = "double_range"
 
+    def _value_validator(self):
+        return _validators.range_validator(Double(**self._body)._value_validator())
+
 
 class DateRange(RegularField):
+    __slots__ = ()
     KEY = "date_range"
 
+    def _value_validator(self):
+        validate_date = _validators.date_validator(self._body.get("format"))
+        if validate_date is None:
+            return None
+        return _validators.range_validator(validate_date)
+
 
 # COMPLEX DATATYPES
 class Object(ComplexField):
+    __slots__ = ()
     KEY = "object"
 
 
 class Nested(ComplexField):
+    __slots__ = ()
     KEY = "nested"
 
 
@@ -107,107 +255,209 @@ class Nested(ComplexField):
 class GeoPoint(RegularField):
     """For lat/lon points"""
 
+    __slots__ = ()
+
     KEY = "geo_point"
+    # [lon, lat] array is a single value
+    _ARRAY_VALUE = True
+
+    def _value_validator(self):
+        return _validators.is_geo_point
 
 
 class GeoShape(RegularField):
     """For complex shapes like polygons"""
 
+    __slots__ = ()
+
     KEY = "geo_shape"
 
+    def _value_validator(self):
+        return _validators.is_shape
+
 
 # SPECIALIZED DATATYPES
 class IP(RegularField):
     """for IPv4 and IPv6 addresses"""
 
+    __slots__ = ()
+
     KEY = "ip"
 
+    def _value_validator(self):
+        return _validators.is_ip
+
 
 class Completion(RegularField):
     """To provide auto-complete suggestions"""
 
+    __slots__ = ()
+
     KEY = "completion"
 
+    def _value_validator(self):
+        return lambda v: isinstance(v, str) or (isinstance(v, dict) and "input" in v)
+
 
 class TokenCount(RegularField):
     """To count the number of tokens in a string"""
 
+    __slots__ = ()
+
     KEY = "token_count"
 
+    def _value_validator(self):
+        return _validators.integer_validator(*_INTEGER_BOUNDS)
+
 
 class MapperMurMur3(RegularField):
     """To compute hashes of values at index-time and store them in the index"""
 
+    __slots__ = ()
+
     KEY = "murmur3"
 
 
 class MapperAnnotatedText(RegularField):
     """To index text containing special markup (typically used for identifying named entities)"""
 
+    __slots__ = ()
+
     KEY = "annotated-text"
 
+    def _value_validator(self):
+        return _validators.is_not_object
+
 
 class Percolator(RegularField):
     """Accepts queries from the query-dsl"""
 
+    __slots__ = ()
+
     KEY = "percolator"
 
+    def _value_validator(self):
+        # a single query clause
+        return lambda v: isinstance(v, dict) and len(v) == 1
+
 
 class Join(RegularField):
     """Defines parent/child relation for documents within the same index"""
 
+    __slots__ = ()
+
     KEY = "join"
 
+    def _value_validator(self):
+        return lambda v: isinstance(v, str) or (
+            isinstance(v, dict) and isinstance(v.get("name"), str)
+        )
+
 
 class RankFeature(RegularField):
     """Record numeric feature to boost hits at query time."""
 
+    __slots__ = ()
+
     KEY = "rank_feature"
 
+    def _value_validator(self):
+        return _validators.is_positive_number
+
 
 class RankFeatures(RegularField):
     """Record numeric features to boost hits at query time."""
 
+    __slots__ = ()
+
     KEY = "rank_features"
 
+    def _value_validator(self):
+        return lambda v: isinstance(v, dict) and all(
+            _validators.is_positive_number(f) for f in v.values()
+        )
+
 
 class DenseVector(RegularField):
     """Record dense vectors of float values."""
 
+    __slots__ = ()
+
     KEY = "dense_vector"
+    _ARRAY_VALUE = True
+
+    def _value_validator(self):
+        dims = self._body.get("dims")
+        validate = _validators.float_validator(_FLOAT_MAX, coerce=False)
+        return lambda v: (
+            isinstance(v, (list, tuple))
+            and (dims is None or len(v) == dims)
+            and all(validate(x) for x in v)
+        )
 
 
 class SparseVector(RegularField):
     """Record sparse vectors of float values."""
 
+    __slots__ = ()
+
     KEY = "sparse_vector"
 
+    def _value_validator(self):
+        return _validators.is_object
+
 
 class SearchAsYouType(RegularField):
     """A text-like field optimized for queries to implement as-you-type completion"""
 
+    __slots__ = ()
+
     KEY = "search_as_you_type"
 
+    def _value_validator(self):
+        return _validators.is_not_object
+
 
 class Alias(RegularField):
     """Defines an alias to an existing field."""
 
+    __slots__ = ()
+
     KEY = "alias"
 
+    def _value_validator(self):
+        # alias fields cannot be written to
+        return lambda v: False
+
 
 class Flattened(RegularField):
     """Allows an entire JSON object to be indexed as a single field."""
 
+    __slots__ = ()
+
     KEY = "flattened"
 
+    def _value_validator(self):
+        return _validators.is_object
+
 
 class Shape(RegularField):
     """For arbitrary cartesian geometries."""
 
+    __slots__ = ()
+
     KEY = "shape"
 
+    def _value_validator(self):
+        return _validators.is_shape
+
 
 class Histogram(RegularField):
     """For pre-aggregated numerical values for percentiles aggregations."""
 
+    __slots__ = ()
+
     KEY = "histogram"
+
+    def _value_validator(self):
+        return _validators.is_histogram
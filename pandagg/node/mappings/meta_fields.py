@@ -8,18 +8,24 @@ from .abstract import Field
 class Index(Field):
     """The index to which the document belongs."""
 
+    __slots__ = ()
+
     KEY = "_index"
 
 
 class Type(Field):
     """The document’s mappings type."""
 
+    __slots__ = ()
+
     KEY = "_type"
 
 
 class Id(Field):
     """The document’s ID."""
 
+    __slots__ = ()
+
     KEY = "_id"
 
 
@@ -27,12 +33,16 @@ class Id(Field):
 class Source(Field):
     """The original JSON representing the body of the document."""
 
+    __slots__ = ()
+
     KEY = "_source"
 
 
 class Size(Field):
     """The size of the _source field in bytes, provided by the mapper-size plugin."""
 
+    __slots__ = ()
+
     KEY = "_size"
 
 
@@ -40,12 +50,16 @@ class Size(Field):
 class FieldNames(Field):
     """All fields in the document which contain non-null values."""
 
+    __slots__ = ()
+
     KEY = "_field_names"
 
 
 class Ignored(Field):
     """All fields in the document that have been ignored at index time because of ignore_malformed."""
 
+    __slots__ = ()
+
     KEY = "_ignored"
 
 
@@ -53,6 +67,8 @@ class Ignored(Field):
 class Routing(Field):
     """A custom routing value which routes a document to a particular shard."""
 
+    __slots__ = ()
+
     KEY = "_routing"
 
 
@@ -60,4 +76,6 @@ class Routing(Field):
 class Meta(Field):
     """Application specific metadata."""
 
+    __slots__ = ()
+
     KEY = "_meta"
@@ -4,6 +4,7 @@
 import json
 
 from pandagg.node._node import Node
+from pandagg.utils import copy_containers
 
 
 def Q(type_or_query=None, **body):
@@ -43,13 +44,14 @@ def Q(type_or_query=None, **body):
 
 
 class QueryClause(Node):
+    __slots__ = ("body", "_named", "_children")
     _type_name = "query"
     KEY = None
 
     def __init__(
         self, _name=None, accept_children=True, keyed=True, _children=None, **body
     ):
-        self.body = body.copy()
+        self.body = body
         self._named = _name is not None
         super(QueryClause, self).__init__(
             identifier=_name, accept_children=accept_children, keyed=keyed
@@ -108,7 +110,58 @@ class LeafQueryClause(QueryClause):
         )
 
 
+class RawClause(LeafQueryClause):
+    """
+    Query clause kept in its serialized form, serialized as is: used by lazy queries
+    (see :class:`~pandagg.tree.query.Query`), until clause is expanded.
+
+    >>> RawClause({"bool": {"filter": [{"term": {"user": 1}}]}})
+    """
+
+    __slots__ = ("raw",)
+    # not registered among query clauses types
+    _type_name = None
+
+    def __init__(self, raw):
+        if not isinstance(raw, dict) or len(raw) != 1:
+            raise ValueError(
+                "Invalid query clause declaration (expect a single key): got <%s>" % raw
+            )
+        self.raw = raw
+        super(RawClause, self).__init__()
+
+    @property
+    def KEY(self):
+        return next(iter(self.raw))
+
+    def line_repr(self, depth, **kwargs):
+        body = self.raw[self.KEY]
+        if not isinstance(body, dict):
+            return self.KEY, str(json.dumps(body))
+        return self.KEY, self._params_repr(body)
+
+    def expand(self):
+        """
+        Return parsed clause, compound clauses children being kept as dicts. Unless clause is named (in which case it is
+        identified by its name), parsed clause keeps the same identifier.
+        """
+        node = Q(self.raw)
+        if not node._named:
+            node.identifier = self.identifier
+        return node
+
+    def to_dict(self):
+        # serialized body must not be altered through returned dict
+        return copy_containers(self.raw)
+
+    def __str__(self):
+        return "<{class_}, id={id}, raw={raw}>".format(
+            class_=str(self.__class__.__name__), id=str(self.identifier), raw=self.raw
+        )
+
+
 class AbstractSingleFieldQueryClause(LeafQueryClause):
+    __slots__ = ("field",)
     _FIELD_AT_BODY_ROOT = False
 
     def __init__(self, field, _name=None, **body):
@@ -168,6 +221,7 @@ class KeyFieldQueryClause(AbstractSingleFieldQueryClause):
     -> body = {"term": {"user": {"value": "Kimchy"}}}
     """
 
+    __slots__ = ("inner_body",)
     _implicit_param = None
 
     def __init__(self, field=None, _name=None, _expand__to_dot=True, **params):
@@ -200,6 +254,8 @@ class KeyFieldQueryClause(AbstractSingleFieldQueryClause):
 
 
 class MultiFieldsQueryClause(LeafQueryClause):
+    __slots__ = ("fields",)
+
     def __init__(self, fields, _name=None, **body):
         self.fields = fields
         super(LeafQueryClause, self).__init__(_name=_name, fields=fields, **body)
@@ -1,18 +1,30 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from itertools import count
+
 from pandagg.node._node import Node
 
+# buckets are numerous and only referenced within their response tree: cheap integer identifiers are used instead
+# of uuids
+_bucket_ids = count()
+
 
 class BucketNode(Node):
-    def __init__(self):
+    __slots__ = ("level",)
+
+    def __init__(self, identifier=None):
         self.level = None
-        super(BucketNode, self).__init__(keyed=False)
+        if identifier is None:
+            identifier = next(_bucket_ids)
+        super(BucketNode, self).__init__(identifier=identifier, keyed=False)
 
 
 class Bucket(BucketNode):
-    def __init__(self, value, key=None, level=None):
-        super(Bucket, self).__init__()
+    __slots__ = ("value", "key")
+
+    def __init__(self, value, key=None, level=None, identifier=None):
+        super(Bucket, self).__init__(identifier=identifier)
         self.value = value
         self.level = level
         self.key = key
@@ -1,13 +1,27 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import copy
-
 from future.utils import iterkeys, iteritems
-
+from six import integer_types
+
+from pandagg.arrow import (
+    arrow_to_pandas,
+    field_arrow_type,
+    mappings_arrow_type,
+    to_arrow_table,
+    _pyarrow,
+)
+from pandagg.dtypes import (
+    DATETIME,
+    coerce_series,
+    field_dtype,
+    field_epoch_unit,
+    mappings_dtype,
+    mappings_field,
+)
 from pandagg.interactive.response import IResponse
 from pandagg.node.aggs.abstract import UniqueBucketAgg, MetricAgg, Root
-from pandagg.node.aggs.bucket import Nested, ReverseNested
+from pandagg.node.aggs.bucket import DateHistogram, Nested, ReverseNested, Terms
 from pandagg.tree.response import AggsResponseTree
 
 
@@ -19,7 +33,7 @@ class Response:
         self.took = data["took"]
         self.timed_out = data["timed_out"]
         self._shards = data["_shards"]
-        self.hits = Hits(data["hits"])
+        self.hits = Hits(data["hits"], mappings=search._mappings)
         self.aggregations = Aggregations(
             data.get("aggregations", {}), search=self.__search
         )
@@ -45,17 +59,57 @@ class Response:
 
 
 class Hits:
-    def __init__(self, hits):
+    """
+    Sequence of hits: ``Hit`` views are only built when hits are accessed (by index or iteration), slicing returns a
+    ``Hits`` instance, and hits values can be extracted without building per-hit objects (see :func:`column`).
+    """
+
+    def __init__(self, hits, mappings=None):
         self.data = hits
+        # used to derive arrow schema
+        self.mappings = mappings
         self.total = hits["total"]
-        self.hits = [Hit(hit) for hit in hits.get("hits", [])]
         self.max_score = hits["max_score"]
+        self._hits = hits.get("hits", [])
+
+    @property
+    def hits(self):
+        return [Hit(hit) for hit in self._hits]
 
     def __len__(self):
-        return len(self.hits)
+        return len(self._hits)
 
     def __iter__(self):
-        return iter(self.hits)
+        for hit in self._hits:
+            yield Hit(hit)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            data = dict(self.data)
+            data["hits"] = self._hits[key]
+            return Hits(data, mappings=self.mappings)
+        return Hit(self._hits[key])
+
+    def column(self, path, default=None):
+        """
+        Return list of values at `path` of each hit, extracted from raw hits without building per-hit objects.
+
+        >>> hits.column("_source.price")
+        [12.5, 3.0, None]
+
+        Path keys are separated by dots (keys containing dots are supported), values of arrays of objects are
+        concatenated in a list.
+
+        :param path: path in hits, for instance "_id", "_score", "_source.user.name", "fields.price"
+        :param default: value of hits not containing path
+        """
+        parts = path.split(".")
+        if len(parts) == 1:
+            return [hit.get(path, default) for hit in self._hits]
+        values = [_path_value(hit, parts) for hit in self._hits]
+        if default is None:
+            return values
+        return [default if v is None else v for v in values]
 
     def _total_repr(self):
         if not isinstance(self.total, dict):
@@ -66,13 +120,29 @@ class Hits:
             return ">=%d" % self.total["value"]
         raise ValueError("Invalid total %s" % self.total)
 
-    def to_dataframe(self, expand_source=True, source_only=True):
+    def to_dataframe(self, expand_source=True, source_only=True, dtype_backend=None):
         """
         Return hits as pandas dataframe.
         Requires pandas dependency.
+
+        `_source` columns dtypes are derived from mappings: low cardinality keyword fields are categorical, dates
+        are UTC datetimes, integers are nullable integers (other columns dtypes are inferred).
+
         :param expand_source: if True, `_source` sub-fields are expanded as columns
         :param source_only: if True, doesn't include hit metadata (except id which is used as dataframe index)
+        :param dtype_backend: if "pyarrow", dataframe is built from :func:`to_arrow` table without copy, with arrow
+            backed dtypes
         """
+        if dtype_backend == "pyarrow":
+            return arrow_to_pandas(
+                self.to_arrow(expand_source=expand_source, source_only=source_only),
+                index=["_id"] if self.data.get("hits") else None,
+            )
+        if dtype_backend is not None:
+            raise ValueError(
+                'Unsupported dtype_backend <%s>, expected None or "pyarrow"'
+                % dtype_backend
+            )
         try:
             import pandas as pd
         except ImportError:
@@ -88,13 +158,77 @@ class Hits:
         flattened_hits = []
         for hit in hits:
             hit_metadata = hit.copy()
-            hit_source = hit_metadata.pop("_source")
+            # copy to avoid altering raw response
+            hit_source = hit_metadata.pop("_source").copy()
             if source_only:
                 hit_source["_id"] = hit_metadata["_id"]
             else:
                 hit_source.update(hit_metadata)
             flattened_hits.append(hit_source)
-        return pd.DataFrame(flattened_hits).set_index("_id")
+        df = pd.DataFrame(flattened_hits).set_index("_id")
+        for column_name in df.columns:
+            field = mappings_field(self.mappings, column_name)
+            dtype = field_dtype(field)
+            if dtype is not None:
+                df[column_name] = coerce_series(
+                    df[column_name], dtype, epoch_unit=field_epoch_unit(field)
+                )
+        return df
+
+    def to_arrow(self, expand_source=True, source_only=True, mappings=None):
+        """
+        Return hits as ``pyarrow.Table``, built column by column from response, without intermediate dataframe.
+        Requires pyarrow dependency.
+
+        `_source` columns types are derived from mappings (keyword fields are dictionary-encoded, dates are UTC
+        timestamps, numeric fields keep their precision), other columns types are inferred.
+        Table can be handed over to pandas (see :func:`to_dataframe` `dtype_backend` parameter) or polars
+        (``polars.from_arrow(table)``) without copy.
+
+        :param expand_source: if True, `_source` sub-fields are expanded as columns
+        :param source_only: if True, doesn't include hit metadata (except `_id`)
+        :param mappings: ``pandagg.tree.mappings.Mappings`` instance used to derive schema, defaults to search
+            mappings
+        """
+        _pyarrow()
+        mappings = mappings if mappings is not None else self.mappings
+        hits = self.data.get("hits", [])
+        if not hits:
+            return to_arrow_table([])
+        if not expand_source:
+            names = self._column_names(hits)
+            return to_arrow_table(
+                [(name, [hit.get(name) for hit in hits], None) for name in names]
+            )
+        sources = [hit.get("_source") or {} for hit in hits]
+        columns = [("_id", [hit.get("_id") for hit in hits], None)]
+        for name in self._column_names(sources):
+            if name == "_id":
+                continue
+            field = mappings_field(mappings, name)
+            columns.append(
+                (
+                    name,
+                    [source.get(name) for source in sources],
+                    field_arrow_type(field),
+                    field_epoch_unit(field),
+                )
+            )
+        if not source_only:
+            for name in self._column_names(hits):
+                if name in ("_id", "_source"):
+                    continue
+                columns.append((name, [hit.get(name) for hit in hits], None))
+        return to_arrow_table(columns)
+
+    @staticmethod
+    def _column_names(rows):
+        # keys of all rows, in order of appearance
+        names = {}
+        for row in rows:
+            for name in row:
+                names[name] = None
+        return list(names)
 
     def __repr__(self):
         if not isinstance(self.total, dict):
@@ -105,22 +239,82 @@ class Hits:
             total_repr = ">%d" % self.total["value"]
         else:
             raise ValueError("Invalid total %s" % self.total)
-        return "<Hits> total: %s, contains %d hits" % (total_repr, len(self.hits))
+        return "<Hits> total: %s, contains %d hits" % (total_repr, len(self))
 
 
 class Hit:
+    """
+    View over raw hit.
+    """
+
+    __slots__ = ("data",)
+
     def __init__(self, data):
         self.data = data
-        self._source = data.get("_source")
-        self._score = data.get("_score")
-        self._id = data.get("_id")
-        self._type = data.get("_type")
-        self._index = data.get("_index")
+
+    @property
+    def _source(self):
+        return self.data.get("_source")
+
+    @property
+    def _score(self):
+        return self.data.get("_score")
+
+    @property
+    def _id(self):
+        return self.data.get("_id")
+
+    @property
+    def _type(self):
+        return self.data.get("_type")
+
+    @property
+    def _index(self):
+        return self.data.get("_index")
 
     def __repr__(self):
         return "<Hit %s> score=%.2f" % (self._id, self._score)
 
 
+def _is_integer_column(values):
+    has_integer = False
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, integer_types):
+            return False
+        has_integer = True
+    return has_integer
+
+
+def _path_value(value, parts):
+    """
+    Return value at path (list of keys) in dict, None if absent. Values of arrays of objects are concatenated.
+    """
+    for i, part in enumerate(parts):
+        if isinstance(value, list):
+            values = []
+            for item in value:
+                item_value = _path_value(item, parts[i:])
+                if isinstance(item_value, list):
+                    values.extend(item_value)
+                elif item_value is not None:
+                    values.append(item_value)
+            return values or None
+        if not isinstance(value, dict):
+            return None
+        if part in value:
+            value = value[part]
+            continue
+        # keys containing dots
+        for j in range(len(parts), i + 1, -1):
+            key = ".".join(parts[i:j])
+            if key in value:
+                return _path_value(value[key], parts[j:])
+        return None
+    return value
+
+
 class Aggregations:
     def __init__(self, data, search):
         self.data = data
@@ -149,59 +343,141 @@ class Aggregations:
         return self.data[key]
 
     def _parse_group_by(
+        self, response, until, row_as_tuple=False, with_single_bucket_groups=False
+    ):
+        """
+        Parsing of succession of grouping aggregation clauses, until `until` aggregation included.
+
+        Yields each row for which last bucket aggregation generated buckets, as (row keys, bucket) tuples.
+        """
+        chain = self._grouping_chain(self._aggs.id_from_key(until))
+        index_names, index_columns, buckets = self._walk_buckets(
+            response, chain, with_single_bucket_groups
+        )
+        for i, raw_bucket in enumerate(buckets):
+            keys = [column[i] for column in index_columns]
+            if row_as_tuple:
+                yield tuple(keys), raw_bucket
+            else:
+                yield dict(zip(index_names, keys)), raw_bucket
+
+    def _grouping_chain(self, nid):
+        """
+        Return (key, node) tuples of aggregations from top-most one to `nid` one included.
+        """
+        return [
+            (k, n)
+            for k, n in self._aggs.ancestors(nid, from_root=True, include_current=True)
+            if k is not None
+        ]
+
+    @staticmethod
+    def _walk_buckets(response, chain, with_single_bucket_groups):
+        """
+        Walk buckets of a chain of grouping aggregations iteratively, one level at a time, building one column of
+        keys per grouping level (single bucket aggregations levels are omitted, unless `with_single_bucket_groups`).
+
+        Return index names, index columns, and buckets of last level (aligned with index columns).
+        """
+        index_names, index_columns = [], []
+        buckets = [response]
+        for agg_name, agg_node in chain:
+            extract_buckets = agg_node.extract_buckets
+            parents, keys, level_buckets = [], [], []
+            for i, bucket in enumerate(buckets):
+                if agg_name not in bucket:
+                    continue
+                for key, raw_bucket in extract_buckets(bucket[agg_name]):
+                    parents.append(i)
+                    keys.append(key)
+                    level_buckets.append(raw_bucket)
+            unique = isinstance(agg_node, UniqueBucketAgg)
+            if not unique or len(parents) != len(buckets):
+                # align keys of upper levels on current level buckets
+                index_columns = [
+                    [column[i] for i in parents] for column in index_columns
+                ]
+            if not unique or with_single_bucket_groups:
+                index_names.append(agg_name)
+                index_columns.append(keys)
+            buckets = level_buckets
+        return index_names, index_columns, buckets
+
+    def _columns(
         self,
-        response,
-        until,
-        row=None,
-        agg_name=None,
-        ancestors=None,
-        row_as_tuple=False,
+        grouped_by=None,
+        normalize=True,
+        expand_columns=True,
+        expand_sep="|",
         with_single_bucket_groups=False,
     ):
         """
-        Recursive parsing of succession of grouping aggregation clauses.
-
-        Yields each row for which last bucket aggregation generated buckets.
-        """
-        # initialization: find ancestors once for faster computation
-        if ancestors is None:
-            until_id = self._aggs.id_from_key(until)
-            ancestors = self._aggs.ancestors(until_id, include_current=True)
-            # remove eventual fake root
-            ancestors = [(k, n) for k, n in ancestors if k is not None]
-            agg_name, agg_node = ancestors[-1]
-        if not row:
-            row = [] if row_as_tuple else {}
-        if agg_name in response:
-            agg_node = [n for k, n in ancestors if k == agg_name][0]
-            for key, raw_bucket in agg_node.extract_buckets(response[agg_name]):
-                sub_row = copy.copy(row)
-                if (
-                    not isinstance(agg_node, UniqueBucketAgg)
-                    or with_single_bucket_groups
-                ):
-                    if row_as_tuple:
-                        sub_row.append(key)
-                    else:
-                        sub_row[agg_name] = key
-                if agg_name == until:
-                    # end real yield
-                    if row_as_tuple:
-                        yield tuple(sub_row), raw_bucket
-                    else:
-                        yield sub_row, raw_bucket
-                elif agg_name in {k for k, _ in ancestors}:
-                    # yield children
-                    for child_key, _ in self._aggs.children(agg_node.identifier):
-                        for nrow, nraw_bucket in self._parse_group_by(
-                            row=sub_row,
-                            response=raw_bucket,
-                            agg_name=child_key,
-                            until=until,
-                            row_as_tuple=row_as_tuple,
-                            ancestors=ancestors,
-                        ):
-                            yield nrow, nraw_bucket
+        Columnar parsing of response (see `to_tabular`): response is walked once, keys and values being appended to
+        per-column lists.
+
+        Return index names, index columns, values columns and number of rows. Values columns are a dict of
+        column name -> list of values, except for expanded columns (that aren't present for all rows) which are
+        dicts of row position -> value.
+        """
+        grouping_key, grouping_agg = self._grouping_agg(grouped_by)
+        if grouping_key is None:
+            chain = []
+        else:
+            chain = self._grouping_chain(grouping_agg.identifier)
+        index_names, index_columns, buckets = self._walk_buckets(
+            self.data, chain, with_single_bucket_groups
+        )
+        columns = self._value_columns(
+            buckets, grouping_key, grouping_agg, normalize, expand_columns, expand_sep
+        )
+        return index_names, index_columns, columns, len(buckets)
+
+    def _value_columns(
+        self, buckets, grouping_key, grouping_agg, normalize, expand_columns, expand_sep
+    ):
+        """
+        Return values columns of buckets of grouping aggregation (see `_columns`).
+        """
+        columns = {}
+        if grouping_key is not None and not isinstance(grouping_agg, Root):
+            extract_value = grouping_agg.extract_bucket_value
+            columns[grouping_agg.VALUE_ATTRS[0]] = [extract_value(b) for b in buckets]
+            children = self._aggs.children(grouping_agg.identifier)
+        else:
+            children = self._aggs.children(self._aggs.root)
+
+        # one column per child, or per child bucket if expanded
+        for child_key, child in children:
+            extract_value = child.extract_bucket_value
+            if isinstance(child, (UniqueBucketAgg, MetricAgg)):
+                columns[child_key] = [extract_value(b[child_key]) for b in buckets]
+            elif expand_columns:
+                for i, raw_bucket in enumerate(buckets):
+                    for key, bucket in child.extract_buckets(raw_bucket[child_key]):
+                        column_name = "%s%s%s" % (child_key, expand_sep, key)
+                        columns.setdefault(column_name, {})[i] = extract_value(bucket)
+            elif normalize:
+                columns[child_key] = [
+                    next(self._normalize_buckets(b, child_key), None) for b in buckets
+                ]
+            else:
+                columns[child_key] = [b[child_key] for b in buckets]
+        return columns
+
+    @staticmethod
+    def _rows_values(columns, nb_rows):
+        """
+        Return values of each row, as dicts, from values columns (see `_columns`).
+        """
+        rows_values = [{} for _ in range(nb_rows)]
+        for column_name, column in iteritems(columns):
+            if isinstance(column, dict):
+                for i, value in iteritems(column):
+                    rows_values[i][column_name] = value
+            else:
+                for row_values, value in zip(rows_values, column):
+                    row_values[column_name] = value
+        return rows_values
 
     def _normalize_buckets(self, agg_response, agg_name=None):
         """
@@ -295,88 +571,60 @@ class Aggregations:
         :param normalize: if True, normalize columns buckets
         :return: index, index_names, values
         """
-        grouping_key, grouping_agg = self._grouping_agg(grouped_by)
-        if grouping_key is None:
-            index_values = [(tuple() if index_orient else dict(), self.data)]
-            index_names = []
-        else:
-            index_names = [
-                k
-                for k, a in self._aggs.ancestors(
-                    grouping_agg.identifier, from_root=True, include_current=True
-                )
-                if (not isinstance(a, UniqueBucketAgg) or with_single_bucket_groups)
-                and k is not None
-            ]
-            index_values = list(
-                self._parse_group_by(
-                    response=self.data,
-                    row_as_tuple=index_orient,
-                    until=grouping_key,
-                    with_single_bucket_groups=with_single_bucket_groups,
-                )
-            )
-            if not index_values:
-                return [], []
+        index_names, index_columns, columns, nb_rows = self._columns(
+            grouped_by=grouped_by,
+            normalize=normalize,
+            expand_columns=expand_columns,
+            expand_sep=expand_sep,
+            with_single_bucket_groups=with_single_bucket_groups,
+        )
+        if not nb_rows:
+            return [], []
 
-        if index_orient:
-            rows = {
-                row_index: self._serialize_columns(
-                    row_values,
-                    normalize=normalize,
-                    total_agg=grouping_agg,
-                    expand_columns=expand_columns,
-                    expand_sep=expand_sep,
-                )
-                for row_index, row_values in index_values
-            }
+        rows_values = self._rows_values(columns, nb_rows)
+        if index_columns:
+            rows_index = list(zip(*index_columns))
         else:
-            rows = [
-                dict(
-                    row_index,
-                    **self._serialize_columns(
-                        row_values,
-                        normalize=normalize,
-                        total_agg=grouping_agg,
-                        expand_columns=expand_columns,
-                        expand_sep=expand_sep,
-                    )
-                )
-                for row_index, row_values in index_values
-            ]
-        return index_names, rows
+            rows_index = [()] * nb_rows
+        if index_orient:
+            return index_names, dict(zip(rows_index, rows_values))
+        return (
+            index_names,
+            [
+                dict(zip(index_names, row_index), **row_values)
+                for row_index, row_values in zip(rows_index, rows_values)
+            ],
+        )
 
-    def _serialize_columns(
-        self, row_data, normalize, expand_columns, expand_sep, total_agg=None
+    def to_dataframe(
+        self,
+        grouped_by=None,
+        normalize_children=True,
+        with_single_bucket_groups=False,
+        dtype_backend=None,
     ):
-        # extract value (usually 'doc_count') of grouping agg node
-        result = {}
-        if total_agg is not None and not isinstance(total_agg, Root):
-            result[total_agg.VALUE_ATTRS[0]] = total_agg.extract_bucket_value(row_data)
-            grouping_agg_children = self._aggs.children(total_agg.identifier)
-        else:
-            grouping_agg_children = self._aggs.children(self._aggs.root)
+        """
+        Return tabular view of aggregations as pandas dataframe (see :func:`to_tabular`).
+        Requires pandas dependency.
 
-        # extract values of children, one columns per child
-        for child_key, child in grouping_agg_children:
-            if isinstance(child, (UniqueBucketAgg, MetricAgg)):
-                result[child_key] = child.extract_bucket_value(row_data[child_key])
-            elif expand_columns:
-                for key, bucket in child.extract_buckets(row_data[child_key]):
-                    result[
-                        "%s%s%s" % (child_key, expand_sep, key)
-                    ] = child.extract_bucket_value(bucket)
-            elif normalize:
-                result[child_key] = next(
-                    self._normalize_buckets(row_data, child_key), None
-                )
-            else:
-                result[child_key] = row_data[child_key]
-        return result
+        Index levels dtypes are derived from mappings (terms on low cardinality keyword fields are categorical,
+        date histograms keys are UTC datetimes), integer values (documents counts..) are nullable integers.
 
-    def to_dataframe(
-        self, grouped_by=None, normalize_children=True, with_single_bucket_groups=False
-    ):
+        :param dtype_backend: if "pyarrow", dataframe is built from :func:`to_arrow` table without copy, with arrow
+            backed dtypes
+        """
+        if dtype_backend == "pyarrow":
+            index_names, table = self._arrow_table(
+                grouped_by=grouped_by,
+                normalize=normalize_children,
+                with_single_bucket_groups=with_single_bucket_groups,
+            )
+            return arrow_to_pandas(table, index=index_names)
+        if dtype_backend is not None:
+            raise ValueError(
+                'Unsupported dtype_backend <%s>, expected None or "pyarrow"'
+                % dtype_backend
+            )
         try:
             import pandas as pd
         except ImportError:
@@ -384,20 +632,93 @@ class Aggregations:
                 'Using dataframe output format requires to install pandas. Please install "pandas" or '
                 "use another output format."
             )
-        index_names, rows = self.to_tabular(
-            index_orient=True,
+        index_names, index_columns, columns, nb_rows = self._columns(
             grouped_by=grouped_by,
             normalize=normalize_children,
             with_single_bucket_groups=with_single_bucket_groups,
         )
-        index, values = zip(*iteritems(rows))
-        if not index:
+        if not nb_rows:
             return pd.DataFrame()
-        if len(index[0]) == 0:
-            index = (None,) * len(index)
+        if index_columns:
+            index = pd.MultiIndex.from_arrays(
+                [
+                    coerce_series(pd.Series(column), self._key_dtype(name))
+                    for name, column in zip(index_names, index_columns)
+                ],
+                names=index_names,
+            )
         else:
-            index = pd.MultiIndex.from_tuples(index, names=index_names)
-        return pd.DataFrame(index=index, data=list(values))
+            index = [None] * nb_rows
+        data = {}
+        for column_name, column in iteritems(columns):
+            if isinstance(column, dict):
+                column = [column.get(i) for i in range(nb_rows)]
+            if _is_integer_column(column):
+                # nullable integers, so that counts of missing buckets don't turn columns into floats
+                column = pd.array(column, dtype="Int64")
+            data[column_name] = column
+        return pd.DataFrame(data, index=index, columns=list(columns))
+
+    def to_arrow(
+        self, grouped_by=None, normalize_children=True, with_single_bucket_groups=False
+    ):
+        """
+        Return tabular view of aggregations as ``pyarrow.Table`` (see :func:`to_tabular`), grouping levels keys
+        being the first columns. Table is built column by column from response, without intermediate dataframe.
+        Requires pyarrow dependency.
+
+        Keys columns types are derived from mappings (terms on keyword fields are dictionary-encoded, date
+        histograms keys are UTC timestamps), values columns types are inferred.
+        Table can be handed over to pandas (see :func:`to_dataframe` `dtype_backend` parameter) or polars
+        (``polars.from_arrow(table)``) without copy.
+        """
+        _, table = self._arrow_table(
+            grouped_by=grouped_by,
+            normalize=normalize_children,
+            with_single_bucket_groups=with_single_bucket_groups,
+        )
+        return table
+
+    def _arrow_table(self, grouped_by, normalize, with_single_bucket_groups):
+        _pyarrow()
+        index_names, index_columns, columns, nb_rows = self._columns(
+            grouped_by=grouped_by,
+            normalize=normalize,
+            with_single_bucket_groups=with_single_bucket_groups,
+        )
+        if not nb_rows:
+            return [], to_arrow_table([])
+        table_columns = [
+            (name, column, self._key_arrow_type(name))
+            for name, column in zip(index_names, index_columns)
+        ]
+        for column_name, column in iteritems(columns):
+            if isinstance(column, dict):
+                column = [column.get(i) for i in range(nb_rows)]
+            table_columns.append((column_name, column, None))
+        return index_names, to_arrow_table(table_columns)
+
+    def _key_dtype(self, agg_name):
+        """
+        Return pandas dtype of buckets keys of aggregation, or None if it should be inferred.
+        """
+        _, agg_node = self._aggs.get(self._aggs.id_from_key(agg_name))
+        if isinstance(agg_node, DateHistogram):
+            return DATETIME
+        if isinstance(agg_node, Terms):
+            return mappings_dtype(self._aggs.mappings, agg_node.field)
+        return None
+
+    def _key_arrow_type(self, agg_name):
+        """
+        Return arrow type of buckets keys of aggregation, or None if it should be inferred.
+        """
+        _, agg_node = self._aggs.get(self._aggs.id_from_key(agg_name))
+        if isinstance(agg_node, DateHistogram):
+            return _pyarrow().timestamp("ms", tz="UTC")
+        if isinstance(agg_node, Terms):
+            return mappings_arrow_type(self._aggs.mappings, agg_node.field)
+        return None
 
     def to_normalized(self):
         children = []
@@ -414,7 +735,8 @@ class Aggregations:
 
     def serialize(self, output="tabular", **kwargs):
         """
-        :param output: output format, one of "raw", "tree", "interactive_tree", "normalized", "tabular", "dataframe"
+        :param output: output format, one of "raw", "tree", "interactive_tree", "normalized", "tabular", "dataframe",
+            "arrow"
         :param kwargs: tabular serialization kwargs
         :return:
         """
@@ -430,6 +752,8 @@ class Aggregations:
             return self.to_tabular(**kwargs)
         elif output == "dataframe":
             return self.to_dataframe(**kwargs)
+        elif output == "arrow":
+            return self.to_arrow(**kwargs)
         else:
             raise NotImplementedError("Unkown %s output format." % output)
 
@@ -1,17 +1,68 @@
 # adapted from elasticsearch-dsl/search.py
+import asyncio
 import copy
 import json
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue, Full
+
+from elasticsearch.client.utils import _make_path
+from elasticsearch.exceptions import (
+    ConnectionError as TransportConnectionError,
+    HTTP_EXCEPTIONS,
+    TransportError,
+)
 from elasticsearch.helpers import scan
 from lighttree.exceptions import NotFoundNodeError
-
-from pandagg.connections import get_connection
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from pandagg.cache import request_key, SingleFlight, AsyncSingleFlight
+from pandagg.connections import (
+    get_connection,
+    get_cache,
+    get_async_connection,
+    async_connections,
+)
 from pandagg.query import Bool
 from pandagg.response import Response
+from pandagg.serializer import JSONSerializer, dumps
+from pandagg.stream import AggregationsStream
+from pandagg.template import SearchTemplate, AsyncSearchTemplate
 from pandagg.tree.mappings import _mappings
 from pandagg.tree.query import Query, ADD
 from pandagg.tree.aggs import Aggs
-from pandagg.utils import DSLMixin
+from pandagg.utils import DSLMixin, copy_containers
+
+_SLICE_DONE = object()
+
+# identical searches in flight, shared by all coalescing searches
+_in_flight = SingleFlight()
+_async_in_flight = AsyncSingleFlight()
+
+
+class _SliceError(object):
+    """Wraps an exception raised while draining a sliced scroll."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _transport_error(status, raw_data):
+    """
+    Build exception matching error response, as elasticsearch client does.
+    """
+    error_message, additional_info = raw_data, None
+    try:
+        additional_info = json.loads(raw_data)
+        error_message = additional_info.get("error", error_message)
+        if isinstance(error_message, dict) and "type" in error_message:
+            error_message = error_message["type"]
+    except (ValueError, TypeError, AttributeError):
+        pass
+    return HTTP_EXCEPTIONS.get(status, TransportError)(
+        status, error_message, additional_info
+    )
 
 
 class Request(object):
@@ -106,6 +157,9 @@ class Search(DSLMixin, Request):
         mappings=None,
         nested_autocorrect=False,
         repr_auto_execute=False,
+        cache=None,
+        coalesce=False,
+        serializer=None,
     ):
         """
         Search request to elasticsearch.
@@ -115,6 +169,12 @@ class Search(DSLMixin, Request):
         :arg mappings: mappings used for query validation
         :arg nested_autocorrect: in case of missing nested clause, will insert it automatically
         :arg repr_auto_execute: execute query and display results as dataframe, requires client to be provided
+        :arg cache: ``pandagg.cache.ResponseCache`` instance used to cache responses, if not provided, the cache
+            registered on the connection alias (if any) is used
+        :arg coalesce: if True, identical searches executed concurrently (same connection, index, params and body)
+            share a single request to elasticsearch, each caller getting its own ``Response``
+        :arg serializer: serializer used to encode request body before handing it to the client (see
+            ``pandagg.serializer``), if not provided the client serializer is used
 
         All the parameters supplied (or omitted) at creation type can be later
         overridden by methods (`using`, `index` and `mappings` respectively).
@@ -128,14 +188,33 @@ class Search(DSLMixin, Request):
         self._script_fields = {}
         mappings = _mappings(mappings)
         self._mappings = mappings
+        # serialized aggregations, kept as is until aggregations tree is required (see `from_dict` lazy mode)
+        self._raw_aggs = None
         self._aggs = Aggs(mappings=mappings, nested_autocorrect=nested_autocorrect)
         self._query = Query(mappings=mappings, nested_autocorrect=nested_autocorrect)
         self._post_filter = Query(
             mappings=mappings, nested_autocorrect=nested_autocorrect
         )
         self._repr_auto_execute = repr_auto_execute
+        self._cache = cache
+        self._coalesce = coalesce
+        self._serializer = serializer
+        # trees switched to in place mode, None if not in batch mode
+        self._batch_trees = None
         super(Search, self).__init__(using=using, index=index)
 
+    @property
+    def _aggs(self):
+        if self._raw_aggs is not None:
+            self._aggs_tree = Aggs(self._raw_aggs)
+            self._raw_aggs = None
+        return self._aggs_tree
+
+    @_aggs.setter
+    def _aggs(self, aggs):
+        self._aggs_tree = aggs
+        self._raw_aggs = None
+
     def query(self, type_or_query, insert_below=None, on=None, mode=ADD, **body):
         s = self._clone()
         s._query = s._query.query(
@@ -366,12 +445,68 @@ class Search(DSLMixin, Request):
         s._params["size"] = size
         return s
 
+    def cache(self, cache):
+        """
+        Set response cache used by this search. Pass `False` to disable caching, even if a cache is registered on
+        the connection alias, or `None` to fall back on it.
+
+        Example::
+
+            from pandagg.cache import LRUCache
+            s = Search().cache(LRUCache(max_size=100, ttl=60))
+
+        """
+        s = self._clone()
+        s._cache = cache
+        return s
+
+    def coalesce(self, coalesce=True):
+        """
+        Enable (or disable) coalescing of identical concurrent searches: while a search is in flight, identical
+        searches executed from other threads (or tasks for ``AsyncSearch``) wait for its response instead of
+        performing their own request.
+
+        Example::
+
+            s = Search().coalesce()
+
+        """
+        s = self._clone()
+        s._coalesce = coalesce
+        return s
+
+    def serializer(self, serializer):
+        """
+        Set serializer used to encode request body before handing it to the client, for instance
+        ``pandagg.serializer.OrjsonSerializer()``. Pass `None` to let client serialize it.
+
+        Note that responses are decoded by the client: to decode them with a fast decoder as well, register the
+        serializer on the client (see ``pandagg.connections.Connections.set_serializer``).
+        """
+        s = self._clone()
+        s._serializer = serializer
+        return s
+
+    def encode(self):
+        """
+        Return request body serialized as bytes, using search serializer (or the default one if none is set). Can be
+        sent as is to elasticsearch.
+        """
+        serializer = self._serializer or JSONSerializer()
+        encoded = serializer.dumps(self.to_dict())
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        return encoded
+
     @classmethod
-    def from_dict(cls, d):
+    def from_dict(cls, d, lazy=False):
         """
         Construct a new `Search` instance from a raw dict containing the search
         body. Useful when migrating from raw dictionaries.
 
+        :arg lazy: if True, query and aggregations trees are built only when
+            required, see ``update_from_dict``
+
         Example::
 
             s = Search.from_dict({
@@ -385,7 +520,59 @@ class Search(DSLMixin, Request):
             s = s.filter('term', published=True)
         """
         s = cls()
-        s.update_from_dict(d)
+        s.update_from_dict(d, lazy=lazy)
+        return s
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager yielding a working copy of current search, on which builder methods (`filter`, `agg`,
+        `groupby`, `source`, ...) are applied in place instead of returning a new search at each call. Working copy
+        is frozen when exiting the context: it then behaves as a regular search. Current search remains unchanged.
+
+        Example::
+
+            with s.batch() as b:
+                for user_id in user_ids:
+                    b.filter('term', user=user_id)
+            s = b
+
+        Note that an error raised by a builder method can leave working copy partially modified.
+        """
+        s = self._clone()
+        s._batch_trees = []
+        try:
+            yield s
+        finally:
+            for tree in s._batch_trees:
+                tree._in_place = False
+            s._batch_trees = None
+
+    def apply(self, ops):
+        """
+        Apply multiple builder operations on a single working copy (see `batch`), and return resulting search.
+
+        Example::
+
+            s = s.apply([
+                ('filter', ('term',), {'user': 1}),
+                ('agg', ('per_tag', 'terms'), {'field': 'tag'}),
+                lambda s: s.source(['user']),
+            ])
+
+        :param ops: iterable of operations, either a `(method_name, args, kwargs)` tuple (`args` and `kwargs` are
+            optional), either a callable taking a search and returning a search.
+        """
+        with self.batch() as s:
+            for op in ops:
+                if callable(op):
+                    s = op(s)
+                    continue
+                op = tuple(op)
+                # pad missing args and kwargs
+                missing = len(op) - 1
+                name, args, kwargs = op + ((), {})[missing:]
+                s = getattr(s, name)(*args, **kwargs)
         return s
 
     def _clone(self):
@@ -394,6 +581,20 @@ class Search(DSLMixin, Request):
         of all the underlying objects. Used internally by most state modifying
         APIs.
         """
+        if self._batch_trees is not None:
+            # batch mode: trees are mutated in place, and so is current search
+            for tree in (self._aggs_tree, self._query, self._post_filter):
+                if not tree._in_place:
+                    tree._in_place = True
+                    self._batch_trees.append(tree)
+            return self
+        return self._copy()
+
+    def _copy(self):
+        """
+        Return a clone of the current search request, even in batch mode: trees switched to in place mode are
+        cloned as well.
+        """
         s = self.__class__(
             using=self._using, index=self._index, mappings=self._mappings
         )
@@ -404,26 +605,60 @@ class Search(DSLMixin, Request):
         s._highlight_opts = self._highlight_opts.copy()
         s._suggest = self._suggest.copy()
         s._script_fields = self._script_fields.copy()
-        s._aggs = self._aggs.clone()
-        s._query = self._query.clone()
-        s._post_filter = self._post_filter.clone()
+        if self._raw_aggs is not None:
+            s._raw_aggs = self._raw_aggs
+        else:
+            s._aggs = self._clone_tree(self._aggs_tree)
+        s._query = self._clone_tree(self._query)
+        s._post_filter = self._clone_tree(self._post_filter)
         s._mappings = None if self._mappings is None else self._mappings.clone()
         s._repr_auto_execute = self._repr_auto_execute
+        s._cache = self._cache
+        s._coalesce = self._coalesce
+        s._serializer = self._serializer
         return s
 
-    def update_from_dict(self, d):
+    @staticmethod
+    def _clone_tree(tree):
+        if not tree._in_place:
+            return tree.clone()
+        tree._in_place = False
+        try:
+            return tree.clone()
+        finally:
+            tree._in_place = True
+
+    def _unbatched(self):
+        """
+        Return current search, or a copy of it if it is a batch working copy (see `batch`), so that requests built
+        on its behalf (`size(0)`..) don't modify it.
+        """
+        if self._batch_trees is None:
+            return self
+        return self._copy()
+
+    def update_from_dict(self, d, lazy=False):
         """
         Apply options from a serialized body to the current instance. Modifies
         the object in-place. Used mostly by ``from_dict``.
+
+        :arg lazy: if True, serialized query and aggregations are kept as is,
+            and passed through by ``to_dict`` as long as they are not modified.
+            Query clauses are parsed incrementally, only when required by a
+            builder method (see ``pandagg.tree.query.Query`` lazy mode), and
+            aggregations are parsed when first accessed.
         """
         d = d.copy()
+        # caller's dict must not be shared with searches built from it (lazy clauses keep it as is)
         if "query" in d:
-            self._query = Query(d.pop("query"))
+            self._query = Query(copy_containers(d.pop("query")), lazy=lazy)
         if "post_filter" in d:
-            self._post_filter = Query(d.pop("post_filter"))
+            self._post_filter = Query(copy_containers(d.pop("post_filter")), lazy=lazy)
 
         aggs = d.pop("aggs", d.pop("aggregations", {}))
-        if aggs:
+        if aggs and lazy:
+            self._raw_aggs = copy_containers(aggs)
+        elif aggs:
             self._aggs = Aggs(aggs)
         if "sort" in d:
             self._sort = d.pop("sort")
@@ -637,7 +872,9 @@ class Search(DSLMixin, Request):
             if self._post_filter:
                 d["post_filter"] = self._post_filter.to_dict()
 
-            if self._aggs:
+            if self._raw_aggs is not None:
+                d["aggs"] = copy_containers(self._raw_aggs)
+            elif self._aggs:
                 d["aggs"] = self._aggs.to_dict()
 
             if self._sort:
@@ -661,6 +898,21 @@ class Search(DSLMixin, Request):
         d.update(kwargs)
         return d
 
+    def compile(self):
+        """
+        Compile search into a template, whose ``Param`` placeholders are
+        substituted at bind time in a pre-serialized body, without rebuilding
+        query and aggregations trees.
+
+        Example::
+
+            template = Search().filter("term", user=Param("uid")).compile()
+            response = template.execute(uid=12)
+
+        :rtype: ``pandagg.template.SearchTemplate``
+        """
+        return SearchTemplate(self)
+
     def count(self):
         """
         Return the number of hits matching the query and filters. Note that
@@ -676,10 +928,267 @@ class Search(DSLMixin, Request):
         Execute the search and return an instance of ``Response`` wrapping all
         the data.
         """
+        return self._execute(self.to_dict())
+
+    def _execute(self, body, template=False):
+        """
+        Execute provided body (serialized search), on behalf of this search.
+
+        :param template: if True, body refers to a stored search template (id and params)
+        """
+        cache = self._response_cache()
+        key = None
+        if cache is not None or self._coalesce:
+            key = request_key(
+                self._index, self._params, body, using=self._connection_key()
+            )
+        if cache is not None:
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, search=self)
+
+        def search():
+            es = get_connection(self._using)
+            encoded = self._encode_body(body)
+            if template:
+                return es.search_template(index=self._index, body=encoded)
+            return es.search(index=self._index, body=encoded)
+
+        if self._coalesce:
+            data = _in_flight.do(self._flight_key(key), search)
+        else:
+            data = search()
+        if cache is not None:
+            cache.set(key, data)
+        return Response(data, search=self)
+
+    def _encode_body(self, body):
+        if self._serializer is None:
+            return body
+        return self._serializer.dumps(body)
+
+    def stream_aggregations(self, grouped_by=None, **kwargs):
+        """
+        Execute the search, and parse aggregations response incrementally as it is received, without loading
+        whole response in memory. Return a :class:`~pandagg.stream.AggregationsStream` yielding tabular rows (see
+        :func:`~pandagg.response.Aggregations.to_tabular`), request being sent once it is iterated.
+
+        Hits are not fetched (size 0), responses cache and coalescing don't apply.
+        Requires ijson dependency, and a synchronous client whose connections rely on urllib3
+        (``Urllib3HttpConnection``, elasticsearch client default): response body is read from the connection
+        pool, bypassing client transport `perform_request` (which loads whole responses), see `_open_stream`.
+
+        Example::
+
+            s = Search().groupby("user", "terms", field="user", size=100000).agg("avg_price", "avg", field="price")
+            for (user,), values in s.stream_aggregations(chunk_size=5000):
+                ...
+
+        :param grouped_by: name of the aggregation node used as last grouping level
+        :param kwargs: ``AggregationsStream`` parameters
+        """
+        s = self._unbatched().size(0)
+        body = s.to_dict()
+        return AggregationsStream(
+            lambda: s._open_stream(body), search=s, grouped_by=grouped_by, **kwargs
+        )
+
+    def _open_stream(self, body):
+        """
+        Send search request, and return response body as a file-like object read incrementally.
+
+        Nodes are selected by client transport (sniffing included). Requests failing on connection errors or on
+        transport `retry_on_status` statuses are retried on another node, up to transport `max_retries` times.
+        """
         es = get_connection(self._using)
-        return Response(es.search(index=self._index, body=self.to_dict()), search=self)
+        transport = es.transport
+        encoded = self._encode_body(body)
+        if not isinstance(encoded, (str, bytes)):
+            encoded = transport.serializer.dumps(encoded)
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        for attempt in range(transport.max_retries + 1):
+            last_attempt = attempt == transport.max_retries
+            connection = transport.get_connection()
+            if not hasattr(connection, "pool"):
+                raise NotImplementedError(
+                    "Streaming responses requires urllib3 based connections (Urllib3HttpConnection), got %s."
+                    % connection.__class__.__name__
+                )
+            headers = dict(connection.headers)
+            headers["content-type"] = "application/json"
+            try:
+                response = connection.pool.urlopen(
+                    "POST",
+                    connection.url_prefix + _make_path(self._index, "_search"),
+                    encoded,
+                    headers=headers,
+                    retries=False,
+                    preload_content=False,
+                )
+            except Urllib3HTTPError as e:
+                transport.mark_dead(connection)
+                if last_attempt:
+                    raise TransportConnectionError("N/A", str(e), e)
+                continue
+            if 200 <= response.status < 300:
+                return response
+            raw_data = response.data.decode("utf-8", "surrogatepass")
+            response.release_conn()
+            if response.status in transport.retry_on_status and not last_attempt:
+                transport.mark_dead(connection)
+                continue
+            raise _transport_error(response.status, raw_data)
+
+    def _connection_key(self):
+        """
+        Identify connection used by this search in responses cache keys: alias, or hosts of provided client (client
+        identity if they are unknown).
+        """
+        if isinstance(self._using, str):
+            return self._using
+        hosts = getattr(getattr(self._using, "transport", None), "hosts", None)
+        if not isinstance(hosts, list):
+            return id(self._using)
+        return hosts
+
+    def _flight_key(self, key):
+        # requests are only shared between searches using the same connection
+        using = self._using if isinstance(self._using, str) else id(self._using)
+        return using, key
+
+    def _response_cache(self):
+        if self._cache is False:
+            return None
+        if self._cache is not None:
+            return self._cache
+        return get_cache(self._using)
+
+    def iter_composite(
+        self, agg_name=None, size=None, prefetch=False, chunked=False, **kwargs
+    ):
+        """
+        Iterate over all buckets of a composite aggregation, following its `after_key` across pages. Each page is
+        parsed with :func:`~pandagg.response.Aggregations.to_tabular`, grouped by the composite aggregation.
+
+        Hits are not fetched (size 0).
+
+        Example::
+
+            s = Search().agg(
+                "per_user_and_day",
+                "composite",
+                sources=[
+                    {"user": {"terms": {"field": "user"}}},
+                    {"day": {"date_histogram": {"field": "date", "calendar_interval": "1d"}}},
+                ],
+            ).agg("avg_price", "avg", field="price", insert_below="per_user_and_day")
+            for row in s.iter_composite(size=1000, prefetch=True):
+                ...
+
+        :param agg_name: name of composite aggregation clause, can be omitted if search contains a single one
+        :param size: number of buckets per page, if provided, overrides composite aggregation size
+        :param prefetch: if True, next page is requested in a background thread while current page is consumed
+        :param chunked: if True, yield one ``(index_names, rows)`` tuple per page, else yield rows one by one
+        :param kwargs: ``to_tabular`` serialization kwargs (by default ``index_orient=False``, since composite keys
+            are dicts)
+        """
+        agg_name, path = self._composite_path(agg_name)
+        kwargs.setdefault("index_orient", False)
+
+        s = self._unbatched().size(0)
+        body = s.to_dict()
+
+        def fetch_page(after):
+            return s._execute(self._composite_page_body(body, path, size, after))
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            response = fetch_page(None)
+            while True:
+                raw = self._composite_raw(response, path)
+                if not raw["buckets"]:
+                    return
+                after_key = raw.get("after_key")
+                next_page = None
+                if after_key is not None and executor is not None:
+                    next_page = executor.submit(fetch_page, after_key)
+                for item in self._composite_items(response, agg_name, chunked, kwargs):
+                    yield item
+                if after_key is None:
+                    return
+                if next_page is not None:
+                    response = next_page.result()
+                else:
+                    response = fetch_page(after_key)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _composite_path(self, agg_name):
+        """
+        Return composite aggregation name, and aggregation names from root aggregation to composite clause.
+        """
+        if agg_name is None:
+            composites = self._aggs.list(filter_=lambda n: n.KEY == "composite")
+            if len(composites) != 1:
+                raise ValueError(
+                    'Expected a single composite aggregation, got %d, please provide "agg_name".'
+                    % len(composites)
+                )
+            agg_name, composite = composites[0]
+        else:
+            _, composite = self._aggs.get(self._aggs.id_from_key(agg_name))
+            if composite.KEY != "composite":
+                raise ValueError("<%s> is not a composite aggregation." % agg_name)
+        path = [
+            k
+            for k, _ in self._aggs.ancestors(
+                composite.identifier, from_root=True, include_current=True
+            )
+            if k is not None
+        ]
+        return agg_name, path
+
+    @staticmethod
+    def _composite_page_body(body, path, size, after):
+        """
+        Return copy of body requesting composite aggregation page after `after` key.
+        """
+        page_body = body.copy()
+        aggs = page_body["aggs"] = page_body["aggs"].copy()
+        for name in path[:-1]:
+            clause = aggs[name] = aggs[name].copy()
+            aggs = clause["aggs"] = clause["aggs"].copy()
+        clause = aggs[path[-1]] = aggs[path[-1]].copy()
+        clause_body = clause["composite"] = clause["composite"].copy()
+        if size is not None:
+            clause_body["size"] = size
+        if after is not None:
+            clause_body["after"] = after
+        return page_body
+
+    @staticmethod
+    def _composite_raw(response, path):
+        raw = response.aggregations.data
+        for name in path:
+            raw = raw[name]
+        return raw
+
+    @staticmethod
+    def _composite_items(response, agg_name, chunked, kwargs):
+        """
+        Return items yielded for composite aggregation page: rows, or a single ``(index_names, rows)`` tuple if
+        `chunked`.
+        """
+        index_names, rows = response.aggregations.to_tabular(
+            grouped_by=agg_name, **kwargs
+        )
+        if chunked:
+            return [(index_names, rows)]
+        return rows.items() if isinstance(rows, dict) else rows
 
-    def scan(self):
+    def scan(self, slices=None, workers=None, buffer_size=1000):
         """
         Turn the search into a scan search and return a generator that will
         iterate over all the documents matching the query.
@@ -688,11 +1197,139 @@ class Search(DSLMixin, Request):
         pass to the underlying ``scan`` helper from ``elasticsearch-py`` -
         https://elasticsearch-py.readthedocs.io/en/master/helpers.html#elasticsearch.helpers.scan
 
+        If ``slices`` is provided, the scroll is split in as many sliced scrolls
+        (https://www.elastic.co/guide/en/elasticsearch/reference/current/paginate-search-results.html#slice-scroll),
+        drained concurrently by a pool of threads. Hits are then yielded in no particular order. Scroll contexts are
+        cleared even if the generator is not exhausted.
+
+        :param slices: number of sliced scrolls
+        :param workers: number of threads draining sliced scrolls, defaults to ``slices``
+        :param buffer_size: maximum number of hits fetched but not yet consumed
         """
         es = get_connection(self._using)
 
-        for hit in scan(es, query=self.to_dict(), index=self._index):
-            yield hit
+        if not slices or slices <= 1:
+            for hit in scan(es, query=self.to_dict(), index=self._index):
+                yield hit
+            return
+
+        body = self.to_dict()
+        hits_queue = Queue(maxsize=buffer_size)
+        stop = threading.Event()
+
+        def put(item):
+            # blocks until there is room in buffer, unless generator was closed meanwhile
+            while not stop.is_set():
+                try:
+                    hits_queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def drain(slice_id):
+            try:
+                if stop.is_set():
+                    return
+                slice_hits = scan(
+                    es,
+                    query=dict(body, slice={"id": slice_id, "max": slices}),
+                    index=self._index,
+                )
+                try:
+                    for hit in slice_hits:
+                        if not put(hit):
+                            return
+                finally:
+                    # clears slice scroll context
+                    slice_hits.close()
+            except Exception as e:
+                put(_SliceError(e))
+            finally:
+                put(_SLICE_DONE)
+
+        executor = ThreadPoolExecutor(max_workers=workers or slices)
+        futures = [executor.submit(drain, slice_id) for slice_id in range(slices)]
+        try:
+            remaining = slices
+            while remaining:
+                item = hits_queue.get()
+                if item is _SLICE_DONE:
+                    remaining -= 1
+                elif isinstance(item, _SliceError):
+                    raise item.error
+                else:
+                    yield item
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def iter_pages(self, page_size=1000, pit_keep_alive="1m"):
+        """
+        Iterate over all documents matching the search, page per page, using `search_after` on a point in time
+        (https://www.elastic.co/guide/en/elasticsearch/reference/current/paginate-search-results.html#search-after).
+        Yield a ``Response`` instance per page. Requires Elasticsearch >= 7.12.
+
+        A `_shard_doc` tiebreaker is appended to search sort. The point in time is closed once iteration ends (even if
+        the generator is not exhausted).
+
+        :param page_size: number of hits per page
+        :param pit_keep_alive: how long each point in time should be kept alive between two pages
+        """
+        es = get_connection(self._using)
+
+        # responses are bound to a search that isn't modified meanwhile
+        s = self._unbatched()
+        body = s._pages_body(page_size)
+        pit_id = es.open_point_in_time(index=self._index, keep_alive=pit_keep_alive)[
+            "id"
+        ]
+        try:
+            search_after = None
+            while True:
+                data = es.search(
+                    body=self._page_body(body, pit_id, pit_keep_alive, search_after)
+                )
+                # point in time id can change between two pages
+                pit_id = data.get("pit_id", pit_id)
+                hits = data["hits"]["hits"]
+                if not hits:
+                    return
+                yield Response(data, search=s)
+                if len(hits) < page_size:
+                    return
+                search_after = hits[-1]["sort"]
+        finally:
+            es.close_point_in_time(body={"id": pit_id})
+
+    def _pages_body(self, page_size):
+        """
+        Return body of `iter_pages` requests, whose sort ends with a `_shard_doc` tiebreaker.
+        """
+        body = self.to_dict()
+        body.pop("from", None)
+        body["size"] = page_size
+        sort = body.get("sort", [])
+        # single sort clause, either field name or dict
+        if not isinstance(sort, list):
+            sort = [sort]
+        else:
+            sort = list(sort)
+        if "_shard_doc" not in sort and not any(
+            isinstance(k, dict) and "_shard_doc" in k for k in sort
+        ):
+            sort.append({"_shard_doc": "asc"})
+        body["sort"] = sort
+        return body
+
+    @staticmethod
+    def _page_body(body, pit_id, pit_keep_alive, search_after):
+        page_body = dict(body, pit={"id": pit_id, "keep_alive": pit_keep_alive})
+        if search_after is not None:
+            page_body["search_after"] = search_after
+        return page_body
 
     def delete(self):
         """
@@ -715,18 +1352,18 @@ class Search(DSLMixin, Request):
             import pandas as pd  # noqa
         except ImportError:
             return ImportError("repr_auto_execute requires pandas dependency")
-        if self._aggs.to_dict():
+        if self._aggs:
             # hits are not necessary to display aggregation results
-            r = self.size(0).execute()
+            r = self._unbatched().size(0).execute()
             return r.aggregations.to_dataframe()
-        r = self.execute()
+        r = self._unbatched().execute()
         return r.hits.to_dataframe()
 
     def __repr__(self):
         # inspired by https://github.com/elastic/eland/blob/master/eland/dataframe.py#L471 idea to execute search at
         # __repr__ to have more interactive experience
         if not self._repr_auto_execute:
-            return json.dumps(self.to_dict(), indent=2)
+            return dumps(self.to_dict(), indent=2)
         return self._auto_execution_df_result().__repr__()
 
     def _repr_html_(self):
@@ -771,22 +1408,112 @@ class MultiSearch(Request):
     def to_dict(self):
         out = []
         for s in self._searches:
-            meta = {}
-            if s._index:
-                meta["index"] = s._index
-            meta.update(s._params)
+            out.extend(self._search_lines(s))
+        return out
+
+    @staticmethod
+    def _search_lines(s):
+        meta = {}
+        if s._index:
+            meta["index"] = s._index
+        meta.update(s._params)
+        return [meta, s.to_dict()]
 
-            out.append(meta)
-            out.append(s.to_dict())
+    def _chunks(self, chunk_size=None, max_chunk_bytes=None):
+        """
+        Split searches in chunks, each containing at most `chunk_size` searches, and weighting at most
+        `max_chunk_bytes` bytes once serialized (unless a single search exceeds it).
 
+        Yield tuples of (searches, msearch body). If `max_chunk_bytes` is provided, searches are serialized to
+        measure them (with their serializer, see ``Search.serializer``), and body is the serialized ndjson bytes,
+        else body is a list of dicts.
+        """
+        searches, lines, chunk_bytes = [], [], 0
+        for s in self._searches:
+            search_lines = self._search_lines(s)
+            search_bytes = 0
+            if max_chunk_bytes is not None:
+                search_lines = self._encode_lines(s, search_lines)
+                search_bytes = sum(len(line) + 1 for line in search_lines)
+            if searches and (
+                (chunk_size is not None and len(searches) >= chunk_size)
+                or (
+                    max_chunk_bytes is not None
+                    and chunk_bytes + search_bytes > max_chunk_bytes
+                )
+            ):
+                yield searches, self._chunk_body(lines, max_chunk_bytes)
+                searches, lines, chunk_bytes = [], [], 0
+            searches.append(s)
+            lines.extend(search_lines)
+            chunk_bytes += search_bytes
+        if searches:
+            yield searches, self._chunk_body(lines, max_chunk_bytes)
+
+    @staticmethod
+    def _encode_lines(s, lines):
+        """
+        Serialize search lines as bytes, using search serializer (or the default one if none is set).
+        """
+        serializer = s._serializer or JSONSerializer()
+        encoded_lines = []
+        for line in lines:
+            encoded = serializer.dumps(line)
+            if isinstance(encoded, str):
+                encoded = encoded.encode("utf-8")
+            encoded_lines.append(encoded)
+        return encoded_lines
+
+    @staticmethod
+    def _chunk_body(lines, max_chunk_bytes):
+        if max_chunk_bytes is None:
+            return lines
+        return b"\n".join(lines) + b"\n"
+
+    @staticmethod
+    def _parse_responses(searches, raw, raise_on_error):
+        out = []
+        for s, r in zip(searches, raw["responses"]):
+            if r.get("error", False):
+                if raise_on_error:
+                    raise TransportError("N/A", r["error"]["type"], r["error"])
+                r = None
+            else:
+                r = Response(r, search=s)
+            out.append(r)
         return out
 
-    def execute(self):
+    def execute(
+        self,
+        chunk_size=None,
+        max_chunk_bytes=None,
+        max_in_flight=1,
+        raise_on_error=True,
+    ):
         """
-        Execute the multi search request and return a list of search results.
+        Execute the multi search request and return a list of ``Response`` instances, one per search (bound to
+        this search), in the same order as searches were added.
+
+        Large batches can be split in multiple msearch requests, sent concurrently.
+
+        :param chunk_size: maximum number of searches per msearch request
+        :param max_chunk_bytes: maximum size in bytes of each msearch request body
+        :param max_in_flight: maximum number of msearch requests sent concurrently
+        :param raise_on_error: if True, raise ``TransportError`` if any search failed, else failed searches
+            responses are replaced by None
         """
         es = get_connection(self._using)
-        return es.msearch(index=self._index, body=self.to_dict(), **self._params)
+
+        def send(chunk):
+            searches, body = chunk
+            raw = es.msearch(index=self._index, body=body, **self._params)
+            return self._parse_responses(searches, raw, raise_on_error)
+
+        chunks = self._chunks(chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes)
+        if max_in_flight <= 1:
+            return [r for chunk in chunks for r in send(chunk)]
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            return [r for responses in executor.map(send, chunks) for r in responses]
 
     def __eq__(self, other):
         return (
@@ -796,4 +1523,216 @@ class MultiSearch(Request):
         )
 
     def __repr__(self):
-        return json.dumps(self.to_dict(), indent=2)
+        return dumps(self.to_dict(), indent=2)
+
+
+class AsyncSearch(Search):
+    """
+    Asyncio flavour of :class:`~pandagg.search.Search`, relying on an ``elasticsearch.AsyncElasticsearch`` client.
+
+    Request building is shared with :class:`~pandagg.search.Search`, only execution methods are coroutines::
+
+        s = AsyncSearch(using=async_client, index="movies").filter("term", genres="Comedy")
+        response = await s.execute()
+        async for hit in s.scan():
+            ...
+    """
+
+    def __aiter__(self):
+        """
+        Iterate over the hits. Return asynchronous iterable of ``pandagg.response.Hit``.
+        """
+
+        async def _iter():
+            for hit in await self.execute():
+                yield hit
+
+        return _iter()
+
+    def compile(self):
+        return AsyncSearchTemplate(self)
+
+    async def count(self):
+        """
+        Return the number of hits matching the query and filters. Note that
+        only the actual number is returned.
+        """
+        es = get_async_connection(self._using)
+
+        d = self.to_dict(count=True)
+        return (await es.count(index=self._index, body=d))["count"]
+
+    async def execute(self):
+        """
+        Execute the search and return an instance of ``Response`` wrapping all
+        the data.
+        """
+        return await self._execute(self.to_dict())
+
+    async def _execute(self, body, template=False):
+        cache = self._response_cache()
+        key = None
+        if cache is not None or self._coalesce:
+            key = request_key(
+                self._index, self._params, body, using=self._connection_key()
+            )
+        if cache is not None:
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, search=self)
+
+        async def search():
+            es = get_async_connection(self._using)
+            encoded = self._encode_body(body)
+            if template:
+                return await es.search_template(index=self._index, body=encoded)
+            return await es.search(index=self._index, body=encoded)
+
+        if self._coalesce:
+            data = await _async_in_flight.do(self._flight_key(key), search)
+        else:
+            data = await search()
+        if cache is not None:
+            cache.set(key, data)
+        return Response(data, search=self)
+
+    def _response_cache(self):
+        if self._cache is False:
+            return None
+        if self._cache is not None:
+            return self._cache
+        return async_connections.get_cache(self._using)
+
+    async def iter_composite(
+        self, agg_name=None, size=None, prefetch=False, chunked=False, **kwargs
+    ):
+        """
+        Asynchronous generator iterating over all buckets of a composite aggregation, see
+        :func:`~pandagg.search.Search.iter_composite`. With `prefetch`, next page is requested in a concurrent task
+        while current page is consumed.
+        """
+        agg_name, path = self._composite_path(agg_name)
+        kwargs.setdefault("index_orient", False)
+
+        s = self._unbatched().size(0)
+        body = s.to_dict()
+
+        def fetch_page(after):
+            return s._execute(self._composite_page_body(body, path, size, after))
+
+        next_page = None
+        try:
+            response = await fetch_page(None)
+            while True:
+                raw = self._composite_raw(response, path)
+                if not raw["buckets"]:
+                    return
+                after_key = raw.get("after_key")
+                if after_key is not None and prefetch:
+                    next_page = asyncio.ensure_future(fetch_page(after_key))
+                for item in self._composite_items(response, agg_name, chunked, kwargs):
+                    yield item
+                if after_key is None:
+                    return
+                if next_page is not None:
+                    response = await next_page
+                    next_page = None
+                else:
+                    response = await fetch_page(after_key)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def scan(self):
+        """
+        Turn the search into a scan search and return an asynchronous generator that will
+        iterate over all the documents matching the query.
+
+        Relies on ``async_scan`` helper from ``elasticsearch-py`` -
+        https://elasticsearch-py.readthedocs.io/en/master/async.html#async-helpers
+        """
+        from elasticsearch.helpers import async_scan
+
+        es = get_async_connection(self._using)
+
+        async for hit in async_scan(es, query=self.to_dict(), index=self._index):
+            yield hit
+
+    def stream_aggregations(self, grouped_by=None, **kwargs):
+        """
+        Not supported on asynchronous searches: streaming requires a synchronous client, see
+        :func:`~pandagg.search.Search.stream_aggregations`.
+        """
+        raise NotImplementedError(
+            "Streaming aggregations requires a synchronous client, use Search instead of AsyncSearch."
+        )
+
+    async def iter_pages(self, page_size=1000, pit_keep_alive="1m"):
+        """
+        Asynchronous generator iterating over all documents matching the search, page per page, see
+        :func:`~pandagg.search.Search.iter_pages`. Requires Elasticsearch >= 7.12.
+        """
+        es = get_async_connection(self._using)
+
+        # responses are bound to a search that isn't modified meanwhile
+        s = self._unbatched()
+        body = s._pages_body(page_size)
+        pit_id = (
+            await es.open_point_in_time(index=self._index, keep_alive=pit_keep_alive)
+        )["id"]
+        try:
+            search_after = None
+            while True:
+                data = await es.search(
+                    body=self._page_body(body, pit_id, pit_keep_alive, search_after)
+                )
+                # point in time id can change between two pages
+                pit_id = data.get("pit_id", pit_id)
+                hits = data["hits"]["hits"]
+                if not hits:
+                    return
+                yield Response(data, search=s)
+                if len(hits) < page_size:
+                    return
+                search_after = hits[-1]["sort"]
+        finally:
+            await es.close_point_in_time(body={"id": pit_id})
+
+    async def delete(self):
+        """
+        delete() executes the query by delegating to delete_by_query()
+        """
+        es = get_async_connection(self._using)
+
+        return await es.delete_by_query(index=self._index, body=self.to_dict())
+
+
+class AsyncMultiSearch(MultiSearch):
+    """
+    Asyncio flavour of :class:`~pandagg.search.MultiSearch`.
+    """
+
+    async def execute(
+        self,
+        chunk_size=None,
+        max_chunk_bytes=None,
+        max_in_flight=1,
+        raise_on_error=True,
+    ):
+        """
+        Execute the multi search request and return a list of ``Response`` instances, one per search.
+
+        See :func:`~pandagg.search.MultiSearch.execute` for parameters.
+        """
+        es = get_async_connection(self._using)
+        semaphore = asyncio.Semaphore(max(max_in_flight, 1))
+
+        async def send(chunk):
+            searches, body = chunk
+            async with semaphore:
+                raw = await es.msearch(index=self._index, body=body, **self._params)
+            return self._parse_responses(searches, raw, raise_on_error)
+
+        chunks = self._chunks(chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes)
+        responses = await asyncio.gather(*[send(chunk) for chunk in chunks])
+        return [r for chunk_responses in responses for r in chunk_responses]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+
+from elasticsearch.serializer import JSONSerializer as BaseJSONSerializer
+from elasticsearch.serializer import DEFAULT_SERIALIZERS, Deserializer
+from elasticsearch.exceptions import SerializationError
+
+
+class JSONSerializer(BaseJSONSerializer):
+    """
+    Serializer following ``elasticsearch.serializer.JSONSerializer`` interface: can be provided to elasticsearch
+    clients (`serializer` parameter), and to searches.
+
+    Already encoded bodies (bytes or str) are passed as is. Values that aren't natively serializable (dates, numpy
+    and pandas types..) are handled as by elasticsearch client default serializer.
+    """
+
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    Serializer relying on `orjson` library, encoding to bytes. Requires `orjson` dependency.
+    """
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImportError(
+                'OrjsonSerializer requires "orjson" dependency, please install it: pip install orjson'
+            )
+        self._orjson = orjson
+        self._option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def loads(self, s):
+        try:
+            return self._orjson.loads(s)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(s, e)
+
+    def dumps(self, data):
+        if isinstance(data, (str, bytes)):
+            return data
+        try:
+            return self._orjson.dumps(data, default=self.default, option=self._option)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data, e)
+
+
+class UjsonSerializer(JSONSerializer):
+    """
+    Serializer relying on `ujson` library. Requires `ujson` dependency.
+    """
+
+    def __init__(self):
+        try:
+            import ujson
+        except ImportError:
+            raise ImportError(
+                'UjsonSerializer requires "ujson" dependency, please install it: pip install ujson'
+            )
+        self._ujson = ujson
+
+    def loads(self, s):
+        try:
+            return self._ujson.loads(s)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(s, e)
+
+    def dumps(self, data):
+        if isinstance(data, (str, bytes)):
+            return data
+        try:
+            return self._ujson.dumps(
+                data, ensure_ascii=False, escape_forward_slashes=False
+            ).encode("utf-8")
+        except (ValueError, TypeError, OverflowError):
+            # ujson doesn't handle some types (dates, numpy..), fallback on default serialization
+            return super(UjsonSerializer, self).dumps(data)
+
+
+SERIALIZERS = {
+    "orjson": OrjsonSerializer,
+    "ujson": UjsonSerializer,
+    "json": JSONSerializer,
+}
+
+
+def get_serializer(name=None):
+    """
+    Return serializer instance.
+
+    :param name: one of "orjson", "ujson", "json", if not provided, return fastest available one
+    """
+    if name is not None:
+        if name not in SERIALIZERS:
+            raise ValueError(
+                "Unknown serializer <%s>, expected one of %s"
+                % (name, ", ".join(SERIALIZERS))
+            )
+        return SERIALIZERS[name]()
+    for serializer_class in (OrjsonSerializer, UjsonSerializer):
+        try:
+            return serializer_class()
+        except ImportError:
+            continue
+    return JSONSerializer()
+
+
+class TransportSerializer(JSONSerializer):
+    """
+    Wraps a serializer installed on an elasticsearch client transport, so that it encodes to str: the client joins
+    serialized lines of list bodies (bulk, msearch requests) as strings, which fails with serializers encoding to
+    bytes (``OrjsonSerializer``, ``UjsonSerializer``). Already encoded bodies are still passed as is.
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.mimetype = serializer.mimetype
+
+    def default(self, data):
+        return self.serializer.default(data)
+
+    def loads(self, s):
+        return self.serializer.loads(s)
+
+    def dumps(self, data):
+        if isinstance(data, (str, bytes)):
+            return data
+        encoded = self.serializer.dumps(data)
+        if isinstance(encoded, bytes):
+            return encoded.decode("utf-8")
+        return encoded
+
+
+def transport_serializer(serializer):
+    """
+    Return serializer suited to elasticsearch client transport, see :class:`TransportSerializer`.
+    """
+    if isinstance(serializer, TransportSerializer):
+        return serializer
+    return TransportSerializer(serializer)
+
+
+def install_serializer(client, serializer):
+    """
+    Make an existing elasticsearch client (sync or async) use provided serializer, both to encode requests bodies
+    and to decode responses.
+
+    Note that clients created by ``pandagg.connections`` registry use the serializer registered for their alias.
+    """
+    transport = client.transport
+    serializers = DEFAULT_SERIALIZERS.copy()
+    serializers[serializer.mimetype] = serializer
+    transport.serializer = transport_serializer(serializer)
+    transport.deserializer = Deserializer(serializers)
+    return client
+
+
+def dumps(obj, indent=None):
+    """
+    Serialize object to json string, using `orjson` if installed (used for display purposes).
+
+    :param indent: None for compact representation, else 2 (only supported indentation with orjson)
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(obj, indent=indent)
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    except TypeError:
+        # unsupported types (or integers exceeding 64 bits)
+        return json.dumps(obj, indent=indent)
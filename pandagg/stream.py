@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+
+from pandagg.node.aggs.abstract import UniqueBucketAgg
+from pandagg.response import Aggregations
+
+
+def _ijson():
+    try:
+        import ijson
+    except ImportError:
+        raise ImportError(
+            'Streaming responses parsing requires to install ijson. Please install "ijson" or '
+            "use non-streaming execution."
+        )
+    return ijson
+
+
+def _skip(events, event):
+    """
+    Consume events of value starting with `event`.
+    """
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if not depth:
+                return
+
+
+def _build(events, event, value):
+    """
+    Build value starting with `event` from events.
+    """
+    if event == "start_map":
+        d = {}
+        for event, key in events:
+            if event == "end_map":
+                return d
+            d[key] = _build(events, *next(events))
+    if event == "start_array":
+        a = []
+        for event, value in events:
+            if event == "end_array":
+                return a
+            a.append(_build(events, event, value))
+    return value
+
+
+class AggregationsStream(object):
+    """
+    Tabular view of aggregations (see :func:`~pandagg.response.Aggregations.to_tabular`), parsed incrementally from
+    raw search response body: only buckets of grouping aggregation are built (in chunks of `chunk_size` buckets),
+    upper levels buckets being walked as parsing events are read. The whole response is never held in memory.
+
+    Iterating over it yields rows as (index tuple, values dict) tuples, index names being available under
+    `index_names` attribute. Contrary to `to_tabular`, keyed buckets are yielded in response order.
+
+    >>> with open("response.json", "rb") as f:
+    >>>     for key, values in AggregationsStream(f, search=search, grouped_by="genres"):
+    >>>         ...
+
+    Requires ijson dependency.
+
+    :param source: raw search response body, as file-like object, bytes, or callable returning a file-like object
+        (in which case it is opened at iteration, and closed once consumed)
+    :param search: search that produced response
+    :param grouped_by: name of the aggregation node used as last grouping level
+    :param chunk_size: number of grouping aggregation buckets parsed at once
+    """
+
+    def __init__(
+        self,
+        source,
+        search,
+        grouped_by=None,
+        normalize=True,
+        expand_columns=True,
+        expand_sep="|",
+        with_single_bucket_groups=False,
+        chunk_size=1000,
+    ):
+        self._source = source
+        self._aggregations = Aggregations(data={}, search=search)
+        self._grouping_key, self._grouping_agg = self._aggregations._grouping_agg(
+            grouped_by
+        )
+        if self._grouping_key is None:
+            self._chain = []
+        else:
+            self._chain = self._aggregations._grouping_chain(
+                self._grouping_agg.identifier
+            )
+        # whether each level provides a key to rows index
+        self._indexed = [
+            with_single_bucket_groups or not isinstance(node, UniqueBucketAgg)
+            for _, node in self._chain
+        ]
+        self.index_names = [
+            name for (name, _), indexed in zip(self._chain, self._indexed) if indexed
+        ]
+        self.normalize = normalize
+        self.expand_columns = expand_columns
+        self.expand_sep = expand_sep
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        ijson = _ijson()
+        source = self._source
+        opened = callable(source)
+        if opened:
+            source = source()
+        elif isinstance(source, bytes):
+            source = io.BytesIO(source)
+        try:
+            events = iter(ijson.basic_parse(source, use_float=True))
+            chunk = []
+            for pair in self._parse_response(events):
+                chunk.append(pair)
+                if len(chunk) >= self.chunk_size:
+                    for row in self._rows(chunk):
+                        yield row
+                    chunk = []
+            for row in self._rows(chunk):
+                yield row
+        finally:
+            if opened:
+                source.close()
+
+    def _rows(self, chunk):
+        buckets = [bucket for _, bucket in chunk]
+        columns = self._aggregations._value_columns(
+            buckets,
+            self._grouping_key,
+            self._grouping_agg,
+            self.normalize,
+            self.expand_columns,
+            self.expand_sep,
+        )
+        return zip(
+            [keys for keys, _ in chunk],
+            self._aggregations._rows_values(columns, len(buckets)),
+        )
+
+    def _parse_response(self, events):
+        """
+        Yield (keys, bucket) tuples of grouping aggregation buckets.
+        """
+        if next(events)[0] != "start_map":
+            raise ValueError("Invalid search response, expected a json object.")
+        for event, key in events:
+            if event == "end_map":
+                return
+            event, value = next(events)
+            if key != "aggregations" or event != "start_map":
+                _skip(events, event)
+            elif not self._chain:
+                yield (), _build(events, event, value)
+            else:
+                for pair in self._parse_bucket(events, 0, (), None):
+                    yield pair
+
+    def _parse_bucket(self, events, level, keys, extract_key):
+        """
+        Parse bucket (or aggregations object at first level) containing aggregation at `level` of grouping chain.
+        If `extract_key` is provided, bucket key is extracted from bucket attributes, and appended to keys.
+        """
+        name = self._chain[level][0]
+        bucket = {}
+        deferred = None
+        for event, key in events:
+            if event == "end_map":
+                break
+            event, value = next(events)
+            if key != name or event != "start_map":
+                if extract_key is None:
+                    _skip(events, event)
+                else:
+                    bucket[key] = _build(events, event, value)
+                continue
+            if extract_key is None:
+                pairs = self._parse_agg(events, level, keys)
+            else:
+                try:
+                    pairs = self._parse_agg(
+                        events, level, keys + (extract_key(bucket),)
+                    )
+                except KeyError:
+                    # key attributes come after sub-aggregation, rows are kept until they are read
+                    deferred = list(self._parse_agg(events, level, keys + (None,)))
+                    continue
+            for pair in pairs:
+                yield pair
+        if deferred:
+            bucket_key = extract_key(bucket)
+            position = len(keys)
+            after = position + 1
+            for pair_keys, leaf_bucket in deferred:
+                yield (
+                    pair_keys[:position] + (bucket_key,) + pair_keys[after:],
+                    leaf_bucket,
+                )
+
+    def _parse_agg(self, events, level, keys):
+        """
+        Parse aggregation at `level` of grouping chain (`start_map` event already consumed), yield (keys, bucket)
+        tuples of grouping aggregation buckets below it.
+        """
+        _, node = self._chain[level]
+        last = level == len(self._chain) - 1
+        indexed = self._indexed[level]
+        if isinstance(node, UniqueBucketAgg):
+            # aggregation object is its single bucket
+            if last:
+                bucket = _build(events, "start_map", None)
+                key, bucket = next(node.extract_buckets(bucket))
+                yield (keys + (key,) if indexed else keys), bucket
+                return
+            extract_key = self._key_extractor(node, None) if indexed else None
+            for pair in self._parse_bucket(events, level + 1, keys, extract_key):
+                yield pair
+            return
+        for event, key in events:
+            if event == "end_map":
+                return
+            event, value = next(events)
+            if key != "buckets":
+                _skip(events, event)
+                continue
+            keyed = event == "start_map"
+            for event, value in events:
+                if event in ("end_map", "end_array"):
+                    break
+                map_key = None
+                if keyed:
+                    map_key = value
+                    event, value = next(events)
+                if last:
+                    bucket = _build(events, event, value)
+                    buckets = {map_key: bucket} if keyed else [bucket]
+                    key, bucket = next(node.extract_buckets({"buckets": buckets}))
+                    yield (keys + (key,) if indexed else keys), bucket
+                    continue
+                extract_key = (
+                    self._key_extractor(node, map_key, keyed) if indexed else None
+                )
+                for pair in self._parse_bucket(events, level + 1, keys, extract_key):
+                    yield pair
+
+    @staticmethod
+    def _key_extractor(node, map_key, keyed=False):
+        """
+        Return function extracting key from bucket attributes, relying on aggregation buckets extraction.
+        """
+
+        def extract_key(bucket):
+            if isinstance(node, UniqueBucketAgg):
+                response_value = bucket
+            elif keyed:
+                response_value = {"buckets": {map_key: bucket}}
+            else:
+                response_value = {"buckets": [bucket]}
+            return next(node.extract_buckets(response_value))[0]
+
+        return extract_key
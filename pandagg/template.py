@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import re
+
+from pandagg.connections import get_connection, get_async_connection
+from pandagg.serializer import JSONSerializer
+
+
+class Param(object):
+    """
+    Named placeholder, standing for a value provided when binding a compiled search (see
+    :func:`~pandagg.search.Search.compile`).
+
+    >>> from pandagg.query import Term
+    >>> Term(user=Param("uid"))
+
+    :param name: placeholder name
+    :param default: value used if not provided when binding, if absent value is required
+    """
+
+    _REQUIRED = object()
+
+    def __init__(self, name, default=_REQUIRED):
+        self.name = name
+        self.default = default
+
+    @property
+    def required(self):
+        return self.default is Param._REQUIRED
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Param)
+            and other.name == self.name
+            and other.default == self.default
+        )
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return "Param(%r)" % self.name
+
+
+# placeholders are serialized as (escaped) strings, that can't conflict with a regular string value
+_MARKER = "\x00pandagg-param:%s\x00"
+_MARKER_RE = re.compile(r'"\\u0000pandagg-param:(.*?)\\u0000"')
+
+# other values (dates, decimals..) are serialized as by elasticsearch client
+_serializer = JSONSerializer()
+
+
+class SearchTemplate(object):
+    """
+    Search compiled into a pre-serialized body, in which values are substituted at bind time without rebuilding
+    any query or aggregation tree.
+
+    Use :func:`~pandagg.search.Search.compile` to build one.
+
+    >>> template = Search().filter("term", user=Param("uid")).size(Param("size", default=10)).compile()
+    >>> template.bind(uid=12)
+    '{"query":{"bool":{"filter":[{"term":{"user":{"value":12}}}]}},"size":10}'
+    >>> response = template.execute(uid=12)
+
+    :param search: compiled ``pandagg.search.Search`` instance, used to execute requests and parse responses
+    """
+
+    def __init__(self, search):
+        self.search = search
+        self.params = {}
+        # stored search template identifier, if registered in elasticsearch
+        self.id = None
+        serialized = json.dumps(
+            search.to_dict(), separators=(",", ":"), default=self._placeholder
+        )
+        # alternation of json fragments, and placeholder names
+        self._parts = _MARKER_RE.split(serialized)
+
+    def _placeholder(self, obj):
+        if not isinstance(obj, Param):
+            return _serializer.default(obj)
+        if obj.name in self.params and self.params[obj.name] != obj:
+            raise ValueError('Conflicting declarations of "%s" param.' % obj.name)
+        self.params[obj.name] = obj
+        return _MARKER % obj.name
+
+    def _values(self, values):
+        unknown = set(values) - set(self.params)
+        if unknown:
+            raise ValueError("Unknown params: %s" % ", ".join(sorted(unknown)))
+        full_values = {}
+        for name, param in self.params.items():
+            if name in values:
+                full_values[name] = values[name]
+            elif not param.required:
+                full_values[name] = param.default
+            else:
+                raise ValueError('Missing value for "%s" param.' % name)
+        return full_values
+
+    def bind(self, **values):
+        """
+        Return serialized request body (json string), with provided params values.
+        """
+        values = self._values(values)
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = json.dumps(
+                values[parts[i]], separators=(",", ":"), default=_serializer.default
+            )
+        return "".join(parts)
+
+    def to_mustache(self):
+        """
+        Return body as a mustache template, in which params are rendered as json.
+        """
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = "{{#toJson}}%s{{/toJson}}" % parts[i]
+        return "".join(parts)
+
+    def _script(self):
+        return {"script": {"lang": "mustache", "source": self.to_mustache()}}
+
+    def store(self, id):
+        """
+        Register template in elasticsearch as a stored search template: subsequent executions only send params
+        values.
+
+        :param id: stored search template identifier
+        """
+        es = get_connection(self.search._using)
+        es.put_script(id=id, body=self._script())
+        self.id = id
+        return self
+
+    def execute(self, **values):
+        """
+        Execute search with provided params values, and return an instance of ``Response``.
+        """
+        if self.id is None:
+            return self.search._execute(self.bind(**values))
+        return self.search._execute(
+            {"id": self.id, "params": self._values(values)}, template=True
+        )
+
+
+class AsyncSearchTemplate(SearchTemplate):
+    """
+    Asynchronous flavour of :class:`~pandagg.template.SearchTemplate`, built by
+    :func:`~pandagg.search.AsyncSearch.compile`: `store` and `execute` must be awaited.
+    """
+
+    async def store(self, id):
+        es = get_async_connection(self.search._using)
+        await es.put_script(id=id, body=self._script())
+        self.id = id
+        return self
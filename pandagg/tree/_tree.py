@@ -3,14 +3,43 @@
 
 from lighttree import Tree as OriginalTree
 
+from pandagg.node._node import Node
 from pandagg.utils import DSLMixin
 
 
 class Tree(DSLMixin, OriginalTree):
+    """
+    Clones share their structure (nodes map and hierarchy) with the tree they originate from: structure is copied
+    lazily, on first mutation of either tree (copy-on-write). Only the children container of the parent node
+    under which a node is inserted (or dropped) is then copied, other ones remaining shared.
+    Nodes are shared between clones, and must be replaced rather than mutated (see `_replace_node`).
+
+    Serialized subtrees are memoized per node (see `_serialize`): a mutation only invalidates the serialization of
+    the mutated node and of its ancestors, so that serializing an unchanged tree again is almost free.
+
+    In place mode (`_in_place` set to True, see ``pandagg.search.Search.batch``), `clone` returns the tree itself,
+    so that builder methods mutate it instead of returning a modified copy.
+    """
 
     KEY = None
     _type_name = None
 
+    # is structure shared with other trees
+    _shared = False
+    # identifiers of nodes whose children container is owned by this tree, None if all are
+    _owned_children = None
+    # are builder methods applied on current instance rather than on a clone
+    _in_place = False
+
+    def __init__(self, *args, **kwargs):
+        super(Tree, self).__init__(*args, **kwargs)
+        # key -> identifier of first node placed under this key, for nodes having a "str" key
+        self._key_index = {}
+        # key -> identifiers of nodes placed under this key (in insertion order), only for duplicated keys
+        self._key_duplicates = {}
+        # identifier -> serialized subtree under this node, filled lazily by `_serialize`
+        self._serialized = {}
+
     @classmethod
     def get_node_dsl_class(cls, name):
         return cls.node_class._get_dsl_class(name)
@@ -31,11 +60,170 @@ class Tree(DSLMixin, OriginalTree):
         possible that multiple clauses share the same name (not recommended, but allowed), some pandagg features are
         ambiguous and not recommended in such context.
         """
+        if key is None and self.root is not None:
+            return self.root
+        if key in self._key_index:
+            return self._key_index[key]
+        if isinstance(key, str):
+            raise KeyError('No node found with key "%s"' % key)
+        # position keys, under "list" nodes, are not indexed
         for k, n in self.list():
             if k == key:
                 return n.identifier
         raise KeyError('No node found with key "%s"' % key)
 
+    def insert(
+        self,
+        item,
+        parent_id=None,
+        child_id=None,
+        child_id_below=None,
+        key=None,
+        by_path=False,
+    ):
+        # pandagg nodes don't inherit from lighttree.Node
+        if isinstance(item, Node):
+            if child_id_below is not None:
+                raise ValueError(
+                    '"child_id_below" parameter is reserved to Tree insertion.'
+                )
+            self.insert_node(
+                node=item,
+                parent_id=parent_id,
+                child_id=child_id,
+                key=key,
+                by_path=by_path,
+            )
+            return self
+        return super(Tree, self).insert(
+            item,
+            parent_id=parent_id,
+            child_id=child_id,
+            child_id_below=child_id_below,
+            key=key,
+            by_path=by_path,
+        )
+
+    def clone(self, with_nodes=True, deep=False, new_root=None):
+        if not with_nodes or deep or new_root is not None:
+            return super(Tree, self).clone(
+                with_nodes=with_nodes, deep=deep, new_root=new_root
+            )
+        if self._in_place:
+            return self
+        new_tree = self._clone_init(deep)
+        new_tree.root = self.root
+        new_tree._nodes_map = self._nodes_map
+        new_tree._nodes_parent = self._nodes_parent
+        new_tree._nodes_children_map = self._nodes_children_map
+        new_tree._nodes_children_list = self._nodes_children_list
+        new_tree._key_index = self._key_index
+        new_tree._key_duplicates = self._key_duplicates
+        # memoized serializations are valid for both trees until one of them is mutated
+        new_tree._serialized = self._serialized
+        for tree in (self, new_tree):
+            tree._shared = True
+            tree._owned_children = set()
+        return new_tree
+
+    def _own(self, pid=None):
+        """
+        Ensure structure is owned by this tree before mutating it, as well as children container of `pid` node.
+        """
+        if self._shared:
+            self._nodes_map = self._nodes_map.copy()
+            self._nodes_parent = self._nodes_parent.copy()
+            self._nodes_children_map = self._nodes_children_map.copy()
+            self._nodes_children_list = self._nodes_children_list.copy()
+            self._key_index = self._key_index.copy()
+            # values are tuples, a shallow copy is enough
+            self._key_duplicates = self._key_duplicates.copy()
+            self._serialized = self._serialized.copy()
+            self._shared = False
+        if pid is None or self._owned_children is None or pid in self._owned_children:
+            return
+        if pid in self._nodes_children_map:
+            self._nodes_children_map[pid] = self._nodes_children_map[pid].copy()
+        if pid in self._nodes_children_list:
+            self._nodes_children_list[pid] = self._nodes_children_list[pid][:]
+        self._owned_children.add(pid)
+
+    def _insert_node_below(self, node, parent_id, key, by_path):
+        if by_path:
+            parent_id = self.get_node_id_by_path(path=parent_id)
+        self._own(parent_id)
+        if parent_id is not None:
+            self._invalidate(parent_id)
+        super(Tree, self)._insert_node_below(
+            node=node, parent_id=parent_id, key=key, by_path=False
+        )
+        if not isinstance(key, str):
+            return
+        if key not in self._key_index:
+            self._key_index[key] = node.identifier
+            return
+        self._key_duplicates[key] = self._key_duplicates.get(
+            key, (self._key_index[key],)
+        ) + (node.identifier,)
+
+    def _drop_node(self, nid):
+        self._own(self._nodes_parent.get(nid))
+        self._invalidate(nid)
+        key, node = super(Tree, self)._drop_node(nid)
+        if not isinstance(key, str):
+            return key, node
+        if key not in self._key_duplicates:
+            del self._key_index[key]
+            return key, node
+        ids = tuple(id_ for id_ in self._key_duplicates[key] if id_ != nid)
+        self._key_index[key] = ids[0]
+        if len(ids) > 1:
+            self._key_duplicates[key] = ids
+        else:
+            del self._key_duplicates[key]
+        return key, node
+
+    def _replace_node(self, nid, node):
+        """
+        Replace node under given identifier, keeping its position in tree. Used instead of mutating a node that
+        might be shared with other trees.
+        """
+        if node.identifier != nid:
+            raise ValueError(
+                "Replacing node must have same identifier <%s>, got <%s>"
+                % (nid, node.identifier)
+            )
+        self._ensure_present(nid)
+        self._own()
+        self._invalidate(nid)
+        self._nodes_map[nid] = node
+
+    def _serialize(self, nid):
+        """
+        Return serialized subtree under `nid` node (as computed by `_serialize_node`), memoized until this subtree is
+        mutated. Returned object is shared, and must not be mutated.
+        """
+        try:
+            return self._serialized[nid]
+        except KeyError:
+            pass
+        serialized = self._serialized[nid] = self._serialize_node(nid)
+        return serialized
+
+    def _serialize_node(self, nid):
+        raise NotImplementedError()
+
+    def _invalidate(self, nid):
+        """
+        Discard memoized serializations affected by a mutation of `nid` node: its own, and its ancestors ones.
+        """
+        if not self._serialized:
+            return
+        self._serialized.pop(nid, None)
+        while nid in self._nodes_parent:
+            nid = self._nodes_parent[nid]
+            self._serialized.pop(nid, None)
+
     def __str__(self):
         return "<{class_}>\n{tree}".format(
             class_=str(self.__class__.__name__), tree=self.show(limit=40)
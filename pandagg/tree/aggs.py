@@ -1,10 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
-
+from pandagg.serializer import dumps
 from pandagg.tree._tree import Tree
 from pandagg.tree.mappings import _mappings
+from pandagg.utils import copy_containers
 
 from pandagg.node.aggs.abstract import BucketAggClause, AggClause, Root, A
 from pandagg.node.aggs.bucket import Nested, ReverseNested
@@ -191,14 +191,21 @@ class Aggs(Tree):
         if self.root is None:
             return None
         from_ = self.root if from_ is None else from_
-        _, node = self.get(from_)
+        if depth is None:
+            return copy_containers(self._serialize(from_))
+        return self._serialize_node(from_, depth=depth)
+
+    def _serialize_node(self, nid, depth=None):
+        _, node = self.get(nid)
         children_queries = {}
         if depth is None or depth > 0:
             if depth is not None:
                 depth -= 1
             for child_name, child_node in self.children(node.identifier):
-                children_queries[child_name] = self.to_dict(
-                    from_=child_node.identifier, depth=depth
+                children_queries[child_name] = (
+                    self._serialize(child_node.identifier)
+                    if depth is None
+                    else self._serialize_node(child_node.identifier, depth=depth)
                 )
         if node.identifier == self.root:
             return children_queries
@@ -269,7 +276,8 @@ class Aggs(Tree):
         )
 
     def __nonzero__(self):
-        return bool(self.to_dict())
+        # aggregation clauses are placed under the root node
+        return self.root is not None and bool(self.children_ids(self.root))
 
     __bool__ = __nonzero__
 
@@ -486,4 +494,4 @@ class Aggs(Tree):
         super(Aggs, self)._insert_node_below(node, parent_id, key, by_path)
 
     def __str__(self):
-        return json.dumps(self.to_dict(), indent=2)
+        return dumps(self.to_dict(), indent=2)
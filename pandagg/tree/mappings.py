@@ -9,6 +9,7 @@ from pandagg.exceptions import (
     InvalidOperationMappingFieldError,
 )
 from pandagg.tree._tree import Tree
+from pandagg.utils import copy_containers
 
 
 def _mappings(m):
@@ -25,12 +26,20 @@ class Mappings(Tree):
 
     node_class = Field
 
+    # path -> field info, see `_field_index`
+    _paths = None
+    # compiled documents validator, see `_validator`
+    _document_validator = None
+    # compiled documents coercer, see `_coercer`
+    _document_coercer = None
+
     def __init__(self, properties=None, dynamic=False, **kwargs):
         super(Mappings, self).__init__()
         root_node = Field(dynamic=dynamic, **kwargs)
         self.insert_node(root_node)
         if properties:
             self._insert(root_node.identifier, properties, False)
+        self._field_index()
 
     def to_dict(self, from_=None, depth=None):
         """
@@ -44,14 +53,21 @@ class Mappings(Tree):
         if self.root is None:
             return None
         from_ = self.root if from_ is None else from_
-        key, node = self.get(from_)
+        if depth is None:
+            return copy_containers(self._serialize(from_))
+        return self._serialize_node(from_, depth=depth)
+
+    def _serialize_node(self, nid, depth=None):
+        key, node = self.get(nid)
         children_queries = {}
         if depth is None or depth > 0:
             if depth is not None:
                 depth -= 1
             for child_key, child_node in self.children(node.identifier):
-                children_queries[child_key] = self.to_dict(
-                    from_=child_node.identifier, depth=depth
+                children_queries[child_key] = (
+                    self._serialize(child_node.identifier)
+                    if depth is None
+                    else self._serialize_node(child_node.identifier, depth=depth)
                 )
         serialized_node = node.body
         if children_queries:
@@ -74,20 +90,19 @@ class Mappings(Tree):
             if agg_clause.path is None:
                 # reverse nested
                 return True
-            return self.resolve_path_to_id(agg_clause.path) in self
+            return agg_clause.path in self._field_index()
 
         if not hasattr(agg_clause, "field"):
             return True
 
         # TODO take into account flattened data type
         try:
-            nid = self.get_node_id_by_path(agg_clause.field)
-        except StopIteration:
+            _, field, _ = self._field_index()[agg_clause.field]
+        except KeyError:
             raise AbsentMappingFieldError(
                 u"Agg of type <%s> on non-existing field <%s>."
                 % (agg_clause.KEY, agg_clause.field)
             )
-        _, field = self.get(nid)
 
         field_type = field.KEY
         if not agg_clause.valid_on_field_type(field_type):
@@ -117,13 +132,7 @@ class Mappings(Tree):
         >>> mappings.mapping_type_of_field('comments.comment_text')
         'text'
         """
-        try:
-            _, node = self.get(field_path, by_path=True)
-            return node.KEY
-        except Exception:
-            raise AbsentMappingFieldError(
-                u"<%s field is not present in mappings>" % field_path
-            )
+        return self._field_info(field_path)[1].KEY
 
     def nested_at_field(self, field_path):
         """
@@ -166,13 +175,70 @@ class Mappings(Tree):
         >>> mappings.list_nesteds_at_field('comments.comment_text')
         ['comments']
         """
-        path_nid = self.get_node_id_by_path(field_path)
-        # from deepest to highest
-        return [
-            self.get_path(nid)
-            for nid in self.ancestors_ids(path_nid, include_current=True)
-            if self.get(nid)[1].KEY == "nested"
-        ]
+        return list(self._field_info(field_path)[2])
+
+    def _field_index(self):
+        """
+        Return flat index of fields, built along with mappings (or on first call after a mutation) and shared with
+        clones:
+        path -> (field identifier, field, paths of nested fields applying at this path from deepest to highest)
+        """
+        if self._paths is not None:
+            return self._paths
+        paths = {}
+        if self.root is not None:
+            paths[""] = (self.root, self.get(self.root)[1], ())
+            stack = [(self.root, "", ())]
+            while stack:
+                nid, path, nesteds = stack.pop()
+                for cid, key in self._nodes_children_map.get(nid, {}).items():
+                    field = self._nodes_map[cid]
+                    field_path = "%s.%s" % (path, key) if path else key
+                    field_nesteds = nesteds
+                    if field.KEY == "nested":
+                        field_nesteds = (field_path,) + nesteds
+                    paths[field_path] = (cid, field, field_nesteds)
+                    stack.append((cid, field_path, field_nesteds))
+        self._paths = paths
+        return paths
+
+    def _field_info(self, field_path):
+        try:
+            return self._field_index()[field_path]
+        except KeyError:
+            raise AbsentMappingFieldError(
+                u"<%s field is not present in mappings>" % field_path
+            )
+
+    def clone(self, with_nodes=True, deep=False, new_root=None):
+        new_tree = super(Mappings, self).clone(
+            with_nodes=with_nodes, deep=deep, new_root=new_root
+        )
+        if with_nodes and not deep and new_root is None:
+            # same fields: index, validator and coercer remain valid
+            new_tree._paths = self._paths
+            new_tree._document_validator = self._document_validator
+            new_tree._document_coercer = self._document_coercer
+        return new_tree
+
+    def _reset_compiled(self):
+        self._paths = None
+        self._document_validator = None
+        self._document_coercer = None
+
+    def _insert_node_below(self, node, parent_id, key, by_path):
+        self._reset_compiled()
+        super(Mappings, self)._insert_node_below(
+            node=node, parent_id=parent_id, key=key, by_path=by_path
+        )
+
+    def _drop_node(self, nid):
+        self._reset_compiled()
+        return super(Mappings, self)._drop_node(nid)
+
+    def _replace_node(self, nid, node):
+        self._reset_compiled()
+        super(Mappings, self)._replace_node(nid, node)
 
     def _insert(self, pid, properties, is_subfield):
         """
@@ -186,7 +252,8 @@ class Mappings(Tree):
         if not isinstance(properties, dict):
             raise ValueError("Wrong declaration, got %s" % properties)
         for field_name, field in properties.items():
-            if isinstance(field, dict):
+            from_dict = isinstance(field, dict)
+            if from_dict:
                 field = field.copy()
                 field = Field._get_dsl_class(field.pop("type", "object"))(
                     _subfield=is_subfield, **field
@@ -206,52 +273,200 @@ class Mappings(Tree):
                         % field_name
                     )
                 self._insert(field.identifier, field.fields, True)
+            if from_dict:
+                # children definitions are now held by the tree, don't retain raw declaration
+                if isinstance(field, ComplexField):
+                    field.properties = {}
+                if isinstance(field, RegularField):
+                    field.fields = None
 
     def validate_document(self, d):
-        self._validate_document(d, pid=self.root)
-
-    def _validate_document(self, d, pid, path=""):
-        if d is None:
-            d = {}
-        if not isinstance(d, dict):
-            raise ValueError(
-                "Invalid document type, expected dict, got <%s> at '%s'"
-                % (type(d), path)
-            )
+        """
+        Check that document complies with mappings (field types, `nullable` and `multiple` constraints), raise
+        ValueError otherwise.
+        """
+        self._validator()(d)
+
+    def validate_documents(self, documents):
+        """
+        Validate documents in batch, without stopping at first invalid document.
+
+        >>> mappings.validate_documents([{"user": "a"}, {"user": ["a", "b"]}])
+        [(1, ValueError('Field <user> should not be an array'))]
+
+        :param documents: iterable of documents
+        :return: list of (document position, ValueError) tuples, one per invalid document
+        """
+        validate = self._validator()
+        errors = []
+        for i, d in enumerate(documents):
+            try:
+                validate(d)
+            except ValueError as e:
+                errors.append((i, e))
+        return errors
+
+    def _validator(self):
+        """
+        Return document validator compiled from mappings, built on first call and shared with clones until mutation.
+        """
+        if self._document_validator is None:
+            self._document_validator = self._compile_validator(self.root)
+        return self._document_validator
+
+    def _compile_validator(self, pid, path=""):
+        """
+        Compile validation of documents at `pid` level into a closure: mappings are walked once, instead of once per
+        validated document, and fields without any constraint are skipped.
+        """
+        # (field name, field, field check or for fields only constrained on their values types values validator)
+        checks = []
         for field_name, field in self.children(pid):
             full_path = ".".join([path, field_name]) if path else field_name
-            field_value = d.get(field_name)
-            if not field._nullable and not field_value:
-                raise ValueError("Field <%s> cannot be null" % full_path)
+            if (
+                field._nullable
+                and field._multiple is None
+                and not field._ARRAY_VALUE
+                and not isinstance(field, (Object, Nested))
+            ):
+                # most common case, inlined in level validation
+                is_valid_value = field.value_validator()
+                if is_valid_value is not None:
+                    checks.append((field_name, field, None, is_valid_value))
+                continue
+            check = self._compile_field_validator(field, full_path)
+            if check is not None:
+                checks.append((field_name, field, check, None))
 
-            if field._multiple is True:
-                if field_value is not None:
-                    if not isinstance(field_value, list):
-                        raise ValueError("Field <%s> should be a array" % full_path)
-                    field_value_list = field_value
+        def validate(d):
+            if d is None:
+                d = {}
+            if not isinstance(d, dict):
+                raise ValueError(
+                    "Invalid document type, expected dict, got <%s> at '%s'"
+                    % (type(d), path)
+                )
+            for field_name, field, check, is_valid_value in checks:
+                value = d.get(field_name)
+                if check is not None:
+                    check(value)
+                    continue
+                if not value:
+                    continue
+                for v in value if type(value) is list else (value,):
+                    if v and not is_valid_value(v):
+                        raise ValueError(
+                            "Field <%s> value <%s> is not compatible with field of type %s"
+                            % (
+                                ".".join([path, field_name]) if path else field_name,
+                                v,
+                                field.KEY,
+                            )
+                        )
+
+        return validate
+
+    def _compile_field_validator(self, field, full_path):
+        nullable = field._nullable
+        multiple = field._multiple
+        is_valid_value = field.value_validator()
+        array_value = field._ARRAY_VALUE
+        validate_inner = None
+        if isinstance(field, (Object, Nested)):
+            validate_inner = self._compile_validator(field.identifier, full_path)
+        if nullable and multiple is None and is_valid_value is None:
+            if validate_inner is None:
+                return None
+
+        def check(value):
+            if not nullable and not value:
+                raise ValueError("Field <%s> cannot be null" % full_path)
+            is_list = isinstance(value, list)
+            if is_list and array_value and value:
+                # array of numbers is a single value (geo_point [lon, lat], dense_vector)
+                is_list = not all(isinstance(x, (int, float)) for x in value)
+            if multiple is True:
+                if value is None:
+                    values = ()
+                elif not is_list:
+                    raise ValueError("Field <%s> should be a array" % full_path)
                 else:
-                    field_value_list = []
-                if not field._nullable and not any(field_value_list):
+                    values = value
+                if not nullable and not any(values):
                     # deal with case: [None]
                     raise ValueError("Field <%s> cannot be null" % full_path)
-            elif field._multiple is False:
-                if isinstance(field_value, list):
+            elif multiple is False:
+                if is_list:
                     raise ValueError("Field <%s> should not be an array" % full_path)
-                field_value_list = [field_value] if field_value else []
+                values = (value,) if value else ()
             else:
-                # field._multiple is None -> no restriction
-                if isinstance(field_value, list):
-                    field_value_list = field_value
+                # no restriction
+                values = value if is_list else (value,)
+            for v in values:
+                # nullable check has been done beforehands
+                if v and is_valid_value is not None and not is_valid_value(v):
+                    raise ValueError(
+                        "Field <%s> value <%s> is not compatible with field of type %s"
+                        % (full_path, v, field.KEY)
+                    )
+                if validate_inner is not None:
+                    validate_inner(v)
+
+        return check
+
+    def coerce_document(self, d):
+        """
+        Return document in which values are converted to the types elasticsearch indexes them as, according to
+        fields datatypes (for instance numeric strings into numbers for numeric fields). Provided document isn't
+        mutated, unchanged levels of the document being shared with the returned one.
+        """
+        coerce = self._coercer()
+        if coerce is None:
+            return d
+        return coerce(d)
+
+    def _coercer(self):
+        """
+        Return document coercer compiled from mappings, None if no field requires coercion. Built on first call and
+        shared with clones until mutation.
+        """
+        if self._document_coercer is None:
+            self._document_coercer = self._compile_coercer(self.root) or False
+        return self._document_coercer or None
+
+    def _compile_coercer(self, pid):
+        # (field name, value coercer, or for object and nested fields inner documents coercer)
+        coercers = []
+        for field_name, field in self.children(pid):
+            if isinstance(field, (Object, Nested)):
+                coerce = self._compile_coercer(field.identifier)
+                if coerce is not None:
+                    coercers.append((field_name, coerce))
+                continue
+            coerce = field.value_coercer()
+            if coerce is not None:
+                coercers.append((field_name, coerce))
+        if not coercers:
+            return None
+
+        def coerce_document(d):
+            if not isinstance(d, dict):
+                return d
+            coerced = None
+            for field_name, coerce in coercers:
+                value = d.get(field_name)
+                if value is None:
+                    continue
+                if type(value) is list:
+                    new_value = [coerce(v) for v in value]
+                    changed = any(n is not v for n, v in zip(new_value, value))
                 else:
-                    field_value_list = [field_value]
+                    new_value = coerce(value)
+                    changed = new_value is not value
+                if changed:
+                    if coerced is None:
+                        coerced = d.copy()
+                    coerced[field_name] = new_value
+            return d if coerced is None else coerced
 
-            for value in field_value_list:
-                # nullable check has been done beforehands
-                if value:
-                    if not field.is_valid_value(value):
-                        raise ValueError(
-                            "Field <%s> value <%s> is not compatible with field of type %s"
-                            % (full_path, value, field.KEY)
-                        )
-                if isinstance(field, (Object, Nested)):
-                    self._validate_document(value, field.identifier, path=full_path)
+        return coerce_document
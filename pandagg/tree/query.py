@@ -1,16 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
+import copy
 
 from pandagg._decorators import Substitution
 from pandagg.node.query._parameter_clause import ParentParameterClause
-from pandagg.node.query.abstract import QueryClause, LeafQueryClause, Q
+from pandagg.node.query.abstract import QueryClause, LeafQueryClause, RawClause, Q
 from pandagg.node.query.compound import CompoundClause, Bool
 from pandagg.node.query.joining import Nested
 
+from pandagg.serializer import dumps
 from pandagg.tree._tree import Tree
 from pandagg.tree.mappings import _mappings
+from pandagg.utils import copy_containers
 
 ADD = "add"
 REPLACE = "replace"
@@ -42,22 +44,29 @@ class Query(Tree):
 
     node_class = QueryClause
 
-    def __init__(self, q=None, mappings=None, nested_autocorrect=False):
+    def __init__(self, q=None, mappings=None, nested_autocorrect=False, lazy=False):
         """
         Combination of query clauses.
 
         Mappings declaration is optional, but doing so validates query consistency.
 
+        In lazy mode, clauses provided as dicts are kept in their serialized form (see
+        :class:`~pandagg.node.query.abstract.RawClause`), and serialized as is. They are expanded incrementally, only
+        when required by an insertion: for instance adding a filter on a query having a bool root clause only expands
+        this bool clause, its children clauses remaining raw. Raw clauses are not validated against mappings.
+
         :param q: optional, query (dict, or Query instance)
         :param mappings: ``dict`` or ``pandagg.tree.mappings.Mappings``
         Mappings of requested indice(s). Providing it will add validation features.
         :param nested_autocorrect: add required nested clauses if missing. Ignored if mappings is not provided.
+        :param lazy: if True, defer parsing of clauses provided as dicts
         """
         self.mappings = _mappings(mappings)
         self.nested_autocorrect = nested_autocorrect
+        self.lazy = lazy
         super(Query, self).__init__()
         if q:
-            self._insert_query(q)
+            self._insert_query(q, lazy=lazy)
 
     @sub_insertion
     def query(
@@ -330,7 +339,10 @@ class Query(Tree):
         if self.root is None:
             return None
         from_ = self.root if from_ is None else from_
-        key, node = self.get(from_)
+        return copy_containers(self._serialize(from_))
+
+    def _serialize_node(self, nid):
+        key, node = self.get(nid)
         if isinstance(node, LeafQueryClause):
             return node.to_dict()
 
@@ -341,7 +353,7 @@ class Query(Tree):
         is_empty = True
         for param_key, param_node in self.children(node.identifier):
             children_serialized = [
-                self.to_dict(child_node.identifier)
+                self._serialize(child_node.identifier)
                 for _, child_node in self.children(param_node.identifier)
             ]
             children_serialized = [c for c in children_serialized if c]
@@ -380,7 +392,8 @@ class Query(Tree):
         return q
 
     def __nonzero__(self):
-        return bool(self.to_dict())
+        # query is empty if it doesn't contain any leaf clause (compound clauses without children are ignored)
+        return any(isinstance(n, LeafQueryClause) for n in self._nodes_map.values())
 
     __bool__ = __nonzero__
 
@@ -390,8 +403,43 @@ class Query(Tree):
             if self.mappings is None
             else self.mappings.clone(with_nodes=True, deep=deep),
             nested_autocorrect=self.nested_autocorrect,
+            lazy=self.lazy,
         )
 
+    def _expand(self, nid):
+        """
+        Replace raw clause by its parsed version, at same position. Its children clauses (if it is a compound clause)
+        are kept raw.
+        """
+        _, node = self.get(nid)
+        if not isinstance(node, RawClause):
+            return
+        expanded = node.expand()
+        if expanded.identifier == nid:
+            self._replace_node(nid, expanded)
+        else:
+            # named clause, identified by its name
+            pid = None if nid == self.root else self.parent_id(nid)
+            self.drop_node(nid)
+            self.insert_node(expanded, parent_id=pid)
+        self._insert_children_clauses(expanded, lazy=True)
+
+    def _expand_all(self):
+        """
+        Expand all raw clauses.
+        """
+        raw_ids = [
+            n.identifier for n in self._nodes_map.values() if isinstance(n, RawClause)
+        ]
+        while raw_ids:
+            for nid in raw_ids:
+                self._expand(nid)
+            raw_ids = [
+                n.identifier
+                for n in self._nodes_map.values()
+                if isinstance(n, RawClause)
+            ]
+
     def _has_bool_root(self):
         if not self.root:
             return False
@@ -436,6 +484,17 @@ class Query(Tree):
         if mode not in (ADD, REPLACE, REPLACE_ALL):
             raise ValueError("Invalid mode %s" % mode)
 
+        # expand raw clauses that are required for insertion
+        if self.root is not None and self.get(self.root)[1].KEY == Bool.KEY:
+            self._expand(self.root)
+        for nid in (on, insert_below):
+            if nid is None:
+                continue
+            if nid not in self._nodes_map:
+                # clause might be nested in a raw clause
+                self._expand_all()
+            self._expand(nid)
+
         if (
             isinstance(node, Bool)
             and not on
@@ -453,14 +512,16 @@ class Query(Tree):
                     % (node.KEY, existing.KEY)
                 )
             if mode == REPLACE_ALL:
-                pid = self.parent_id(on)
+                pid = None if on == self.root else self.parent_id(on)
                 existing_k, _ = self.drop_subtree(on)
                 self._insert_query(node, insert_below=pid)
-                existing.body = node.body
                 return
 
-            # merge
-            existing.body.update(node.body)
+            # merge, existing node might be shared with other clones: replace it rather than mutating it
+            merged = copy.copy(existing)
+            merged.body = existing.body.copy()
+            merged.body.update(node.body)
+            self._replace_node(on, merged)
             for param_key, children in node._children.items():
                 if not children:
                     continue
@@ -537,14 +598,22 @@ class Query(Tree):
             self._insert_query(Bool(must=[node, initial_query.to_dict()]))
         return
 
-    def _insert_query(self, query=None, insert_below=None):
+    def _insert_query(self, query=None, insert_below=None, lazy=None):
         """
         Insert query clause and its children (recursively).
         Does not handle logic about where to insert it, should be handled before (dumb insert below insert_below).
+
+        :param lazy: if True, clauses provided as dicts are inserted as raw clauses, defaults to Query `lazy` mode.
         """
+        lazy = self.lazy if lazy is None else lazy
+        if lazy and isinstance(query, dict):
+            self.insert_node(RawClause(query), parent_id=insert_below)
+            return
         node = self._q(query)
         self.insert_node(node, parent_id=insert_below)
+        self._insert_children_clauses(node, lazy=lazy)
 
+    def _insert_children_clauses(self, node, lazy):
         if not isinstance(node, CompoundClause):
             return
 
@@ -558,7 +627,9 @@ class Query(Tree):
                 )
             self.insert_node(param_node, parent_id=node.identifier, key=param_name)
             for child in child_nodes:
-                self._insert_query(query=child, insert_below=param_node.identifier)
+                self._insert_query(
+                    query=child, insert_below=param_node.identifier, lazy=lazy
+                )
 
     def _insert_node_below(self, node, parent_id, key, by_path):
         """
@@ -597,7 +668,7 @@ class Query(Tree):
                 node=node, parent_id=parent_id, key=key, by_path=by_path
             )
         required_nested_level = self.mappings.nested_at_field(node.field)
-        if len(self.list()) <= 1:
+        if len(self._nodes_map) <= 1:
             # empty
             current_nested_level = None
         else:
@@ -621,4 +692,4 @@ class Query(Tree):
         self._insert_query(to_insert, parent_id)
 
     def __str__(self):
-        return json.dumps(self.to_dict(), indent=2)
+        return dumps(self.to_dict(), indent=2)
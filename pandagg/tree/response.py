@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from collections import OrderedDict, defaultdict
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping
+
+from lighttree.exceptions import NotFoundNodeError
 
 from pandagg.node.query.joining import Nested
 from pandagg.tree._tree import Tree
@@ -10,41 +14,120 @@ from pandagg.node.response.bucket import Bucket, BucketNode
 from pandagg.tree.query import Query
 
 
+class _BucketsMap(Mapping):
+    """
+    Identifier -> bucket node mapping of buckets under response tree root, used as tree nodes map. Nodes are built
+    on access.
+    """
+
+    def __init__(self, tree):
+        self._tree = tree
+
+    def __getitem__(self, nid):
+        if nid not in self._tree:
+            raise KeyError(nid)
+        return self._tree._bucket(nid)
+
+    def __contains__(self, nid):
+        return nid in self._tree
+
+    def __iter__(self):
+        return self._tree._iter_ids()
+
+    def __len__(self):
+        if self._tree.root == 0:
+            return len(self._tree._parents)
+        return sum(1 for _ in self._tree._iter_ids())
+
+
 class AggsResponseTree(Tree):
     """
     Tree shaped representation of an ElasticSearch aggregations response.
+
+    Buckets aren't stored as nodes, but in arrays: parent position, level (aggregation) id, key and value of each
+    bucket. Buckets are ordered breadth-first so that children of a bucket are contiguous, and referenced by an
+    offset range. A bucket identifier is its position, ``pandagg.node.response.bucket.Bucket`` nodes are only built
+    when accessed.
+
+    Subtrees share those arrays with the tree they originate from, buckets keeping the same identifiers. Response
+    tree is read-only.
     """
 
     node_class = BucketNode
 
+    # attributes shared between a tree and its subtrees
+    _STORAGE = (
+        "_levels",
+        "_levels_children",
+        "_parents",
+        "_level_ids",
+        "_keys",
+        "_values",
+        "_offsets",
+    )
+
     def __init__(self, aggs, raw_response=None):
         """
         :param aggs: instance of pandagg.agg.Aggs from which this Elasticsearch response originates.
         """
         super(AggsResponseTree, self).__init__()
         self.__aggs = aggs
-        root_node = BucketNode()
-        self.insert_node(root_node)
+        # aggregation name, and children aggregations as (name, node, level id) tuples, per level id (0 is root)
+        self._levels = [None]
+        self._levels_children = [[]]
+        # per bucket, root bucket being at position 0
+        self._parents = array("l", [-1])
+        self._level_ids = array("l", [0])
+        self._keys = [None]
+        self._values = [None]
+        # children of bucket at position i are buckets from position _offsets[i] to _offsets[i + 1] (excluded)
+        self._offsets = array("l", [1, 1])
+        self.root = 0
+        self._nodes_map = _BucketsMap(self)
         if raw_response:
             self.parse(raw_response)
 
     def parse(self, raw_response):
         """
-        Build response tree from ElasticSearch aggregation response
+        Build response tree from ElasticSearch aggregation response, in a single breadth-first pass over its buckets.
 
         :param raw_response: ElasticSearch aggregation response
         :return: self
         """
-        _, agg_root_node = self.__aggs.get(self.__aggs.root)
-        for child_name, child in self.__aggs.children(agg_root_node.identifier):
-            self._parse_node_with_children(
-                child_name, agg_node=child, raw_response=raw_response, pid=self.root
-            )
+        levels, levels_children = self._index_levels()
+        parents = array("l", [-1])
+        level_ids = array("l", [0])
+        keys = [None]
+        values = [None]
+        offsets = array("l")
+        # raw responses of buckets whose children aren't parsed yet, in buckets order
+        pending = deque([raw_response])
+        position = 0
+        while position < len(parents):
+            offsets.append(len(parents))
+            raw_value = pending.popleft()
+            for agg_name, agg_node, level_id in levels_children[level_ids[position]]:
+                has_children = bool(levels_children[level_id])
+                for key, raw_bucket in agg_node.extract_buckets(
+                    raw_value.get(agg_name)
+                ):
+                    parents.append(position)
+                    level_ids.append(level_id)
+                    keys.append(key)
+                    values.append(agg_node.extract_bucket_value(raw_bucket))
+                    pending.append(raw_bucket if has_children else None)
+            position += 1
+        offsets.append(len(parents))
+
+        self._levels, self._levels_children = levels, levels_children
+        self._parents, self._level_ids, self._offsets = parents, level_ids, offsets
+        self._keys, self._values = keys, values
+        self.root = 0
         return self
 
     def bucket_properties(self, bucket, properties=None, end_level=None, depth=None):
         """
-        Recursive method returning a given bucket's properties in the form of an ordered dictionnary.
+        Return a given bucket's properties in the form of an ordered dictionnary.
         Travel from current bucket through all ancestors until reaching root.
 
         :param bucket: instance of pandagg.buckets.buckets.Bucket
@@ -55,14 +138,16 @@ class AggsResponseTree(Tree):
         """
         if properties is None:
             properties = OrderedDict()
-        if bucket.level is not None:
-            properties[bucket.level] = bucket.key
-        if depth is not None:
-            depth -= 1
-        _, parent = self.parent(bucket.identifier)
-        if bucket.level == end_level or depth == 0 or parent is None:
-            return properties
-        return self.bucket_properties(parent, properties, end_level, depth)
+        nid = bucket.identifier
+        while True:
+            level = self._levels[self._level_ids[nid]]
+            if level is not None:
+                properties[level] = self._keys[nid]
+            if depth is not None:
+                depth -= 1
+            if level == end_level or depth == 0 or nid == self.root:
+                return properties
+            nid = self._parents[nid]
 
     def get_bucket_filter(self, nid):
         """
@@ -124,27 +209,116 @@ class AggsResponseTree(Tree):
     def _clone_init(self, deep=False):
         return AggsResponseTree(aggs=self.__aggs.clone(deep=deep))
 
-    def _parse_node_with_children(self, agg_name, agg_node, raw_response, pid):
+    def __contains__(self, nid):
+        if not isinstance(nid, int) or not 0 <= nid < len(self._parents):
+            return False
+        # parents are positioned before their children
+        while nid > self.root:
+            nid = self._parents[nid]
+        return nid == self.root
+
+    def get_key(self, nid):
+        self._ensure_present(nid)
+        if nid == self.root:
+            return None
+        return nid - self._offsets[self._parents[nid]]
+
+    def child_id(self, nid, key, by_path=False):
+        try:
+            position = int(key)
+        except (ValueError, TypeError):
+            raise ValueError("Expected integer key, got %s" % key)
+        return self.children_ids(nid, by_path=by_path)[position]
+
+    def parent_id(self, nid, by_path=False):
+        if by_path:
+            nid = self.get_node_id_by_path(nid)
+        if nid == self.root:
+            raise NotFoundNodeError("Root node has not parent")
+        self._ensure_present(nid)
+        return self._parents[nid]
+
+    def children_ids(self, nid, by_path=False):
+        if by_path:
+            nid = self.get_node_id_by_path(nid)
+        self._ensure_present(nid)
+        return list(range(self._offsets[nid], self._offsets[nid + 1]))
+
+    def subtree(self, nid, deep=False, by_path=False):
+        if by_path:
+            nid = self.get_node_id_by_path(nid)
+        return self.get_key(nid), self.clone(deep=deep, new_root=nid)
+
+    def clone(self, with_nodes=True, deep=False, new_root=None):
+        """
+        Return tree sharing buckets arrays with current one (they are never mutated), rooted on `new_root` bucket
+        if provided.
         """
-        Recursive method to parse ES raw response.
+        new_tree = self._clone_init(deep)
+        if not with_nodes:
+            return new_tree
+        for attr in self._STORAGE:
+            setattr(new_tree, attr, getattr(self, attr))
+        if new_root is not None:
+            new_tree.root = self._ensure_present(new_root)
+        else:
+            new_tree.root = self.root
+        return new_tree
 
-        :param agg_node: current aggregation, pandagg.nodes.AggNode instance
-        :param raw_response: ES response at current level, dict
-        :param pid: parent node identifier
+    def _insert_node_below(self, node, parent_id, key, by_path):
+        raise NotImplementedError(
+            "Response tree is read-only, buckets are built from response by `parse`."
+        )
+
+    def _drop_node(self, nid):
+        raise NotImplementedError(
+            "Response tree is read-only, buckets are built from response by `parse`."
+        )
+
+    def _replace_node(self, nid, node):
+        raise NotImplementedError(
+            "Response tree is read-only, buckets are built from response by `parse`."
+        )
+
+    def _bucket(self, nid):
         """
-        agg_raw_response = raw_response.get(agg_name)
-        for key, raw_value in agg_node.extract_buckets(agg_raw_response):
-            bucket = Bucket(
-                level=agg_name, key=key, value=agg_node.extract_bucket_value(raw_value)
-            )
-            self.insert_node(bucket, parent_id=pid)
-            for child_name, child in self.__aggs.children(agg_node.identifier):
-                self._parse_node_with_children(
-                    child_name,
-                    agg_node=child,
-                    raw_response=raw_value,
-                    pid=bucket.identifier,
-                )
+        Build node of bucket at position `nid`.
+        """
+        if nid == 0:
+            return BucketNode(identifier=0)
+        return Bucket(
+            value=self._values[nid],
+            key=self._keys[nid],
+            level=self._levels[self._level_ids[nid]],
+            identifier=nid,
+        )
+
+    def _iter_ids(self):
+        """
+        Yield identifiers of buckets under root, depth-first.
+        """
+        stack = [self.root]
+        while stack:
+            nid = stack.pop()
+            yield nid
+            stack.extend(range(self._offsets[nid + 1] - 1, self._offsets[nid] - 1, -1))
+
+    def _index_levels(self):
+        """
+        Return aggregation name of each level, and its children aggregations as (name, node, level id) tuples, level
+        ids being attributed breadth-first (0 is root).
+        """
+        levels = [None]
+        levels_children = []
+        agg_ids = [self.__aggs.root]
+        for agg_id in agg_ids:
+            children = []
+            for child_name, child in self.__aggs.children(agg_id):
+                children.append((child_name, child, len(levels)))
+                levels.append(child_name)
+                agg_ids.append(child.identifier)
+            levels_children.append(children)
+        return levels, levels_children
 
     @classmethod
     def _build_filter(
@@ -41,6 +41,8 @@ class DSLMixin(object):
     """Base class for all DSL objects - queries, filters, aggregations etc. Wraps
     a dictionary representing the object's json."""
 
+    __slots__ = ()
+
     @classmethod
     def _get_dsl_class(cls, name):
         try:
@@ -58,6 +60,15 @@ class DSLMixin(object):
             raise ValueError("DSL type %s does not exist." % name)
 
 
+def copy_containers(obj):
+    """Copy nested dicts and lists, other values (considered as immutable) being shared."""
+    if isinstance(obj, dict):
+        return {k: copy_containers(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [copy_containers(v) for v in obj]
+    return obj
+
+
 def ordered(obj):
     if isinstance(obj, dict):
         return sorted((k, ordered(v)) for k, v in obj.items())
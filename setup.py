@@ -22,6 +22,9 @@ develop_requires = [
     "pytest-cov",
     "mock",
     "pandas",
+    "orjson",
+    "pyarrow",
+    "ijson",
 ]
 
 setup(
@@ -39,7 +42,13 @@ setup(
     test_suite="pandagg.tests",
     zip_safe=False,
     install_requires=install_requires,
-    extras_require={"develop": develop_requires},
+    extras_require={
+        "develop": develop_requires,
+        "async": ["elasticsearch[async]>=7.8.0,<8.0.0"],
+        "orjson": ["orjson"],
+        "arrow": ["pyarrow"],
+        "stream": ["ijson"],
+    },
     tests_require=develop_requires,
     license="Apache-2.0",
 )
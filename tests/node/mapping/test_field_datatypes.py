@@ -0,0 +1,170 @@
+import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from pandagg.mappings import Mappings
+from pandagg.node.mappings import (
+    Alias,
+    Boolean,
+    Byte,
+    Date,
+    DateNanos,
+    DateRange,
+    DenseVector,
+    Float,
+    GeoPoint,
+    HalfFloat,
+    IntegerRange,
+    Integer,
+    IP,
+    Keyword,
+    Long,
+    ScaledFloat,
+)
+
+
+class FieldDatatypesTestCase(TestCase):
+    def assertValidValues(self, field, valid, invalid):
+        self.assertEqual(
+            field.validate_values(valid + invalid),
+            [True] * len(valid) + [False] * len(invalid),
+        )
+
+    def test_numeric(self):
+        self.assertValidValues(
+            Integer(),
+            valid=[1, -(2**31), "12", 1.5, np.int64(3), None],
+            invalid=[2**31, True, "a", float("nan"), {"a": 1}],
+        )
+        self.assertValidValues(
+            Integer(coerce=False), valid=[1, 2.0], invalid=["12", 1.5]
+        )
+        self.assertValidValues(Byte(), valid=[127, -128], invalid=[128])
+        self.assertValidValues(Long(), valid=[2**63 - 1], invalid=[2**63])
+        self.assertValidValues(
+            Float(), valid=[1.0, "3.2", 10**38], invalid=[1e39, float("inf")]
+        )
+        self.assertValidValues(HalfFloat(), valid=[65504], invalid=[70000])
+        self.assertValidValues(
+            ScaledFloat(scaling_factor=100), valid=[1.5], invalid=[1e18, "x"]
+        )
+
+    def test_date(self):
+        self.assertValidValues(
+            Date(),
+            valid=[
+                "2020-01-01",
+                "2020-01-01T12:00:00Z",
+                "2020-01-01T12:00:00.123+02:00",
+                1600000000000,
+                "1600000000000",
+                datetime.date(2020, 1, 1),
+            ],
+            invalid=["2020-13-01", "01/02/2020", True],
+        )
+        self.assertValidValues(
+            Date(format="yyyy-MM-dd HH:mm:ss||epoch_second"),
+            valid=["2020-01-01 12:00:00", 1600000000],
+            invalid=["2020-01-01", "2020-01-01 25:00:00"],
+        )
+        self.assertValidValues(
+            Date(format="dd/MM/yyyy"), valid=["01/02/2020"], invalid=["2020-01-01"]
+        )
+        # unsupported java pattern letters: any value is accepted
+        self.assertIsNone(Date(format="yyyy-MM-dd'T'HH:mm:ss.SSSB").value_validator())
+        self.assertValidValues(DateNanos(), valid=["2020-01-01"], invalid=[-5])
+
+    def test_date_epoch_unit(self):
+        self.assertEqual(Date().epoch_unit(), "ms")
+        self.assertEqual(DateNanos().epoch_unit(), "ms")
+        self.assertEqual(Date(format="yyyy-MM-dd||epoch_second").epoch_unit(), "s")
+        self.assertEqual(Date(format="epoch_second||epoch_millis").epoch_unit(), "s")
+        self.assertIsNone(Date(format="yyyy").epoch_unit())
+
+    def test_ranges(self):
+        self.assertValidValues(
+            IntegerRange(),
+            valid=[{"gte": 1, "lt": 10}, {"gt": None}],
+            invalid=[{"gte": "x"}, {"from": 1}, 1],
+        )
+        self.assertValidValues(
+            DateRange(), valid=[{"gte": "2020-01-01"}], invalid=[{"gte": "bad"}]
+        )
+
+    def test_others(self):
+        self.assertValidValues(
+            IP(), valid=["192.168.1.1", "::1"], invalid=["256.1.1.1", 3]
+        )
+        self.assertValidValues(
+            GeoPoint(),
+            valid=[
+                {"lat": 41.12, "lon": -71.34},
+                {"type": "Point", "coordinates": [-71.34, 41.12]},
+                [-71.34, 41.12],
+                "41.12,-71.34",
+                "POINT (-71.34 41.12)",
+                "drm3btev3e86",
+            ],
+            invalid=[{"lat": 100, "lon": 0}, "yolo!"],
+        )
+        self.assertValidValues(Boolean(), valid=[True, "false", ""], invalid=[1, "yes"])
+        self.assertValidValues(Keyword(), valid=["a", 1, False], invalid=[{"a": 1}])
+        self.assertValidValues(
+            DenseVector(dims=2), valid=[[1.0, 2.0]], invalid=[[1.0], ["a", "b"]]
+        )
+        self.assertValidValues(Alias(path="user"), valid=[], invalid=["a"])
+        # malformed values are ignored by elasticsearch
+        self.assertValidValues(Integer(ignore_malformed=True), valid=["a"], invalid=[])
+
+    def test_validate_arrays(self):
+        mask = Integer().validate_values(np.array([1, 2**40]))
+        self.assertIsInstance(mask, np.ndarray)
+        self.assertEqual(mask.tolist(), [True, False])
+
+        values = pd.Series([1.0, np.nan, 1e12], index=["a", "b", "c"])
+        mask = Integer().validate_values(values)
+        self.assertIsInstance(mask, pd.Series)
+        self.assertEqual(mask.to_dict(), {"a": True, "b": True, "c": False})
+
+        mask = Date().validate_values(pd.Series(["2020-01-01", "yolo"]))
+        self.assertEqual(mask.tolist(), [True, False])
+
+        scaled = ScaledFloat(scaling_factor=100)
+        mask = scaled.validate_values(np.array(["1.5", "x"]))
+        self.assertIsInstance(mask, np.ndarray)
+        self.assertEqual(mask.tolist(), [True, False])
+        mask = scaled.validate_values(np.array([1, 2**62]))
+        self.assertEqual(mask.tolist(), [True, False])
+
+    def test_validate_document(self):
+        mappings = Mappings(
+            properties={
+                "location": GeoPoint(multiple=False),
+                "count": Integer(),
+                "created": Date(nullable=False),
+            }
+        )
+        errors = mappings.validate_documents(
+            [
+                {"location": [-71.34, 41.12], "count": [1, 2], "created": "2020-01-01"},
+                {"location": [[-71.34, 41.12]], "created": "2020-01-01"},
+                {"count": "yolo", "created": "2020-01-01"},
+                {"created": "yesterday"},
+            ]
+        )
+        self.assertEqual(
+            [(i, e.args[0]) for i, e in errors],
+            [
+                (1, "Field <location> should not be an array"),
+                (
+                    2,
+                    "Field <count> value <yolo> is not compatible with field of type integer",
+                ),
+                (
+                    3,
+                    "Field <created> value <yesterday> is not compatible with field of type date",
+                ),
+            ],
+        )
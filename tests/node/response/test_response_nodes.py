@@ -8,3 +8,10 @@ class ResponseBucketTestCase(TestCase):
             Bucket(level="windows.color", key="green", value=32).line_repr(depth=5),
             ("windows.color=green", "32"),
         )
+
+    def test_bucket_compact(self):
+        b1 = Bucket(level="windows.color", key="green", value=32)
+        b2 = Bucket(level="windows.color", key="red", value=12)
+        # no per-instance __dict__, and cheap unique identifiers
+        self.assertFalse(hasattr(b1, "__dict__"))
+        self.assertNotEqual(b1.identifier, b2.identifier)
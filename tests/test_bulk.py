@@ -0,0 +1,181 @@
+import json
+
+from mock import patch
+
+from elasticsearch import Elasticsearch
+from elasticsearch.exceptions import TransportError
+
+from pandagg.bulk import BulkIndexer, bulk_index
+from pandagg.mappings import Mappings, Integer, Keyword
+from pandagg.serializer import JSONSerializer
+from tests import PandaggTestCase
+
+
+def bulk_response(body, statuses=None):
+    lines = body.decode("utf-8").splitlines()
+    nb_items = len(lines) // 2
+    statuses = statuses or [201] * nb_items
+    return {
+        "took": 1,
+        "errors": any(s >= 300 for s in statuses),
+        "items": [
+            {
+                "index": {"status": s, "error": {"type": "yolo"}}
+                if s >= 300
+                else {"status": s}
+            }
+            for s in statuses
+        ],
+    }
+
+
+def sent_sources(bulk):
+    sources = []
+    for call in bulk.call_args_list:
+        lines = call[1]["body"].decode("utf-8").splitlines()
+        sources.extend(json.loads(line) for line in lines[1::2])
+    return sources
+
+
+class BulkIndexerTestCase(PandaggTestCase):
+    def setUp(self):
+        self.client = Elasticsearch(hosts=["..."])
+        self.mappings = Mappings(
+            properties={"id": Keyword(nullable=False), "count": Integer()}
+        )
+
+    @patch.object(Elasticsearch, "bulk")
+    def test_index_chunks(self, bulk):
+        bulk.side_effect = lambda index, body: bulk_response(body)
+        documents = ({"id": str(i), "count": i} for i in range(50))
+
+        stats = BulkIndexer(
+            index="yolo",
+            mappings=self.mappings,
+            using=self.client,
+            id_field="id",
+            chunk_docs=20,
+            workers=2,
+            serializer=JSONSerializer(),
+        ).index(documents)
+
+        self.assertEqual(stats.docs, 50)
+        self.assertEqual(stats.indexed, 50)
+        self.assertEqual(stats.errors, [])
+        self.assertEqual(sorted(c.docs for c in stats.chunks), [10, 20, 20])
+        self.assertEqual(bulk.call_count, 3)
+        self.assertEqual(
+            sorted(sent_sources(bulk), key=lambda d: d["count"]),
+            [{"id": str(i), "count": i} for i in range(50)],
+        )
+        for call in bulk.call_args_list:
+            action, source = call[1]["body"].decode("utf-8").splitlines()[:2]
+            self.assertEqual(
+                json.loads(action), {"index": {"_id": json.loads(source)["id"]}}
+            )
+
+    @patch.object(Elasticsearch, "bulk")
+    def test_chunk_bytes(self, bulk):
+        bulk.side_effect = lambda index, body: bulk_response(body)
+        stats = bulk_index(
+            [{"id": "x" * 100}] * 10,
+            index="yolo",
+            using=self.client,
+            chunk_bytes=300,
+            workers=1,
+        )
+        self.assertEqual(stats.indexed, 10)
+        for call in bulk.call_args_list:
+            self.assertLessEqual(len(call[1]["body"]), 300)
+
+    @patch.object(Elasticsearch, "bulk")
+    def test_validation_and_coercion(self, bulk):
+        bulk.side_effect = lambda index, body: bulk_response(body)
+        documents = [
+            {"id": "a", "count": "12"},
+            {"count": 1},
+            {"id": "c", "count": "x"},
+        ]
+
+        stats = bulk_index(
+            documents, index="yolo", mappings=self.mappings, using=self.client
+        )
+        self.assertEqual((stats.docs, stats.indexed, stats.invalid), (3, 1, 2))
+        self.assertEqual([position for position, _ in stats.errors], [1, 2])
+        self.assertEqual(sent_sources(bulk), [{"id": "a", "count": "12"}])
+
+        bulk.reset_mock()
+        stats = bulk_index(
+            documents,
+            index="yolo",
+            mappings=self.mappings,
+            using=self.client,
+            coerce=True,
+        )
+        self.assertEqual(sent_sources(bulk), [{"id": "a", "count": 12}])
+        # provided documents are not mutated
+        self.assertEqual(documents[0], {"id": "a", "count": "12"})
+
+        with self.assertRaises(ValueError):
+            bulk_index(
+                documents,
+                index="yolo",
+                mappings=self.mappings,
+                using=self.client,
+                raise_on_invalid=True,
+            )
+
+    @patch.object(Elasticsearch, "bulk")
+    def test_missing_id(self, bulk):
+        bulk.side_effect = lambda index, body: bulk_response(body)
+        stats = bulk_index(
+            [{"id": "a"}, {"count": 1}, {"id": "c"}],
+            index="yolo",
+            using=self.client,
+            id_field="id",
+        )
+        self.assertEqual((stats.docs, stats.indexed, stats.invalid), (3, 2, 1))
+        self.assertEqual([position for position, _ in stats.errors], [1])
+        self.assertIsInstance(stats.errors[0][1], ValueError)
+        self.assertEqual(sent_sources(bulk), [{"id": "a"}, {"id": "c"}])
+
+    @patch("time.sleep")
+    @patch.object(Elasticsearch, "bulk")
+    def test_retry_rejected(self, bulk, sleep):
+        responses = [
+            lambda body: bulk_response(body, [201, 429, 400]),
+            lambda body: TransportError(429, "es_rejected_execution_exception"),
+            lambda body: bulk_response(body, [201]),
+        ]
+
+        def send(index, body):
+            response = responses.pop(0)(body)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        bulk.side_effect = send
+        stats = bulk_index(
+            [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+            index="yolo",
+            using=self.client,
+            initial_backoff=2,
+            workers=1,
+        )
+        self.assertEqual((stats.indexed, stats.failed, stats.retries), (2, 1, 2))
+        self.assertEqual(stats.errors, [(2, {"type": "yolo"})])
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [2, 4])
+        # only rejected item is sent again
+        self.assertEqual(sent_sources(bulk)[-1], {"id": "b"})
+        self.assertEqual(len(stats.chunks), 1)
+        self.assertEqual(stats.chunks[0].retries, 2)
+
+    @patch("time.sleep")
+    @patch.object(Elasticsearch, "bulk")
+    def test_max_retries(self, bulk, sleep):
+        bulk.side_effect = lambda index, body: bulk_response(body, [429])
+        stats = bulk_index(
+            [{"id": "a"}], index="yolo", using=self.client, max_retries=2
+        )
+        self.assertEqual(bulk.call_count, 3)
+        self.assertEqual((stats.indexed, stats.failed), (0, 1))
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from pandagg.cache import (
+    request_key,
+    LRUCache,
+    DiskCache,
+    SingleFlight,
+    AsyncSingleFlight,
+)
+from tests import PandaggTestCase
+
+
+class CacheTestCase(PandaggTestCase):
+    def test_request_key(self):
+        self.assertEqual(
+            request_key(["i"], {"routing": 1}, {"size": 0, "query": {"a": 1}}),
+            request_key(["i"], {"routing": 1}, {"query": {"a": 1}, "size": 0}),
+        )
+        self.assertNotEqual(
+            request_key(["i"], {}, {"size": 0}), request_key(["j"], {}, {"size": 0})
+        )
+        self.assertNotEqual(
+            request_key(["i"], {}, {"size": 0}),
+            request_key(["i"], {"routing": 1}, {"size": 0}),
+        )
+        self.assertNotEqual(
+            request_key(["i"], {}, {"size": 0}, using="a"),
+            request_key(["i"], {}, {"size": 0}, using="b"),
+        )
+
+    def test_lru_cache_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.set("a", {"took": 1})
+        cache.set("b", {"took": 2})
+        # "a" becomes most recently used
+        self.assertEqual(cache.get("a"), {"took": 1})
+        cache.set("c", {"took": 3})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), {"took": 3})
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(
+            cache.stats(),
+            {
+                "hits": 2,
+                "misses": 1,
+                "hit_ratio": 2.0 / 3,
+                "size": 2,
+                "nbytes": 0,
+                "evictions": 1,
+            },
+        )
+
+    def test_lru_cache_max_bytes(self):
+        cache = LRUCache(max_size=None, max_bytes=25)
+        cache.set("a", {"took": 1})
+        cache.set("b", {"took": 2})
+        self.assertEqual(cache.nbytes, 20)
+        cache.set("c", {"took": 3})
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.nbytes, 20)
+        # too large to be retained
+        cache.set("d", {"took": "x" * 100})
+        self.assertIsNone(cache.get("d"))
+
+    def test_lru_cache_ttl(self):
+        cache = LRUCache(ttl=10)
+        with patch("time.monotonic", return_value=100):
+            cache.set("a", {"took": 1})
+        with patch("time.monotonic", return_value=105):
+            self.assertEqual(cache.get("a"), {"took": 1})
+        with patch("time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_disk_cache(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "cache.sqlite")
+
+        cache = DiskCache(path, ttl=10)
+        with patch("time.time", return_value=100):
+            cache.set("a", {"took": 1})
+        cache.close()
+
+        # persisted
+        cache = DiskCache(path, ttl=10)
+        with patch("time.time", return_value=105):
+            self.assertEqual(cache.get("a"), {"took": 1})
+        with patch("time.time", return_value=111):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        cache.close()
+
+    def test_single_flight_error(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("a", fail)
+        # failed call is not retained
+        self.assertEqual(len(flight), 0)
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+
+    def test_async_single_flight_error(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def run():
+            return await asyncio.gather(
+                flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(len(flight), 0)
+
+    def test_async_single_flight_cancelled_leader(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def run():
+            started, release = asyncio.Event(), asyncio.Event()
+
+            async def fetch():
+                calls.append(1)
+                started.set()
+                await release.wait()
+                return 1
+
+            leader = asyncio.ensure_future(flight.do("a", fetch))
+            await started.wait()
+            waiters = [asyncio.ensure_future(flight.do("a", fetch)) for _ in range(2)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            release.set()
+            return await asyncio.gather(*waiters)
+
+        self.assertEqual(asyncio.run(run()), [1, 1])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(flight), 0)
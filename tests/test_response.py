@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import datetime
+
 from tests import PandaggTestCase
 import pandas as pd
+import pyarrow as pa
 
+from pandagg.mappings import Mappings
 from pandagg.search import Search
 from pandagg.tree.response import AggsResponseTree
 from pandagg.response import Response, Hits, Hit, Aggregations
@@ -89,6 +93,240 @@ class ResponseTestCase(PandaggTestCase):
         self.assertEqual(non_expanded_df.shape, (2, 4))
         self.assertEqual(non_expanded_df.index.tolist(), ["1", "2"])
 
+    def test_hits_sequence(self):
+        hits = Hits(
+            {
+                "total": {"value": 3, "relation": "eq"},
+                "max_score": 1.0,
+                "hits": [
+                    {
+                        "_id": str(i),
+                        "_score": 1.0 / (i + 1),
+                        "_source": {
+                            "price": i * 10,
+                            "user.name": "user_%d" % i,
+                            "tags": [{"name": "a"}, {"name": "b"}] if i else [],
+                        },
+                    }
+                    for i in range(3)
+                ],
+            }
+        )
+        self.assertEqual(len(hits), 3)
+        hit = hits[-1]
+        self.assertIsInstance(hit, Hit)
+        self.assertEqual((hit._id, hit._score), ("2", 1.0 / 3))
+        self.assertFalse(hasattr(hit, "__dict__"))
+
+        sliced = hits[1:]
+        self.assertIsInstance(sliced, Hits)
+        self.assertEqual([h._id for h in sliced], ["1", "2"])
+        self.assertEqual(sliced.total, hits.total)
+        self.assertEqual(sliced.to_dataframe().index.tolist(), ["1", "2"])
+        self.assertEqual(len(hits), 3)
+
+        self.assertEqual(hits.column("_id"), ["0", "1", "2"])
+        self.assertEqual(hits.column("_source.price"), [0, 10, 20])
+        self.assertEqual(
+            hits.column("_source.user.name"), ["user_0", "user_1", "user_2"]
+        )
+        self.assertEqual(
+            hits.column("_source.tags.name"), [None, ["a", "b"], ["a", "b"]]
+        )
+        self.assertEqual(hits.column("_source.yolo", default=0), [0, 0, 0])
+
+    def test_hits_to_dataframe_dtypes(self):
+        hits = Hits(
+            {
+                "total": {"value": 4, "relation": "eq"},
+                "max_score": 1.0,
+                "hits": [
+                    {
+                        "_id": str(i),
+                        "_source": {
+                            "genre": "Drama" if i % 2 else "Short",
+                            "name": "movie %d" % i,
+                            "year": None if i == 3 else 1990 + i,
+                            "released": "199%d-03-01" % i,
+                            "rank": "high" if i == 3 else 6.5,
+                            "adult": bool(i % 2),
+                        },
+                    }
+                    for i in range(4)
+                ],
+            },
+            mappings=Mappings(
+                properties={
+                    "genre": {"type": "keyword"},
+                    "name": {"type": "keyword"},
+                    "year": {"type": "integer"},
+                    "released": {"type": "date"},
+                    "rank": {"type": "float", "ignore_malformed": True},
+                    "adult": {"type": "boolean"},
+                }
+            ),
+        )
+        dtypes = hits.to_dataframe().dtypes
+        self.assertEqual(dtypes["genre"], "category")
+        # high cardinality
+        self.assertNotEqual(dtypes["name"], "category")
+        self.assertEqual(dtypes["year"], "Int32")
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(dtypes["released"]))
+        # malformed value: dtype is inferred
+        self.assertEqual(dtypes["rank"], object)
+        self.assertEqual(dtypes["adult"], "boolean")
+        # without mappings
+        self.assertEqual(Hits(hits.data).to_dataframe().dtypes["year"], "float64")
+
+    def test_hits_to_dataframe_epoch_dates(self):
+        hits = Hits(
+            {
+                "total": {"value": 1, "relation": "eq"},
+                "max_score": 1.0,
+                "hits": [
+                    {
+                        "_id": "0",
+                        "_source": {
+                            "millis": 1600000000000,
+                            "seconds": 1600000000,
+                            "year": 2020,
+                        },
+                    }
+                ],
+            },
+            mappings=Mappings(
+                properties={
+                    "millis": {"type": "date"},
+                    "seconds": {"type": "date", "format": "epoch_second"},
+                    "year": {"type": "date", "format": "yyyy"},
+                }
+            ),
+        )
+        row = hits.to_dataframe().loc["0"]
+        self.assertEqual(row["millis"], pd.Timestamp("2020-09-13 12:26:40", tz="UTC"))
+        self.assertEqual(row["seconds"], pd.Timestamp("2020-09-13 12:26:40", tz="UTC"))
+        # numeric values aren't epoch timestamps in this format: dtype is inferred
+        self.assertEqual(row["year"], 2020)
+
+    def test_hits_to_arrow(self):
+        hits = Hits(
+            {
+                "total": {"value": 2, "relation": "eq"},
+                "max_score": 1.0,
+                "hits": [
+                    {
+                        "_index": "movies",
+                        "_id": "1",
+                        "_score": 1.0,
+                        "_source": {
+                            "genres": ["Drama", "Short"],
+                            "year": 1984,
+                            "released": "1984-03-01",
+                            "rank": 6.5,
+                        },
+                    },
+                    {
+                        "_index": "movies",
+                        "_id": "2",
+                        "_score": 0.5,
+                        "_source": {
+                            "genres": "Drama",
+                            "released": "2004-05-01T10:00:00+02:00",
+                            "year": "malformed",
+                        },
+                    },
+                ],
+            },
+            mappings=Mappings(
+                properties={
+                    "genres": {"type": "keyword"},
+                    "released": {"type": "date"},
+                    "rank": {"type": "float"},
+                    "year": {"type": "long"},
+                }
+            ),
+        )
+        table = hits.to_arrow()
+        self.assertIsInstance(table, pa.Table)
+        self.assertEqual(
+            table.column_names, ["_id", "genres", "year", "released", "rank"]
+        )
+        self.assertEqual(
+            table.schema.field("genres").type,
+            pa.list_(pa.dictionary(pa.int32(), pa.string())),
+        )
+        self.assertEqual(
+            table.schema.field("released").type, pa.timestamp("ms", tz="UTC")
+        )
+        self.assertEqual(table.schema.field("rank").type, pa.float32())
+        # malformed value: type is inferred
+        self.assertEqual(table.schema.field("year").type, pa.string())
+        self.assertEqual(
+            [d.isoformat() for d in table.column("released").to_pylist()],
+            ["1984-03-01T00:00:00+00:00", "2004-05-01T08:00:00+00:00"],
+        )
+        self.assertEqual(
+            table.column("genres").to_pylist(), [["Drama", "Short"], ["Drama"]]
+        )
+
+        self.assertEqual(
+            hits.to_arrow(source_only=False).column_names[-2:], ["_index", "_score"]
+        )
+        self.assertEqual(
+            hits.to_arrow(expand_source=False).column_names,
+            ["_index", "_id", "_score", "_source"],
+        )
+        self.assertEqual(Hits({"total": 0, "max_score": None}).to_arrow().num_rows, 0)
+
+        df = hits.to_dataframe(dtype_backend="pyarrow")
+        self.assertEqual(df.index.tolist(), ["1", "2"])
+        self.assertEqual(df["year"].dtype, pd.ArrowDtype(pa.string()))
+        with self.assertRaises(ValueError):
+            hits.to_dataframe(dtype_backend="yolo")
+
+    def test_hits_to_arrow_epoch_dates(self):
+        hits = Hits(
+            {
+                "total": {"value": 1, "relation": "eq"},
+                "max_score": 1.0,
+                "hits": [
+                    {
+                        "_id": "0",
+                        "_source": {
+                            "millis": 1600000000000,
+                            "seconds": 1600000000,
+                            "nanos": 1600000000000,
+                            "year": 2020,
+                        },
+                    }
+                ],
+            },
+            mappings=Mappings(
+                properties={
+                    "millis": {"type": "date"},
+                    "seconds": {"type": "date", "format": "epoch_second"},
+                    "nanos": {"type": "date_nanos"},
+                    "year": {"type": "date", "format": "yyyy"},
+                }
+            ),
+        )
+        table = hits.to_arrow()
+        expected = datetime.datetime(
+            2020, 9, 13, 12, 26, 40, tzinfo=datetime.timezone.utc
+        )
+        for name in ("millis", "seconds"):
+            self.assertEqual(
+                table.schema.field(name).type, pa.timestamp("ms", tz="UTC")
+            )
+            self.assertEqual(table.column(name).to_pylist(), [expected])
+        self.assertEqual(table.schema.field("nanos").type, pa.timestamp("ns", tz="UTC"))
+        self.assertEqual(
+            table.column("nanos").cast(pa.timestamp("ms", tz="UTC")).to_pylist(),
+            [expected],
+        )
+        # numeric values aren't epoch timestamps in this format: type is inferred
+        self.assertEqual(table.schema.field("year").type, pa.int64())
+
     def test_response(self):
         r = Response(
             {
@@ -319,6 +557,179 @@ class AggregationsResponseTestCase(PandaggTestCase):
             },
         )
 
+    def test_parse_as_dataframe_columnar(self):
+        my_agg = Aggs(
+            {
+                "A": {
+                    "terms": {"field": "a"},
+                    "aggs": {
+                        "F": {
+                            "filter": {"term": {"f": 1}},
+                            "aggs": {
+                                "B": {
+                                    "terms": {"field": "b"},
+                                    "aggs": {"C": {"terms": {"field": "c"}}},
+                                }
+                            },
+                        }
+                    },
+                }
+            }
+        )
+        raw_response = {
+            "A": {
+                "buckets": [
+                    {
+                        "key": "x",
+                        "doc_count": 3,
+                        "F": {"doc_count": 0, "B": {"buckets": []}},
+                    },
+                    {
+                        "key": "y",
+                        "doc_count": 5,
+                        "F": {
+                            "doc_count": 4,
+                            "B": {
+                                "buckets": [
+                                    {
+                                        "key": "u",
+                                        "doc_count": 3,
+                                        "C": {"buckets": [{"key": 1, "doc_count": 3}]},
+                                    },
+                                    {
+                                        "key": "v",
+                                        "doc_count": 1,
+                                        "C": {"buckets": [{"key": 2, "doc_count": 1}]},
+                                    },
+                                ]
+                            },
+                        },
+                    },
+                ]
+            }
+        }
+        aggregations = Aggregations(data=raw_response, search=Search().aggs(my_agg))
+        df = aggregations.to_dataframe(grouped_by="B")
+        self.assertEqual(df.index.names, ["A", "B"])
+        self.assertEqual(list(df.columns), ["doc_count", "C|1", "C|2"])
+        self.assertEqual(
+            df.fillna(0).to_dict(orient="index"),
+            {
+                ("y", "u"): {"doc_count": 3, "C|1": 3, "C|2": 0},
+                ("y", "v"): {"doc_count": 1, "C|1": 0, "C|2": 1},
+            },
+        )
+        self.assertEqual(
+            aggregations.to_tabular(grouped_by="B", with_single_bucket_groups=True),
+            (
+                ["A", "F", "B"],
+                {
+                    ("y", None, "u"): {"doc_count": 3, "C|1": 3},
+                    ("y", None, "v"): {"doc_count": 1, "C|2": 1},
+                },
+            ),
+        )
+
+    def test_parse_as_dataframe_dtypes(self):
+        search = (
+            Search(mappings={"properties": {"date": {"type": "date"}}})
+            .groupby("per_day", "date_histogram", field="date", fixed_interval="1d")
+            .agg("C", "terms", field="date")
+        )
+        raw_response = {
+            "per_day": {
+                "buckets": [
+                    {
+                        "key_as_string": "2020-01-0%dT00:00:00.000Z" % day,
+                        "key": 0,
+                        "doc_count": day,
+                        "C": {
+                            "buckets": [{"key": 0, "doc_count": 1}] if day == 1 else []
+                        },
+                    }
+                    for day in (1, 2)
+                ]
+            }
+        }
+        df = Aggregations(raw_response, search=search).to_dataframe()
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df.index.levels[0]))
+        self.assertEqual(df.index.levels[0][1].isoformat(), "2020-01-02T00:00:00+00:00")
+        # counts are nullable integers
+        self.assertEqual(df.dtypes.to_dict(), {"doc_count": "Int64", "C|0": "Int64"})
+        self.assertEqual(df["C|0"].tolist(), [1, pd.NA])
+
+    def test_parse_as_arrow(self):
+        aggregations = Aggregations(
+            data=sample.ES_AGG_RESPONSE,
+            search=Search(mappings=MAPPINGS).aggs(sample.EXPECTED_AGG_QUERY),
+        )
+        table = aggregations.serialize(
+            output="arrow", grouped_by="global_metrics.field.name"
+        )
+        self.assertIsInstance(table, pa.Table)
+        self.assertEqual(
+            table.column_names,
+            [
+                "classification_type",
+                "global_metrics.field.name",
+                "doc_count",
+                "avg_f1_micro",
+                "avg_nb_classes",
+            ],
+        )
+        self.assertEqual(
+            table.schema.field("classification_type").type,
+            pa.dictionary(pa.int32(), pa.string()),
+        )
+        self.assertEqual(table.column("doc_count").to_pylist(), [128, 76, 370, 198])
+
+        df = aggregations.to_dataframe(
+            grouped_by="global_metrics.field.name", dtype_backend="pyarrow"
+        )
+        self.assertEqual(
+            df.index.names, ["classification_type", "global_metrics.field.name"]
+        )
+        self.assertEqual(
+            df.to_dict(orient="index"),
+            aggregations.to_dataframe(grouped_by="global_metrics.field.name").to_dict(
+                orient="index"
+            ),
+        )
+
+        date_aggregations = Aggregations(
+            data={
+                "per_day": {
+                    "buckets": [
+                        {
+                            "key_as_string": "2020-01-01T00:00:00.000Z",
+                            "key": 1577836800000,
+                            "doc_count": 2,
+                            "C": {"buckets": [{"key": "x", "doc_count": 2}]},
+                        },
+                        {
+                            "key_as_string": "2020-01-02T00:00:00.000Z",
+                            "key": 1577923200000,
+                            "doc_count": 1,
+                            "C": {"buckets": [{"key": "y", "doc_count": 1}]},
+                        },
+                    ]
+                }
+            },
+            search=Search().agg(
+                "per_day",
+                "date_histogram",
+                field="date",
+                fixed_interval="1d",
+                aggs={"C": {"terms": {"field": "c"}}},
+            ),
+        )
+        table = date_aggregations.to_arrow(grouped_by="per_day")
+        self.assertEqual(table.column_names, ["per_day", "doc_count", "C|x", "C|y"])
+        self.assertEqual(
+            table.schema.field("per_day").type, pa.timestamp("ms", tz="UTC")
+        )
+        self.assertEqual(table.column("C|y").to_pylist(), [None, 1])
+
     def test_grouping_agg(self):
         my_agg = Aggs(sample.EXPECTED_AGG_QUERY, mappings=MAPPINGS)
         agg_response = Aggregations(
@@ -338,3 +749,33 @@ class AggregationsResponseTestCase(PandaggTestCase):
             agg_response._grouping_agg("global_metrics.field.name")[0],
             "global_metrics.field.name",
         )
+
+    def test_parse_group_by_with_sibling_bucket_aggs(self):
+        my_agg = Aggs(
+            {
+                "A": {
+                    "terms": {"field": "a"},
+                    "aggs": {
+                        "C": {"terms": {"field": "c"}},
+                        "B": {"terms": {"field": "b"}},
+                    },
+                }
+            }
+        )
+        raw_response = {
+            "A": {
+                "buckets": [
+                    {
+                        "key": "x",
+                        "doc_count": 2,
+                        "C": {"buckets": [{"key": "z", "doc_count": 2}]},
+                        "B": {"buckets": [{"key": "y", "doc_count": 1}]},
+                    }
+                ]
+            }
+        }
+        agg_response = Aggregations(data=raw_response, search=Search().aggs(my_agg))
+        self.assertEqual(
+            list(agg_response._parse_group_by(raw_response, until="B")),
+            [({"A": "x", "B": "y"}, {"key": "y", "doc_count": 1})],
+        )
@@ -1,11 +1,21 @@
+import asyncio
+import datetime
+import json
+import threading
+import time
 from copy import deepcopy
 
-from mock import patch
+from mock import patch, AsyncMock, Mock
 
 from elasticsearch import Elasticsearch
+from elasticsearch.exceptions import TransportError
 
+from pandagg.cache import LRUCache, _Call
+from pandagg.connections import connections
 from pandagg.node import Max
-from pandagg.search import Search
+from pandagg.response import Response
+from pandagg.search import Search, MultiSearch, AsyncSearch, AsyncMultiSearch
+from pandagg.serializer import JSONSerializer, OrjsonSerializer
 from pandagg.query import Query, Bool, Match
 from pandagg.tree import Mappings
 from pandagg.utils import ordered
@@ -398,6 +408,167 @@ class SearchTestCase(PandaggTestCase):
             "_source": ["id", "name"],
         } == s.to_dict()
 
+    def test_from_dict_lazy(self):
+        d = {
+            "query": {
+                "bool": {
+                    "must": [{"match": {"title": "python"}}],
+                    "filter": {"range": {"year": {"gte": 2010}}},
+                }
+            },
+            "aggs": {"per_tag": {"terms": {"field": "tag"}}},
+            "size": 5,
+        }
+        s = Search.from_dict(d, lazy=True)
+        # untouched parts are passed through
+        self.assertEqual(s.to_dict(), d)
+        self.assertIsNotNone(s._raw_aggs)
+        # serialized aggregations aren't shared with caller's body, nor between searches
+        s.to_dict()["aggs"]["per_tag"]["terms"]["field"] = "yolo"
+        d["aggs"]["per_tag"]["terms"]["size"] = 3
+        self.assertEqual(s.to_dict()["aggs"], {"per_tag": {"terms": {"field": "tag"}}})
+        del d["aggs"]["per_tag"]["terms"]["size"]
+        # same for serialized query
+        s.to_dict()["query"]["bool"]["must"].append({"term": {"user": 1}})
+        d["query"]["bool"]["filter"]["range"]["year"]["gte"] = 2000
+        self.assertEqual(
+            s.to_dict()["query"],
+            {
+                "bool": {
+                    "must": [{"match": {"title": "python"}}],
+                    "filter": {"range": {"year": {"gte": 2010}}},
+                }
+            },
+        )
+        d["query"]["bool"]["filter"]["range"]["year"]["gte"] = 2010
+        s_post = Search.from_dict({"post_filter": d["query"]}, lazy=True)
+        d["query"]["bool"]["must"].append({"term": {"user": 1}})
+        self.assertEqual(
+            s_post.to_dict()["post_filter"]["bool"]["must"],
+            [{"match": {"title": "python"}}],
+        )
+        d["query"]["bool"]["must"].pop()
+
+        # only bool root clause is expanded
+        s2 = s.filter("term", tenant=1)
+        self.assertEqual(
+            sorted(n.__class__.__name__ for _, n in s2._query.list()),
+            ["Bool", "Filter", "Must", "RawClause", "RawClause", "Term"],
+        )
+        self.assertEqual(
+            s2.to_dict(),
+            {
+                "query": {
+                    "bool": {
+                        "must": [{"match": {"title": "python"}}],
+                        "filter": [
+                            {"range": {"year": {"gte": 2010}}},
+                            {"term": {"tenant": {"value": 1}}},
+                        ],
+                    }
+                },
+                "aggs": {"per_tag": {"terms": {"field": "tag"}}},
+                "size": 5,
+            },
+        )
+        self.assertEqual(s.to_dict(), d)
+
+        # aggregations are parsed when required
+        s3 = s.agg("avg_year", "avg", field="year", insert_below="per_tag")
+        self.assertIsNone(s3._raw_aggs)
+        self.assertEqual(
+            s3.to_dict()["aggs"],
+            {
+                "per_tag": {
+                    "terms": {"field": "tag"},
+                    "aggs": {"avg_year": {"avg": {"field": "year"}}},
+                }
+            },
+        )
+        self.assertIsNotNone(s._raw_aggs)
+
+    def test_batch(self):
+        s = Search().filter("term", user=0)
+        s_dict = s.to_dict()
+        with s.batch() as b:
+            for i in range(1, 4):
+                self.assertIs(b.filter("term", user=i), b)
+            b.agg("per_tag", "terms", field="tag")
+            b.source(["user"])
+        # working copy is frozen
+        self.assertIsNot(b.size(2), b)
+        self.assertFalse(b._query._in_place)
+        self.assertEqual(s.to_dict(), s_dict)
+        self.assertEqual(
+            b.to_dict(),
+            Search()
+            .filter("term", user=0)
+            .filter("term", user=1)
+            .filter("term", user=2)
+            .filter("term", user=3)
+            .agg("per_tag", "terms", field="tag")
+            .source(["user"])
+            .to_dict(),
+        )
+
+    @patch.object(Elasticsearch, "search")
+    def test_batch_execution(self, client_search):
+        client_search.return_value = {
+            "took": 1,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": 0, "relation": "eq"}, "max_score": None},
+            "aggregations": {"per_user": {"buckets": []}},
+        }
+        s = Search(using=Elasticsearch(hosts=["..."]))
+        with s.batch() as b:
+            b.filter("term", user=1).agg(
+                "per_user",
+                "composite",
+                sources=[{"user": {"terms": {"field": "user"}}}],
+            )
+            # requests executed on behalf of working copy don't modify it
+            self.assertEqual(list(b.iter_composite()), [])
+            self.assertEqual(client_search.call_args[1]["body"]["size"], 0)
+            copy = b._unbatched()
+            self.assertIsNot(copy, b)
+            copy.filter("term", user=2)
+            self.assertNotIn("size", b.to_dict())
+            # working copy is still modified in place
+            self.assertIs(b.filter("term", user=3), b)
+        self.assertEqual(
+            b.to_dict()["query"],
+            {
+                "bool": {
+                    "filter": [
+                        {"term": {"user": {"value": 1}}},
+                        {"term": {"user": {"value": 3}}},
+                    ]
+                }
+            },
+        )
+
+    def test_apply(self):
+        s = Search(index="yolo")
+        applied = s.apply(
+            [
+                ("filter", ("term",), {"user": 1}),
+                ("size", (0,)),
+                ("agg", ("per_tag", "terms"), {"field": "tag"}),
+                lambda s: s.params(routing=2),
+            ]
+        )
+        self.assertEqual(s.to_dict(), {})
+        self.assertEqual(
+            applied.to_dict(),
+            Search()
+            .filter("term", user=1)
+            .size(0)
+            .agg("per_tag", "terms", field="tag")
+            .params(routing=2)
+            .to_dict(),
+        )
+
     @patch.object(Elasticsearch, "search")
     def test_repr_execution(self, client_search):
         client_search.return_value = {
@@ -490,3 +661,574 @@ class SearchTestCase(PandaggTestCase):
             },
             index=["yolo"],
         )
+
+    @patch.object(Elasticsearch, "search")
+    def test_iter_composite(self, client_search):
+        def page(buckets, after_key=None):
+            composite = {"buckets": buckets}
+            if after_key is not None:
+                composite["after_key"] = after_key
+            return {
+                "took": 1,
+                "timed_out": False,
+                "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+                "hits": {"total": {"value": 3, "relation": "eq"}, "max_score": None},
+                "aggregations": {"per_user": composite},
+            }
+
+        pages = [
+            page(
+                [
+                    {"key": {"user": "a"}, "doc_count": 1, "avg_price": {"value": 1.0}},
+                    {"key": {"user": "b"}, "doc_count": 2, "avg_price": {"value": 2.0}},
+                ],
+                after_key={"user": "b"},
+            ),
+            page(
+                [{"key": {"user": "c"}, "doc_count": 3, "avg_price": {"value": 3.0}}],
+                after_key={"user": "c"},
+            ),
+            page([]),
+        ]
+        s = (
+            Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+            .agg(
+                "per_user",
+                "composite",
+                sources=[{"user": {"terms": {"field": "user"}}}],
+            )
+            .agg("avg_price", "avg", field="price", insert_below="per_user")
+        )
+
+        for prefetch in (False, True):
+            client_search.reset_mock()
+            client_search.side_effect = deepcopy(pages)
+            rows = list(s.iter_composite(size=2, prefetch=prefetch))
+            self.assertEqual(
+                rows,
+                [
+                    {"per_user": {"user": "a"}, "doc_count": 1, "avg_price": 1.0},
+                    {"per_user": {"user": "b"}, "doc_count": 2, "avg_price": 2.0},
+                    {"per_user": {"user": "c"}, "doc_count": 3, "avg_price": 3.0},
+                ],
+            )
+            self.assertEqual(client_search.call_count, 3)
+            afters = [
+                c[1]["body"]["aggs"]["per_user"]["composite"].get("after")
+                for c in client_search.call_args_list
+            ]
+            self.assertEqual(afters, [None, {"user": "b"}, {"user": "c"}])
+            self.assertEqual(
+                client_search.call_args_list[0][1]["body"]["size"],
+                0,
+            )
+
+        # initial search is left untouched
+        self.assertNotIn("after", s.to_dict()["aggs"]["per_user"]["composite"])
+
+        client_search.side_effect = deepcopy(pages)
+        chunks = list(s.iter_composite(chunked=True))
+        self.assertEqual(len(chunks), 2)
+        index_names, rows = chunks[1]
+        self.assertEqual(index_names, ["per_user"])
+        self.assertEqual(len(rows), 1)
+
+    def test_sliced_scan(self):
+        opened, closed = [], []
+
+        def fake_scan(client, query, index):
+            slice_id = query["slice"]["id"]
+            self.assertEqual(query["slice"]["max"], 3)
+            self.assertEqual(query["query"], {"term": {"user": {"value": 1}}})
+            opened.append(slice_id)
+            try:
+                for i in range(50):
+                    yield {"_id": "%d-%d" % (slice_id, i)}
+            finally:
+                closed.append(slice_id)
+
+        s = Search(using=Elasticsearch(hosts=["..."]), index="yolo").query(
+            "term", user=1
+        )
+        with patch("pandagg.search.scan", fake_scan):
+            hits = list(s.scan(slices=3, workers=2, buffer_size=10))
+            self.assertEqual(len(hits), 150)
+            self.assertEqual(len({h["_id"] for h in hits}), 150)
+            self.assertEqual(sorted(opened), [0, 1, 2])
+            self.assertEqual(sorted(closed), [0, 1, 2])
+
+            # early exit: opened scroll contexts are cleared
+            opened[:], closed[:] = [], []
+            hits = s.scan(slices=3, buffer_size=5)
+            next(hits)
+            hits.close()
+            self.assertEqual(sorted(opened), sorted(closed))
+
+    def test_sliced_scan_error(self):
+        def failing_scan(client, query, index):
+            if query["slice"]["id"] == 1:
+                raise ValueError("boom")
+            yield {"_id": "1"}
+
+        s = Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+        with patch("pandagg.search.scan", failing_scan):
+            with self.assertRaises(ValueError):
+                list(s.scan(slices=2))
+
+    @patch.object(Elasticsearch, "close_point_in_time")
+    @patch.object(Elasticsearch, "search")
+    @patch.object(Elasticsearch, "open_point_in_time")
+    def test_iter_pages(self, open_pit, client_search, close_pit):
+        def page(ids, pit_id):
+            return {
+                "took": 1,
+                "timed_out": False,
+                "pit_id": pit_id,
+                "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+                "hits": {
+                    "total": {"value": 5, "relation": "eq"},
+                    "max_score": None,
+                    "hits": [
+                        {"_id": str(i), "_score": None, "sort": [i, i]} for i in ids
+                    ],
+                },
+            }
+
+        open_pit.return_value = {"id": "pit-0"}
+        client_search.side_effect = [
+            page([0, 1], "pit-1"),
+            page([2, 3], "pit-2"),
+            page([4], "pit-3"),
+        ]
+        s = (
+            Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+            .sort("date")
+            .params(from_=10)
+        )
+        pages = list(s.iter_pages(page_size=2, pit_keep_alive="2m"))
+
+        self.assertEqual(
+            [[h._id for h in p.hits] for p in pages], [["0", "1"], ["2", "3"], ["4"]]
+        )
+        open_pit.assert_called_once_with(index=["yolo"], keep_alive="2m")
+        self.assertEqual(
+            [c[1]["body"] for c in client_search.call_args_list],
+            [
+                {
+                    "sort": ["date", {"_shard_doc": "asc"}],
+                    "size": 2,
+                    "pit": {"id": "pit-0", "keep_alive": "2m"},
+                },
+                {
+                    "sort": ["date", {"_shard_doc": "asc"}],
+                    "size": 2,
+                    "pit": {"id": "pit-1", "keep_alive": "2m"},
+                    "search_after": [1, 1],
+                },
+                {
+                    "sort": ["date", {"_shard_doc": "asc"}],
+                    "size": 2,
+                    "pit": {"id": "pit-2", "keep_alive": "2m"},
+                    "search_after": [3, 3],
+                },
+            ],
+        )
+        close_pit.assert_called_once_with(body={"id": "pit-3"})
+
+        # point in time is closed on early exit
+        close_pit.reset_mock()
+        client_search.side_effect = [page([0, 1], "pit-1")]
+        pages = s.iter_pages(page_size=2)
+        next(pages)
+        pages.close()
+        close_pit.assert_called_once_with(body={"id": "pit-1"})
+
+        # single sort clause, as provided in a raw body
+        for sort in ("date", {"date": "desc"}):
+            self.assertEqual(
+                Search.from_dict({"sort": sort})._pages_body(2)["sort"],
+                [sort, {"_shard_doc": "asc"}],
+            )
+
+    @patch.object(Elasticsearch, "search")
+    def test_execute_cache(self, client_search):
+        client_search.return_value = {
+            "took": 1,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": 0, "relation": "eq"}, "max_score": None},
+        }
+        cache = LRUCache()
+        s = Search(using=Elasticsearch(hosts=["..."]), index="yolo", cache=cache)
+        r1 = s.filter("term", user=1).execute()
+        r2 = s.filter("term", user=1).execute()
+        self.assertIsInstance(r2, Response)
+        self.assertIsNot(r1, r2)
+        self.assertEqual(client_search.call_count, 1)
+        s.filter("term", user=2).execute()
+        self.assertEqual(client_search.call_count, 2)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+        # disabled
+        s.cache(False).filter("term", user=1).execute()
+        self.assertEqual(client_search.call_count, 3)
+
+        # cache shared between clients of different clusters
+        other = Search(using=Elasticsearch(hosts=["other"]), index="yolo", cache=cache)
+        other.filter("term", user=1).execute()
+        self.assertEqual(client_search.call_count, 4)
+        Search(using=Elasticsearch(hosts=["..."]), index="yolo", cache=cache).filter(
+            "term", user=1
+        ).execute()
+        self.assertEqual(client_search.call_count, 4)
+
+        # per connection alias
+        client_search.reset_mock()
+        alias_cache = LRUCache()
+        connections.add_connection("cached", Elasticsearch(hosts=["..."]))
+        connections.set_cache("cached", alias_cache)
+        self.addCleanup(connections.remove_connection, "cached")
+        self.addCleanup(connections.set_cache, "cached", None)
+        Search(using="cached").execute()
+        Search(using="cached").execute()
+        self.assertEqual(client_search.call_count, 1)
+        self.assertEqual(alias_cache.hits, 1)
+
+    def test_execute_coalesce(self):
+        # released each time a caller starts waiting for the in-flight request
+        waiting = threading.Semaphore(0)
+
+        class WaitedEvent(threading.Event):
+            def wait(self, timeout=None):
+                waiting.release()
+                return super(WaitedEvent, self).wait(timeout)
+
+        class WaitedCall(_Call):
+            def __init__(self):
+                super(WaitedCall, self).__init__()
+                self.event = WaitedEvent()
+
+        def raw_response():
+            return {
+                "took": 1,
+                "timed_out": False,
+                "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+                "hits": {
+                    "total": {"value": 0, "relation": "eq"},
+                    "max_score": None,
+                    "hits": [],
+                },
+            }
+
+        def slow_search(index, body):
+            # in-flight request completes once all other callers wait for it
+            for _ in range(4):
+                waiting.acquire(timeout=5)
+            return raw_response()
+
+        client = Mock()
+        client.search = Mock(side_effect=slow_search)
+        s = Search(using=client, index="yolo").filter("term", user=1).coalesce()
+
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(s.execute()))
+            for _ in range(5)
+        ]
+        with patch("pandagg.cache._Call", WaitedCall):
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(client.search.call_count, 1)
+        self.assertEqual(len(responses), 5)
+        self.assertEqual(len(set(id(r) for r in responses)), 5)
+
+        # not coalesced by default
+        client.search.reset_mock()
+        client.search.side_effect = lambda index, body: raw_response()
+        s.coalesce(False).execute()
+        Search(using=client, index="yolo").execute()
+        self.assertEqual(client.search.call_count, 2)
+
+
+class AsyncSearchTestCase(PandaggTestCase):
+    def setUp(self):
+        patcher = patch("uuid.uuid4", side_effect=range(1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _raw_response(hits=None):
+        return {
+            "took": 1,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {
+                "total": {"value": len(hits or []), "relation": "eq"},
+                "max_score": 1.0,
+                "hits": hits or [],
+            },
+        }
+
+    def test_async_search_shares_builders(self):
+        s = AsyncSearch(index="yolo").filter("term", user=1).size(0)
+        self.assertIsInstance(s, AsyncSearch)
+        self.assertEqual(
+            s.to_dict(),
+            Search(index="yolo").filter("term", user=1).size(0).to_dict(),
+        )
+
+    def test_async_execute(self):
+        client = Mock()
+        client.search = AsyncMock(
+            return_value=self._raw_response(
+                [{"_id": "1", "_score": 1.0, "_source": {"a": 1}}]
+            )
+        )
+        s = AsyncSearch(using=client, index="yolo").size(1)
+
+        response = asyncio.run(s.execute())
+        self.assertIsInstance(response, Response)
+        self.assertEqual(len(response.hits), 1)
+        client.search.assert_awaited_once_with(body={"size": 1}, index=["yolo"])
+
+        async def collect():
+            return [hit async for hit in s]
+
+        hits = asyncio.run(collect())
+        self.assertEqual([h._id for h in hits], ["1"])
+
+    def test_async_execute_coalesce(self):
+        async def slow_search(index, body):
+            await asyncio.sleep(0.01)
+            return self._raw_response()
+
+        client = Mock()
+        client.search = AsyncMock(side_effect=slow_search)
+        s = AsyncSearch(using=client, index="yolo").coalesce()
+
+        async def run():
+            return await asyncio.gather(*[s.execute() for _ in range(5)])
+
+        responses = asyncio.run(run())
+        self.assertEqual(client.search.await_count, 1)
+        self.assertEqual(len(set(id(r) for r in responses)), 5)
+
+    def test_async_count_and_delete(self):
+        client = Mock()
+        client.count = AsyncMock(return_value={"count": 42})
+        client.delete_by_query = AsyncMock(return_value={"deleted": 42})
+        s = AsyncSearch(using=client, index="yolo").filter("term", user=1)
+
+        self.assertEqual(asyncio.run(s.count()), 42)
+        client.count.assert_awaited_once_with(
+            body={"query": {"bool": {"filter": [{"term": {"user": {"value": 1}}}]}}},
+            index=["yolo"],
+        )
+        self.assertEqual(asyncio.run(s.delete()), {"deleted": 42})
+
+    def test_async_scan(self):
+        async def fake_async_scan(client, query, index):
+            self.assertEqual(index, ["yolo"])
+            for i in range(3):
+                yield {"_id": str(i)}
+
+        async def collect(s):
+            return [hit async for hit in s.scan()]
+
+        with patch("elasticsearch.helpers.async_scan", fake_async_scan):
+            hits = asyncio.run(collect(AsyncSearch(using=Mock(), index="yolo")))
+        self.assertEqual([h["_id"] for h in hits], ["0", "1", "2"])
+
+    def test_async_iter_composite(self):
+        def page(users, after_key=None):
+            composite = {
+                "buckets": [{"key": {"user": u}, "doc_count": 1} for u in users]
+            }
+            if after_key is not None:
+                composite["after_key"] = after_key
+            return dict(self._raw_response(), aggregations={"per_user": composite})
+
+        async def collect(s, **kwargs):
+            return [row async for row in s.iter_composite(size=2, **kwargs)]
+
+        for prefetch in (False, True):
+            client = Mock()
+            client.search = AsyncMock(
+                side_effect=[
+                    page(["a", "b"], after_key={"user": "b"}),
+                    page(["c"], after_key={"user": "c"}),
+                    page([]),
+                ]
+            )
+            s = AsyncSearch(using=client, index="yolo").agg(
+                "per_user",
+                "composite",
+                sources=[{"user": {"terms": {"field": "user"}}}],
+            )
+            rows = asyncio.run(collect(s, prefetch=prefetch))
+            self.assertEqual([row["per_user"]["user"] for row in rows], ["a", "b", "c"])
+            self.assertEqual(
+                [
+                    c[1]["body"]["aggs"]["per_user"]["composite"].get("after")
+                    for c in client.search.call_args_list
+                ],
+                [None, {"user": "b"}, {"user": "c"}],
+            )
+
+    def test_async_iter_pages(self):
+        def page(ids):
+            return dict(
+                self._raw_response(
+                    [{"_id": str(i), "_score": None, "sort": [i]} for i in ids]
+                ),
+                pit_id="pit-1",
+            )
+
+        client = Mock()
+        client.open_point_in_time = AsyncMock(return_value={"id": "pit-0"})
+        client.search = AsyncMock(side_effect=[page([0, 1]), page([2])])
+        client.close_point_in_time = AsyncMock()
+        s = AsyncSearch(using=client, index="yolo").sort("date")
+
+        async def collect():
+            return [p async for p in s.iter_pages(page_size=2)]
+
+        pages = asyncio.run(collect())
+        self.assertEqual([[h._id for h in p.hits] for p in pages], [["0", "1"], ["2"]])
+        self.assertEqual(
+            client.search.call_args_list[1][1]["body"],
+            {
+                "sort": ["date", {"_shard_doc": "asc"}],
+                "size": 2,
+                "pit": {"id": "pit-1", "keep_alive": "1m"},
+                "search_after": [1],
+            },
+        )
+        client.close_point_in_time.assert_awaited_once_with(body={"id": "pit-1"})
+
+    def test_async_multi_search(self):
+        client = Mock()
+        client.msearch = AsyncMock(
+            side_effect=lambda index, body: {
+                "responses": [self._raw_response()] * (len(body) // 2)
+            }
+        )
+        ms = AsyncMultiSearch(using=client)
+        for i in range(5):
+            ms = ms.add(AsyncSearch(index="yolo").size(i))
+        responses = asyncio.run(ms.execute())
+        client.msearch.assert_awaited_once_with(index=None, body=ms.to_dict())
+        self.assertEqual(len(responses), 5)
+        self.assertTrue(all(isinstance(r, Response) for r in responses))
+
+        client.msearch.reset_mock()
+        responses = asyncio.run(ms.execute(chunk_size=2, max_in_flight=2))
+        self.assertEqual(client.msearch.await_count, 3)
+        self.assertEqual(len(responses), 5)
+
+
+class MultiSearchTestCase(PandaggTestCase):
+    @staticmethod
+    def _raw_response(took):
+        return {
+            "took": took,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": 0, "relation": "eq"}, "max_score": None},
+        }
+
+    def _multi_search(self, nb):
+        ms = MultiSearch(using=Elasticsearch(hosts=["..."]))
+        for i in range(nb):
+            ms = ms.add(Search(index="yolo").filter("term", user=i))
+        return ms
+
+    @patch.object(Elasticsearch, "msearch")
+    def test_execute_returns_responses(self, client_msearch):
+        client_msearch.return_value = {
+            "responses": [self._raw_response(1), self._raw_response(2)]
+        }
+        ms = self._multi_search(2)
+        responses = ms.execute()
+        client_msearch.assert_called_once_with(index=None, body=ms.to_dict())
+        self.assertEqual([r.took for r in responses], [1, 2])
+        self.assertEqual([r._Response__search for r in responses], list(ms))
+
+    @patch.object(Elasticsearch, "msearch")
+    def test_execute_chunks(self, client_msearch):
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+
+        def msearch(index, body):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.01)
+            if isinstance(body, bytes):
+                body = [json.loads(line) for line in body.splitlines()]
+            users = [
+                b["query"]["bool"]["filter"][0]["term"]["user"]["value"]
+                for b in body[1::2]
+            ]
+            with lock:
+                in_flight["current"] -= 1
+            return {"responses": [self._raw_response(u) for u in users]}
+
+        client_msearch.side_effect = msearch
+        ms = self._multi_search(10)
+
+        responses = ms.execute(chunk_size=3, max_in_flight=2)
+        self.assertEqual(client_msearch.call_count, 4)
+        self.assertEqual([r.took for r in responses], list(range(10)))
+        self.assertLessEqual(in_flight["max"], 2)
+
+        client_msearch.reset_mock()
+        one_search_bytes = sum(
+            len(JSONSerializer().dumps(line)) + 1 for line in ms.to_dict()[:2]
+        )
+        responses = ms.execute(max_chunk_bytes=one_search_bytes * 4)
+        self.assertEqual(client_msearch.call_count, 3)
+        self.assertEqual([r.took for r in responses], list(range(10)))
+        for call in client_msearch.call_args_list:
+            self.assertLessEqual(len(call[1]["body"]), one_search_bytes * 4)
+
+        # searches are serialized as by the client, or with their own serializer
+        client_msearch.reset_mock()
+        client_msearch.side_effect = None
+        client_msearch.return_value = {"responses": [self._raw_response(1)] * 2}
+        ms = MultiSearch(using=Elasticsearch(hosts=["..."]))
+        ms = ms.add(Search().filter("range", date={"gte": datetime.date(2020, 1, 1)}))
+        ms = ms.add(Search().serializer(OrjsonSerializer()).filter("term", user=1))
+        ms.execute(max_chunk_bytes=10000)
+        self.assertEqual(
+            [
+                json.loads(line)
+                for line in client_msearch.call_args[1]["body"].splitlines()
+            ][1::2],
+            [
+                {
+                    "query": {
+                        "bool": {"filter": [{"range": {"date": {"gte": "2020-01-01"}}}]}
+                    }
+                },
+                {"query": {"bool": {"filter": [{"term": {"user": {"value": 1}}}]}}},
+            ],
+        )
+
+    @patch.object(Elasticsearch, "msearch")
+    def test_execute_errors(self, client_msearch):
+        client_msearch.return_value = {
+            "responses": [
+                self._raw_response(1),
+                {"error": {"type": "index_not_found_exception"}, "status": 404},
+            ]
+        }
+        ms = self._multi_search(2)
+        with self.assertRaises(TransportError):
+            ms.execute()
+        responses = ms.execute(raise_on_error=False)
+        self.assertEqual(responses[0].took, 1)
+        self.assertIsNone(responses[1])
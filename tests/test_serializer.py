@@ -0,0 +1,130 @@
+import datetime
+import json
+
+from mock import patch
+
+from elasticsearch import Elasticsearch
+
+from pandagg.connections import Connections
+from pandagg.search import Search, MultiSearch
+from pandagg.serializer import (
+    JSONSerializer,
+    OrjsonSerializer,
+    TransportSerializer,
+    get_serializer,
+    install_serializer,
+    dumps,
+)
+from tests import PandaggTestCase
+
+
+RAW_RESPONSE = {
+    "took": 1,
+    "timed_out": False,
+    "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+    "hits": {"total": {"value": 0, "relation": "eq"}, "max_score": None, "hits": []},
+}
+
+
+class SerializerTestCase(PandaggTestCase):
+    def test_get_serializer(self):
+        self.assertIsInstance(get_serializer("json"), JSONSerializer)
+        self.assertIsInstance(get_serializer("orjson"), OrjsonSerializer)
+        # fastest available
+        self.assertIsInstance(get_serializer(), OrjsonSerializer)
+        with self.assertRaises(ValueError):
+            get_serializer("yolo")
+
+    def test_orjson_serializer(self):
+        serializer = OrjsonSerializer()
+        data = {"date": datetime.date(2020, 1, 1), "value": 1, "name": "é"}
+        encoded = serializer.dumps(data)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(
+            serializer.loads(encoded), {"date": "2020-01-01", "value": 1, "name": "é"}
+        )
+        # already encoded bodies are passed as is
+        self.assertIs(serializer.dumps(encoded), encoded)
+        self.assertEqual(serializer.dumps('{"a":1}'), '{"a":1}')
+
+    def test_install_serializer(self):
+        serializer = OrjsonSerializer()
+        client = install_serializer(Elasticsearch(hosts=["..."]), serializer)
+        self.assertIsInstance(client.transport.serializer, TransportSerializer)
+        self.assertIs(client.transport.serializer.serializer, serializer)
+        # client transport joins serialized lines of list bodies as str
+        self.assertEqual(
+            client.transport.serializer.dumps({"date": datetime.date(2020, 1, 1)}),
+            '{"date":"2020-01-01"}',
+        )
+        self.assertEqual(
+            client.transport.deserializer.loads(b'{"a": 1}', "application/json"),
+            {"a": 1},
+        )
+        self.assertIs(
+            client.transport.deserializer.serializers["application/json"], serializer
+        )
+
+    def test_connections_serializer(self):
+        serializer = OrjsonSerializer()
+        c = Connections()
+        c.set_serializer("default", serializer)
+        c.configure(default={"hosts": ["..."]})
+        self.assertIs(c.get_serializer("default"), serializer)
+        self.assertIs(c.get_connection().transport.serializer.serializer, serializer)
+
+        # applied on already registered client
+        other = OrjsonSerializer()
+        c.add_connection("other", Elasticsearch(hosts=["..."]))
+        c.set_serializer("other", other)
+        self.assertIs(c.get_connection("other").transport.serializer.serializer, other)
+
+        c.set_serializer("default", None)
+        self.assertIsNone(c.get_serializer("default"))
+
+    @patch("elasticsearch.transport.Transport.perform_request")
+    def test_multi_search_registered_serializer(self, perform_request):
+        perform_request.return_value = {"responses": [RAW_RESPONSE, RAW_RESPONSE]}
+        c = Connections()
+        c.configure(default={"hosts": ["..."]})
+        c.set_serializer("default", OrjsonSerializer())
+        ms = MultiSearch(using=c.get_connection())
+        ms = ms.add(Search(index="yolo").filter("term", user=1))
+        ms = ms.add(Search(index="yolo").size(0))
+        responses = ms.execute()
+        self.assertEqual(len(responses), 2)
+        body = perform_request.call_args[1]["body"]
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            [
+                {"index": ["yolo"]},
+                {"query": {"bool": {"filter": [{"term": {"user": {"value": 1}}}]}}},
+                {"index": ["yolo"], "size": 0},
+                {"size": 0},
+            ],
+        )
+
+    @patch.object(Elasticsearch, "search")
+    def test_search_serializer(self, client_search):
+        client_search.return_value = RAW_RESPONSE
+        s = (
+            Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+            .filter("term", user=1)
+            .serializer(OrjsonSerializer())
+        )
+        self.assertEqual(
+            s.encode(), b'{"query":{"bool":{"filter":[{"term":{"user":{"value":1}}}]}}}'
+        )
+        s.execute()
+        client_search.assert_called_once_with(index=["yolo"], body=s.encode())
+
+        # default serializer
+        self.assertEqual(s.serializer(None).encode(), s.encode())
+
+    def test_dumps(self):
+        d = {"a": [1, {"b": "c"}]}
+        self.assertEqual(
+            dumps(d, indent=2),
+            '{\n  "a": [\n    1,\n    {\n      "b": "c"\n    }\n  ]\n}',
+        )
+        self.assertEqual(dumps({"a": 2**70}), '{"a": 1180591620717411303424}')
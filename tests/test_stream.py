@@ -0,0 +1,186 @@
+import io
+import json
+
+from mock import patch
+from urllib3 import HTTPConnectionPool
+from urllib3.exceptions import ProtocolError
+from urllib3.response import HTTPResponse
+
+from elasticsearch import Elasticsearch
+from elasticsearch.exceptions import ConnectionError, TransportError
+
+from pandagg.response import Aggregations
+from pandagg.search import Search, AsyncSearch
+from pandagg.stream import AggregationsStream
+import tests.testing_samples.data_sample as sample
+from tests import PandaggTestCase
+
+
+NESTED_AGGS = {
+    "A": {
+        "terms": {"field": "a"},
+        "aggs": {
+            "F": {
+                "filter": {"term": {"f": 1}},
+                "aggs": {
+                    "B": {
+                        "terms": {"field": "b"},
+                        "aggs": {"C": {"terms": {"field": "c"}}},
+                    }
+                },
+            }
+        },
+    }
+}
+
+NESTED_AGGS_RESPONSE = {
+    "A": {
+        "buckets": [
+            {"key": "x", "doc_count": 3, "F": {"doc_count": 0, "B": {"buckets": []}}},
+            {
+                "key": "y",
+                "doc_count": 5,
+                "F": {
+                    "doc_count": 4,
+                    "B": {
+                        "buckets": [
+                            {
+                                "key": "u",
+                                "doc_count": 3,
+                                "C": {"buckets": [{"key": 1, "doc_count": 3}]},
+                            },
+                            {
+                                "key": "v",
+                                "doc_count": 1,
+                                "C": {"buckets": [{"key": 2, "doc_count": 1}]},
+                            },
+                        ]
+                    },
+                },
+            },
+        ]
+    }
+}
+
+
+def raw_response(aggregations):
+    return json.dumps(
+        {
+            "took": 1,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {"total": {"value": 8}, "max_score": None, "hits": []},
+            "aggregations": aggregations,
+        }
+    ).encode("utf-8")
+
+
+class AggregationsStreamTestCase(PandaggTestCase):
+    def assertStreamed(self, search, aggregations, **kwargs):
+        stream = AggregationsStream(
+            raw_response(aggregations), search=search, chunk_size=2, **kwargs
+        )
+        index_names, rows = Aggregations(aggregations, search=search).to_tabular(
+            **kwargs
+        )
+        self.assertEqual(stream.index_names, index_names)
+        self.assertEqual(list(stream), list(rows.items()))
+
+    def test_stream(self):
+        search = Search().aggs(sample.EXPECTED_AGG_QUERY)
+        for grouped_by in (None, "classification_type", "global_metrics.field.name"):
+            self.assertStreamed(search, sample.ES_AGG_RESPONSE, grouped_by=grouped_by)
+
+        search = Search().aggs(NESTED_AGGS)
+        self.assertStreamed(search, NESTED_AGGS_RESPONSE, grouped_by="B")
+        self.assertStreamed(
+            search,
+            NESTED_AGGS_RESPONSE,
+            grouped_by="B",
+            with_single_bucket_groups=True,
+        )
+        self.assertStreamed(search, NESTED_AGGS_RESPONSE, grouped_by="F")
+        self.assertStreamed(search, NESTED_AGGS_RESPONSE, grouped_by="C")
+        self.assertStreamed(
+            search, NESTED_AGGS_RESPONSE, grouped_by="A", expand_columns=False
+        )
+
+    def test_key_after_sub_aggregation(self):
+        search = Search().aggs(NESTED_AGGS)
+        body = b"""{"aggregations": {"A": {"buckets": [
+            {"F": {"doc_count": 1, "B": {"buckets": [{"key": "u", "doc_count": 1, "C": {"buckets": []}}]}},
+             "key": "y", "doc_count": 1}
+        ]}}}"""
+        self.assertEqual(
+            list(AggregationsStream(body, search=search, grouped_by="B")),
+            [(("y", "u"), {"doc_count": 1})],
+        )
+
+    @patch.object(HTTPConnectionPool, "urlopen")
+    def test_search_stream_aggregations(self, urlopen):
+        urlopen.return_value = HTTPResponse(
+            body=io.BytesIO(raw_response(sample.ES_AGG_RESPONSE)),
+            status=200,
+            preload_content=False,
+        )
+        search = Search(using=Elasticsearch(hosts=["localhost:9200"]), index="yolo")
+        stream = search.aggs(sample.EXPECTED_AGG_QUERY).stream_aggregations(
+            grouped_by="classification_type"
+        )
+        # request is sent at iteration
+        urlopen.assert_not_called()
+        self.assertEqual(
+            list(stream),
+            [
+                (
+                    ("multilabel",),
+                    {
+                        "doc_count": 1797,
+                        "global_metrics.field.name|ispracticecompatible": 128,
+                        "global_metrics.field.name|preservationmethods": 76,
+                    },
+                ),
+                (
+                    ("multiclass",),
+                    {
+                        "doc_count": 568,
+                        "global_metrics.field.name|gpc": 198,
+                        "global_metrics.field.name|kind": 370,
+                    },
+                ),
+            ],
+        )
+        urlopen.assert_called_once()
+        method, url, body = urlopen.call_args[0]
+        self.assertEqual((method, url), ("POST", "/yolo/_search"))
+        self.assertEqual(json.loads(body)["size"], 0)
+
+        urlopen.return_value = HTTPResponse(
+            body=io.BytesIO(b'{"error": "yolo"}'), status=400, preload_content=False
+        )
+        with self.assertRaises(TransportError):
+            list(search.aggs(sample.EXPECTED_AGG_QUERY).stream_aggregations())
+
+        # connection errors are retried on another node
+        urlopen.reset_mock()
+        urlopen.return_value = None
+        urlopen.side_effect = [
+            ProtocolError("yolo"),
+            HTTPResponse(
+                body=io.BytesIO(raw_response(sample.ES_AGG_RESPONSE)),
+                status=200,
+                preload_content=False,
+            ),
+        ]
+        stream = search.aggs(sample.EXPECTED_AGG_QUERY).stream_aggregations()
+        self.assertEqual(len(list(stream)), 1)
+        self.assertEqual(urlopen.call_count, 2)
+
+        urlopen.reset_mock()
+        urlopen.side_effect = ProtocolError("yolo")
+        with self.assertRaises(ConnectionError):
+            list(search.aggs(sample.EXPECTED_AGG_QUERY).stream_aggregations())
+        self.assertEqual(urlopen.call_count, 4)
+
+        with self.assertRaises(NotImplementedError):
+            AsyncSearch().aggs(sample.EXPECTED_AGG_QUERY).stream_aggregations()
@@ -0,0 +1,153 @@
+import asyncio
+import datetime
+import json
+
+from mock import patch, AsyncMock
+
+from elasticsearch import Elasticsearch
+
+from pandagg.response import Response
+from pandagg.search import Search, AsyncSearch
+from pandagg.template import Param, SearchTemplate, AsyncSearchTemplate
+from tests import PandaggTestCase
+
+
+RAW_RESPONSE = {
+    "took": 1,
+    "timed_out": False,
+    "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+    "hits": {"total": {"value": 0, "relation": "eq"}, "max_score": None, "hits": []},
+}
+
+
+class SearchTemplateTestCase(PandaggTestCase):
+    def setUp(self):
+        patcher = patch("uuid.uuid4", side_effect=range(1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bind(self):
+        template = (
+            Search()
+            .filter("term", user=Param("uid"))
+            .filter("range", date={"gte": Param("from"), "lt": "now"})
+            .size(Param("size", default=10))
+            .compile()
+        )
+        self.assertIsInstance(template, SearchTemplate)
+        self.assertEqual(set(template.params), {"uid", "from", "size"})
+
+        body = template.bind(uid='weird "user"', **{"from": "2020-01-01"})
+        self.assertEqual(
+            json.loads(body),
+            {
+                "query": {
+                    "bool": {
+                        "filter": [
+                            {"term": {"user": {"value": 'weird "user"'}}},
+                            {"range": {"date": {"gte": "2020-01-01", "lt": "now"}}},
+                        ]
+                    }
+                },
+                "size": 10,
+            },
+        )
+        self.assertEqual(
+            json.loads(template.bind(uid=[1, 2], size=3, **{"from": None}))["size"], 3
+        )
+
+        # dates are serialized as by elasticsearch client, in compiled body and bound values
+        date_template = (
+            Search()
+            .filter("range", date={"gte": datetime.date(2020, 1, 1)})
+            .filter("term", user=Param("uid"))
+            .compile()
+        )
+        self.assertEqual(
+            json.loads(date_template.bind(uid=datetime.datetime(2020, 1, 2, 3)))[
+                "query"
+            ],
+            {
+                "bool": {
+                    "filter": [
+                        {"range": {"date": {"gte": "2020-01-01"}}},
+                        {"term": {"user": {"value": "2020-01-02T03:00:00"}}},
+                    ]
+                }
+            },
+        )
+
+        with self.assertRaises(ValueError):
+            template.bind(uid=1)
+        with self.assertRaises(ValueError):
+            template.bind(uid=1, yolo=2, **{"from": None})
+
+    def test_conflicting_params(self):
+        with self.assertRaises(ValueError):
+            Search().filter("term", user=Param("uid")).size(
+                Param("uid", default=10)
+            ).compile()
+
+    def test_to_mustache(self):
+        template = Search().filter("term", user=Param("uid")).compile()
+        self.assertEqual(
+            template.to_mustache(),
+            '{"query":{"bool":{"filter":[{"term":{"user":{"value":{{#toJson}}uid{{/toJson}}}}}]}}}',
+        )
+
+    @patch.object(Elasticsearch, "search")
+    def test_execute(self, client_search):
+        client_search.return_value = RAW_RESPONSE
+        template = (
+            Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+            .filter("term", user=Param("uid"))
+            .compile()
+        )
+        response = template.execute(uid=1)
+        self.assertIsInstance(response, Response)
+        client_search.assert_called_once_with(
+            index=["yolo"],
+            body='{"query":{"bool":{"filter":[{"term":{"user":{"value":1}}}]}}}',
+        )
+
+    @patch.object(Elasticsearch, "search_template")
+    @patch.object(Elasticsearch, "put_script")
+    def test_execute_stored(self, put_script, search_template):
+        search_template.return_value = RAW_RESPONSE
+        template = (
+            Search(using=Elasticsearch(hosts=["..."]), index="yolo")
+            .filter("term", user=Param("uid"))
+            .size(Param("size", default=10))
+            .compile()
+            .store("by-user")
+        )
+        put_script.assert_called_once_with(
+            id="by-user",
+            body={"script": {"lang": "mustache", "source": template.to_mustache()}},
+        )
+        response = template.execute(uid=1)
+        self.assertIsInstance(response, Response)
+        search_template.assert_called_once_with(
+            index=["yolo"], body={"id": "by-user", "params": {"uid": 1, "size": 10}}
+        )
+
+    def test_async_execute_stored(self):
+        client = AsyncMock()
+        client.search_template.return_value = RAW_RESPONSE
+        template = (
+            AsyncSearch(using=client, index="yolo")
+            .filter("term", user=Param("uid"))
+            .compile()
+        )
+        self.assertIsInstance(template, AsyncSearchTemplate)
+
+        async def run():
+            await template.store("by-user")
+            return await template.execute(uid=1)
+
+        response = asyncio.run(run())
+        self.assertIsInstance(response, Response)
+        client.put_script.assert_awaited_once()
+        client.search_template.assert_awaited_once_with(
+            index=["yolo"], body={"id": "by-user", "params": {"uid": 1}}
+        )
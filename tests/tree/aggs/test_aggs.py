@@ -953,3 +953,46 @@ A                                                             <terms, field="a">
                 }
             },
         )
+
+    def test_id_from_key(self):
+        a = Aggs(sample.EXPECTED_AGG_QUERY, mappings=MAPPINGS)
+        self.assertEqual(a.id_from_key(None), a.root)
+        for key, node in a.list():
+            if key is not None:
+                self.assertEqual(a.id_from_key(key), node.identifier)
+        with self.assertRaises(KeyError):
+            a.id_from_key("yolo")
+
+        # index is maintained on insert and drop, and not shared with clones
+        b = a.agg("new_agg", "avg", field="global_metrics.dataset.nb_classes")
+        new_id = b.id_from_key("new_agg")
+        self.assertEqual(b.get(new_id)[0], "new_agg")
+        with self.assertRaises(KeyError):
+            a.id_from_key("new_agg")
+        b.drop_node(new_id)
+        with self.assertRaises(KeyError):
+            b.id_from_key("new_agg")
+
+        # first inserted node is returned in case of duplicated keys
+        c = Aggs(
+            {"x": {"terms": {"field": "x"}, "aggs": {"x": {"avg": {"field": "y"}}}}}
+        )
+        self.assertEqual(c.id_from_key("x"), c.children_ids(c.root)[0])
+
+    def test_to_dict_memoized(self):
+        a = Aggs(sample.EXPECTED_AGG_QUERY, mappings=MAPPINGS)
+        a_dict = a.to_dict()
+        self.assertIn(a.root, a._serialized)
+
+        # clones share memoized serializations until one of them is mutated
+        b = a.agg("new_agg", "avg", field="global_metrics.dataset.nb_classes")
+        self.assertEqual(a.to_dict(), a_dict)
+        self.assertIn("new_agg", b.to_dict())
+        self.assertNotIn("new_agg", a.to_dict())
+
+        # depth limited serialization is not memoized
+        self.assertEqual(list(b.to_dict(depth=1)["classification_type"]), ["terms"])
+
+    def test_bool(self):
+        self.assertFalse(Aggs())
+        self.assertTrue(Aggs({"per_user": {"terms": {"field": "user"}}}))
@@ -215,3 +215,92 @@ _
                 else:
                     # must not raise error
                     mappings.validate_document(doc)
+
+    def test_validate_documents(self):
+        mappings = Mappings(
+            properties={
+                "user": Keyword(multiple=False),
+                "comments": Nested(properties={"author": Keyword(nullable=False)}),
+            }
+        )
+        errors = mappings.validate_documents(
+            [
+                {"user": "a", "comments": [{"author": "b"}]},
+                {"user": ["a", "b"]},
+                {"comments": [{"author": "b"}, {"text": "c"}]},
+                {"comments": "yolo"},
+            ]
+        )
+        self.assertEqual(
+            [(i, e.args) for i, e in errors],
+            [
+                (1, ("Field <user> should not be an array",)),
+                (2, ("Field <comments.author> cannot be null",)),
+                (
+                    3,
+                    (
+                        "Field <comments> value <yolo> is not compatible with field of type nested",
+                    ),
+                ),
+            ],
+        )
+
+        # compiled validator is shared with clones, until mappings are modified
+        validator = mappings._validator()
+        clone = mappings.clone()
+        self.assertIs(clone._validator(), validator)
+        clone.insert_node(Keyword(nullable=False), key="id", parent_id=clone.root)
+        self.assertIsNot(clone._validator(), validator)
+        doc = {"user": "a", "comments": [{"author": "b"}]}
+        self.assertEqual(len(clone.validate_documents([doc])), 1)
+        self.assertEqual(mappings.validate_documents([doc]), [])
+
+    def test_clone_copy_on_write(self):
+        mappings = Mappings(**MAPPINGS)
+        mappings_dict = mappings.to_dict()
+        clone = mappings.clone()
+        self.assertIs(clone._nodes_map, mappings._nodes_map)
+        self.assertEqual(clone.to_dict(), mappings_dict)
+
+        clone.insert_node(Keyword(), key="new_field", parent_id=clone.root)
+        self.assertIsNot(clone._nodes_map, mappings._nodes_map)
+        self.assertEqual(mappings.to_dict(), mappings_dict)
+        self.assertEqual(clone.mapping_type_of_field("new_field"), "keyword")
+
+        clone.drop_node(clone.get_node_id_by_path("classification_type"))
+        self.assertEqual(mappings.to_dict(), mappings_dict)
+        self.assertEqual(
+            mappings.mapping_type_of_field("classification_type"), "keyword"
+        )
+
+    def test_fields_compact(self):
+        mappings = Mappings(**MAPPINGS)
+        for _, field in mappings.list():
+            self.assertFalse(hasattr(field, "__dict__"))
+        # raw declarations of children are not retained once inserted in tree
+        _, field = mappings.get("classification_type", by_path=True)
+        self.assertIsNone(field.fields)
+
+    def test_field_index(self):
+        mappings = Mappings(**MAPPINGS)
+        index = mappings._paths
+        self.assertIsNotNone(index)
+        self.assertEqual(
+            index["local_metrics.dataset.support_test"][2], ("local_metrics",)
+        )
+
+        # shared with clones until mutation
+        clone = mappings.clone()
+        self.assertIs(clone._field_index(), index)
+        nested = Nested()
+        clone.insert_node(nested, key="new_nested", parent_id=clone.root)
+        clone.insert_node(Keyword(), key="id", parent_id=nested.identifier)
+        self.assertIsNot(clone._field_index(), index)
+        self.assertEqual(clone.list_nesteds_at_field("new_nested.id"), ["new_nested"])
+        self.assertEqual(clone.mapping_type_of_field("new_nested.id"), "keyword")
+        with self.assertRaises(AbsentMappingFieldError):
+            mappings.list_nesteds_at_field("new_nested.id")
+
+        clone.drop_node(clone.get_node_id_by_path("new_nested"))
+        with self.assertRaises(AbsentMappingFieldError):
+            clone.nested_at_field("new_nested.id")
@@ -1106,3 +1106,97 @@ bool                                                             _name=root_bool
                 },
             )
         )
+
+    def test_clone_copy_on_write(self):
+        q = Query().filter("term", user=1).query("bool", minimum_should_match=1)
+        q_dict = q.to_dict()
+        clone = q.clone()
+        # structure is shared until one of them is mutated
+        self.assertIs(clone._nodes_map, q._nodes_map)
+
+        clone = clone.filter("term", user=2).query("bool", minimum_should_match=2)
+        self.assertEqual(q.to_dict(), q_dict)
+        self.assertEqual(
+            clone.to_dict(),
+            {
+                "bool": {
+                    "minimum_should_match": 2,
+                    "filter": [
+                        {"term": {"user": {"value": 1}}},
+                        {"term": {"user": {"value": 2}}},
+                    ],
+                }
+            },
+        )
+
+        # mutating original doesn't alter clone either
+        clone_dict = clone.to_dict()
+        other = clone.clone()
+        term_id = next(n.identifier for _, n in clone.list() if n.KEY == "term")
+        clone.drop_node(term_id)
+        self.assertEqual(other.to_dict(), clone_dict)
+        self.assertNotEqual(clone.to_dict(), clone_dict)
+
+    def test_to_dict_memoized(self):
+        q = Query().filter("term", user=1).filter("term", user=2)
+        self.assertEqual(q._serialized, {})
+        q_dict = q.to_dict()
+        self.assertIn(q.root, q._serialized)
+
+        # returned dict can be mutated without altering memoized serialization
+        q_dict["bool"]["filter"].append({"term": {"user": {"value": 3}}})
+        self.assertEqual(len(q.to_dict()["bool"]["filter"]), 2)
+
+        # mutation only invalidates mutated node and its ancestors
+        term_ids = [n.identifier for _, n in q.list() if n.KEY == "term"]
+        q.drop_node(term_ids[1])
+        self.assertNotIn(q.root, q._serialized)
+        self.assertIn(term_ids[0], q._serialized)
+        self.assertEqual(
+            q.to_dict(), {"bool": {"filter": [{"term": {"user": {"value": 1}}}]}}
+        )
+
+    def test_bool(self):
+        self.assertFalse(Query())
+        self.assertFalse(Query({"bool": {}}))
+        self.assertFalse(Query({"bool": {"filter": [{"bool": {}}]}}))
+        self.assertTrue(Query({"bool": {"filter": [{"term": {"user": 1}}]}}))
+        self.assertTrue(Query().filter("term", user=1))
+
+    def test_lazy(self):
+        d = {
+            "bool": {
+                "must": [
+                    {
+                        "bool": {
+                            "_name": "inner",
+                            "filter": [{"term": {"user": {"value": 1}}}],
+                        }
+                    }
+                ]
+            }
+        }
+        q = Query(d, lazy=True)
+        self.assertEqual(len(q.list()), 1)
+        self.assertEqual(q.to_dict(), d)
+        self.assertTrue(q)
+
+        # clause nested in raw clause is expanded when targeted
+        q2 = q.filter("term", user=2, insert_below="inner")
+        self.assertEqual(
+            q2.to_dict(),
+            Query(d).filter("term", user=2, insert_below="inner").to_dict(),
+        )
+        self.assertEqual(q.to_dict(), d)
+
+        # non-compound root clause is kept raw
+        q3 = Query({"match": {"title": "python"}}, lazy=True).filter("term", user=1)
+        self.assertEqual(
+            q3.to_dict(),
+            {
+                "bool": {
+                    "filter": [{"term": {"user": {"value": 1}}}],
+                    "must": [{"match": {"title": "python"}}],
+                }
+            },
+        )
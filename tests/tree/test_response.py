@@ -1,15 +1,15 @@
 from collections import OrderedDict
-from unittest import TestCase
 from mock import patch
 
 from pandagg.tree.aggs import Aggs
 from pandagg.tree.response import AggsResponseTree
 
+from tests import PandaggTestCase
 from tests.testing_samples.mapping_example import MAPPINGS
 import tests.testing_samples.data_sample as sample
 
 
-class ResponseTestCase(TestCase):
+class ResponseTestCase(PandaggTestCase):
     @patch("uuid.uuid4")
     def test_response_tree(self, uuid_mock):
         uuid_mock.side_effect = range(1000)
@@ -36,3 +36,59 @@ class ResponseTestCase(TestCase):
                 ]
             ),
         )
+
+    def test_response_tree_navigation(self):
+        my_agg = Aggs(sample.EXPECTED_AGG_QUERY, mappings=MAPPINGS)
+        response_tree = AggsResponseTree(aggs=my_agg).parse(sample.ES_AGG_RESPONSE)
+
+        children = response_tree.children(response_tree.root)
+        self.assertEqual(
+            [(k, b.level, b.key, b.value) for k, b in children],
+            [
+                (0, "classification_type", "multilabel", 1797),
+                (1, "classification_type", "multiclass", 568),
+            ],
+        )
+        _, multiclass = children[1]
+        _, gpc = response_tree.child(multiclass.identifier, 1)
+        self.assertEqual((gpc.level, gpc.key), ("global_metrics.field.name", "gpc"))
+        self.assertEqual(response_tree.parent_id(gpc.identifier), multiclass.identifier)
+        self.assertEqual(response_tree.depth(gpc.identifier), 2)
+        self.assertEqual(
+            response_tree.bucket_properties(gpc, depth=1),
+            OrderedDict([("global_metrics.field.name", "gpc")]),
+        )
+
+        # subtree shares buckets with initial tree, under same identifiers
+        key, subtree = response_tree.subtree(multiclass.identifier)
+        self.assertEqual(key, 1)
+        self.assertIsInstance(subtree, AggsResponseTree)
+        self.assertEqual(subtree.root, multiclass.identifier)
+        self.assertEqual(len(subtree.list()), 7)
+        self.assertIn(gpc.identifier, subtree)
+        self.assertNotIn(children[0][1].identifier, subtree)
+        self.assertEqual(
+            subtree.show(),
+            """classification_type=multiclass                           568
+├── global_metrics.field.name=kind                       370
+│   ├── avg_f1_micro                                    0.89
+│   └── avg_nb_classes                                 206.5
+└── global_metrics.field.name=gpc                        198
+    ├── avg_f1_micro                                    0.93
+    └── avg_nb_classes                                211.12
+""",
+        )
+        self.assertQueryEqual(
+            response_tree.get_bucket_filter(gpc.identifier),
+            {
+                "bool": {
+                    "must": [
+                        {"term": {"global_metrics.field.name": {"value": "gpc"}}},
+                        {"term": {"classification_type": {"value": "multiclass"}}},
+                    ]
+                }
+            },
+        )
+
+        with self.assertRaises(NotImplementedError):
+            response_tree.drop_node(gpc.identifier)